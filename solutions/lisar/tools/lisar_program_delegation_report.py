@@ -6,23 +6,33 @@ Data sources:
 - Lisar public dashboard API (summary + transactions)
 - Livepeer BondingManager (Arbitrum) via JSON-RPC eth_getLogs + eth_call
 
-This script is intentionally stdlib-only.
+This script is intentionally stdlib-only (orjson is used for JSON parsing and RPC payloads when installed).
 """
 
 from __future__ import annotations
 
 import argparse
+import gzip
+import http.client
+import itertools
 import json
 import os
 import re
+import threading
 import time
 from collections import Counter, defaultdict
-from dataclasses import asdict, dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List, Optional, Tuple
-from urllib.error import HTTPError, URLError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 from urllib.request import Request, urlopen
 
+try:
+    import orjson
+except ImportError:  # stdlib-only fallback
+    orjson = None
+
 
 ARBITRUM_PUBLIC_RPC = "https://arb1.arbitrum.io/rpc"
 
@@ -43,6 +53,27 @@ TOPIC0_EARNINGS_CLAIMED = "0xd7eab0765b772ea6ea859d5633baf737502198012e930f257f9
 
 ERC20_TRANSFER_SELECTOR = "0xa9059cbb"
 
+# Arbitrum One produces at most ~4 blocks/second, so dividing a time span by this never undercounts blocks.
+ARBITRUM_MIN_BLOCK_TIME_S = 0.25
+
+_AMOUNT_RE = re.compile(r"(-?\d+(?:\.\d+)?)")
+
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _write_json(path: str, obj: Any) -> None:
+    # Always the stdlib encoder, so the committed artifacts don't depend on whether orjson is installed (it writes
+    # non-ASCII raw and `1e-5` where json writes `1e-05`). One encode and one buffered write instead of json.dump's
+    # stream of small writes.
+    data = json.dumps(obj, indent=2, sort_keys=True)
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(data)
+        f.write("\n")
+
 
 def _hex0x(data: bytes) -> str:
     return "0x" + data.hex()
@@ -64,11 +95,11 @@ def _topic_to_address(topic: str) -> str:
 def _decode_words(data_hex: str, n_words: int) -> List[int]:
     if not data_hex.startswith("0x"):
         raise ValueError("data must be 0x-prefixed")
-    s = data_hex[2:]
     need = 64 * n_words
-    if len(s) < need:
-        raise ValueError(f"data too short: need {need} hex chars, got {len(s)}")
-    return [int(s[i : i + 64], 16) for i in range(0, need, 64)]
+    if len(data_hex) - 2 < need:
+        raise ValueError(f"data too short: need {need} hex chars, got {len(data_hex) - 2}")
+    b = bytes.fromhex(data_hex[2 : 2 + need])
+    return [int.from_bytes(b[i : i + 32], "big") for i in range(0, 32 * n_words, 32)]
 
 
 def _parse_amount_from_description(desc: str) -> Optional[float]:
@@ -77,15 +108,11 @@ def _parse_amount_from_description(desc: str) -> Optional[float]:
     # - "bonded 0.02"
     # - "unbonded 0.02539014761696703"
     # - "withdrawn 0"
-    if not isinstance(desc, str):
-        return None
-    m = re.search(r"(-?\d+(?:\.\d+)?)", desc)
-    if not m:
-        return None
-    try:
-        return float(m.group(1))
-    except ValueError:
+    if not desc or not isinstance(desc, str):
         return None
+    m = _AMOUNT_RE.search(desc)
+    # The pattern only matches plain decimals, which float() always accepts.
+    return float(m.group(1)) if m else None
 
 
 def _decode_erc20_transfer_input(input_hex: str) -> Tuple[str, int]:
@@ -107,47 +134,130 @@ class RpcError(RuntimeError):
     pass
 
 
+class RateLimiter:
+    """Token bucket shared by all threads: at most `rps` requests/second, bursting up to `burst`."""
+
+    def __init__(self, rps: float, burst: Optional[float] = None):
+        self.rps = rps
+        self.burst = burst if burst is not None else max(1.0, rps)
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rps)
+            self.last = now
+            wait_s = (1 - self.tokens) / self.rps if self.tokens < 1 else 0.0
+            self.tokens -= 1
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+
 class RpcClient:
-    def __init__(self, rpc_url: str, timeout_s: int = 45):
+    """JSON-RPC over one keep-alive HTTP(S) connection per thread (gzip-encoded responses accepted)."""
+
+    def __init__(self, rpc_url: str, timeout_s: int = 45, rps: float = 20):
         self.rpc_url = rpc_url
         self.timeout_s = timeout_s
-        self._id = 0
-
-    def call(self, method: str, params: list) -> Any:
-        self._id += 1
-        payload = {"jsonrpc": "2.0", "id": self._id, "method": method, "params": params}
-        body = json.dumps(payload).encode("utf-8")
-        req = Request(
-            self.rpc_url,
-            data=body,
-	            headers={
-	                "content-type": "application/json",
-	                "user-agent": "livepeer-delegation-research/lisar_program_delegation_report",
-	            },
-	            method="POST",
-	        )
-        try:
-            with urlopen(req, timeout=self.timeout_s) as resp:
+        self._ids = itertools.count(1)  # thread-safe request ids
+        self.limiter = RateLimiter(rps) if rps > 0 else None
+        url = urlsplit(rpc_url)
+        self._scheme = url.scheme
+        self._host = url.hostname
+        self._port = url.port
+        self._path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(self._host, self._port, timeout=self.timeout_s)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _post(self, payload: Any) -> Any:
+        if self.limiter is not None:
+            self.limiter.acquire()
+        body = orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode("utf-8")
+        headers = {
+            "content-type": "application/json",
+            "accept-encoding": "gzip",
+            "connection": "keep-alive",
+            "user-agent": "livepeer-delegation-research/lisar_program_delegation_report",
+        }
+        for attempt in (1, 2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request("POST", self._path, body=body, headers=headers)
+                resp = conn.getresponse()
                 raw = resp.read()
-        except HTTPError as e:
-            raise RpcError(f"HTTP {e.code}: {e.reason}") from e
-        except URLError as e:
-            raise RpcError(f"URL error: {e.reason}") from e
-        except Exception as e:
-            raise RpcError(f"RPC transport error: {e}") from e
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self._drop_connection()
+                if reused and attempt == 1:
+                    continue  # the server closed an idle keep-alive connection; reconnect once
+                raise RpcError(f"RPC transport error: {e}") from e
+            except Exception as e:
+                self._drop_connection()
+                raise RpcError(f"RPC transport error: {e}") from e
+            break
+        if resp.will_close:
+            self._drop_connection()
+        if resp.status >= 400:
+            raise RpcError(f"HTTP {resp.status}: {resp.reason}")
         try:
-            data = json.loads(raw.decode("utf-8"))
+            if (resp.getheader("content-encoding") or "").lower() == "gzip":
+                raw = gzip.decompress(raw)
+            return _json_loads(raw)
         except Exception as e:
             raise RpcError(f"invalid JSON-RPC response: {raw[:200]!r}") from e
+
+    def call(self, method: str, params: list) -> Any:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        data = self._post(payload)
         if "error" in data and data["error"] is not None:
             raise RpcError(str(data["error"]))
         return data.get("result")
 
+    def call_batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """Send one JSON-RPC array request; results are returned in `calls` order."""
+        payload = []
+        ids: List[int] = []
+        for method, params in calls:
+            req_id = next(self._ids)
+            ids.append(req_id)
+            payload.append({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+        data = self._post(payload)
+        if not isinstance(data, list):
+            # Some providers answer a rejected batch with a single error object.
+            if isinstance(data, dict) and data.get("error") is not None:
+                raise RpcError(str(data["error"]))
+            raise RpcError(f"unexpected batch response type: {type(data)}")
+        by_id: Dict[int, Any] = {}
+        for item in data:
+            if not isinstance(item, dict) or "id" not in item:
+                continue
+            if item.get("error") is not None:
+                raise RpcError(str(item["error"]))
+            by_id[item["id"]] = item.get("result")
+        if len(by_id) != len(ids) or any(i not in by_id for i in ids):
+            raise RpcError(f"incomplete batch response: got {len(by_id)}/{len(ids)} results")
+        return [by_id[i] for i in ids]
+
 
-def _rpc_with_retries(client: RpcClient, method: str, params: list, max_tries: int = 6) -> Any:
+def _with_retries(fn: Callable[[], Any], max_tries: int = 6) -> Any:
     for attempt in range(1, max_tries + 1):
         try:
-            return client.call(method, params)
+            return fn()
         except RpcError as e:
             msg = str(e).lower()
             retryable = any(
@@ -167,14 +277,96 @@ def _rpc_with_retries(client: RpcClient, method: str, params: list, max_tries: i
             )
             if not retryable or attempt == max_tries:
                 raise
-            time.sleep(min(2 ** (attempt - 1), 20))
+            # Proactive rate limiting keeps throttling rare, so the backoff stays short.
+            time.sleep(min(2 ** (attempt - 1), 8))
+
+
+def _rpc_with_retries(client: RpcClient, method: str, params: list, max_tries: int = 6) -> Any:
+    return _with_retries(lambda: client.call(method, params), max_tries=max_tries)
+
+
+def _rpc_batch(
+    client: RpcClient, calls: List[Tuple[str, list]], batch_size: int = 200, workers: int = 1
+) -> List[Any]:
+    """Run `calls` as JSON-RPC array requests of up to `batch_size` calls each (with retries per batch).
+
+    With `workers > 1` the batches are sent concurrently; results always come back in `calls` order.
+    """
+    chunks = [calls[i : i + batch_size] for i in range(0, len(calls), batch_size)]
+
+    def run(chunk: List[Tuple[str, list]]) -> List[Any]:
+        return _with_retries(lambda: client.call_batch(chunk))
+
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(run, chunks))
+    else:
+        results = [run(c) for c in chunks]
+    return [r for chunk_results in results for r in chunk_results]
 
 
 def _http_get_json(url: str, timeout_s: int = 30) -> Any:
     req = Request(url, headers={"user-agent": "livepeer-delegation-research/lisar_program_delegation_report"})
     with urlopen(req, timeout=timeout_s) as resp:
         raw = resp.read()
-    return json.loads(raw.decode("utf-8"))
+    return _json_loads(raw)
+
+
+def _iter_dashboard_tx_pages(limit: int, page_size: int) -> Iterator[Any]:
+    """Yield Lisar dashboard transaction pages (`?limit=&offset=`) covering up to `limit` rows.
+
+    The next page is fetched in the background while the caller processes the current one. Paging stops at
+    the first short page, or when a page repeats an earlier one (i.e. the API ignored `offset`).
+    """
+
+    def fetch(offset: int) -> Tuple[int, Any]:
+        n = min(page_size, limit - offset)
+        return n, _http_get_json(f"{LISAR_DASHBOARD_TX_URL}?limit={n}&offset={offset}")
+
+    seen_first_rows = set()
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        offset = 0
+        fut = ex.submit(fetch, offset)
+        while fut is not None:
+            requested, page = fut.result()
+            rows = ((page or {}).get("data") or []) if isinstance(page, dict) else []
+            offset += requested
+            fut = ex.submit(fetch, offset) if len(rows) == requested and offset < limit else None
+            marker = json.dumps(rows[0], sort_keys=True) if rows else None
+            if marker in seen_first_rows:
+                break
+            seen_first_rows.add(marker)
+            yield page
+
+
+def _parse_iso_ts(value: Any) -> Optional[int]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _block_at_or_before(client: RpcClient, start_block: int, target_ts: int, max_steps: int = 8) -> Optional[int]:
+    """Walk back from `start_block` to a block mined at or before `target_ts` using a few header reads.
+
+    Each step jumps back by the time gap at the fastest possible block rate, so it never overshoots much;
+    returns None if it does not converge within `max_steps`.
+    """
+    bn = start_block
+    for _ in range(max_steps):
+        block = _rpc_with_retries(client, "eth_getBlockByNumber", [hex(bn), False])
+        if not block:
+            raise RpcError(f"missing block {bn}")
+        ts = int(block["timestamp"], 16)
+        if ts <= target_ts or bn == 0:
+            return bn
+        bn = max(0, bn - int((ts - target_ts) / ARBITRUM_MIN_BLOCK_TIME_S) - 1)
+    return None
 
 
 def _iso(ts: int) -> str:
@@ -185,15 +377,28 @@ def _utc_day(ts: int) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
 
 
-def _get_block_timestamp(client: RpcClient, cache: Dict[int, int], block_number: int) -> int:
-    if block_number in cache:
-        return cache[block_number]
-    block = _rpc_with_retries(client, "eth_getBlockByNumber", [hex(block_number), False])
-    if not block:
-        raise RpcError(f"missing block {block_number}")
-    ts = int(block["timestamp"], 16)
-    cache[block_number] = ts
-    return ts
+def _prefetch_block_timestamps(
+    client: RpcClient, cache: Dict[int, int], logs: Iterable[dict], workers: int = 1
+) -> None:
+    """Fill `cache` with the timestamp of every block in `logs`.
+
+    Newer nodes return `blockTimestamp` on each log; those are used as-is and only the remaining blocks
+    are fetched with batched eth_getBlockByNumber.
+    """
+    block_numbers = set()
+    for log in logs:
+        bn = int(log["blockNumber"], 16)
+        ts_hex = log.get("blockTimestamp")
+        if isinstance(ts_hex, str) and ts_hex.startswith("0x"):
+            cache[bn] = int(ts_hex, 16)
+        else:
+            block_numbers.add(bn)
+    missing = sorted(bn for bn in block_numbers if bn not in cache)
+    blocks = _rpc_batch(client, [("eth_getBlockByNumber", [hex(bn), False]) for bn in missing], workers=workers)
+    for bn, block in zip(missing, blocks):
+        if not block:
+            raise RpcError(f"missing block {bn}")
+        cache[bn] = int(block["timestamp"], 16)
 
 
 def _get_logs_range(
@@ -238,7 +443,54 @@ def _get_logs_range(
         return left + right
 
 
-def _eth_call_get_delegator(client: RpcClient, delegator: str, at_block: Optional[int] = None) -> dict:
+def _get_logs_parallel(
+    client: RpcClient,
+    *,
+    address: str,
+    topics: list,
+    from_block: int,
+    to_block: int,
+    chunk_blocks: int = 2_000_000,
+    workers: int = 1,
+) -> List[dict]:
+    """Fetch logs over fixed `chunk_blocks` windows concurrently (in block order).
+
+    Each window still goes through `_get_logs_range`, which bisects if the provider reports too many results.
+    """
+    step = max(1, chunk_blocks)
+    ranges = [(b, min(b + step - 1, to_block)) for b in range(from_block, to_block + 1, step)]
+
+    def fetch(r: Tuple[int, int]) -> List[dict]:
+        return _get_logs_range(client, address=address, topics=topics, from_block=r[0], to_block=r[1])
+
+    if workers > 1 and len(ranges) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            parts = list(ex.map(fetch, ranges))
+    else:
+        parts = [fetch(r) for r in ranges]
+    return [log for part in parts for log in part]
+
+
+def _prep_logs(
+    logs: List[dict], *, address_topic: int, n_words: int, topic_addresses: Dict[str, str]
+) -> List[Tuple[str, int, List[int], list]]:
+    """Decode each log once into `(address, block_number, data_words, topics)`.
+
+    `topic_addresses` maps padded 32-byte topics to addresses so known topics skip string parsing.
+    Logs with fewer than `address_topic + 1` topics are dropped.
+    """
+    out = []
+    for log in logs:
+        topics = log.get("topics") or []
+        if len(topics) <= address_topic:
+            continue
+        topic = topics[address_topic]
+        address = topic_addresses.get(topic) or _topic_to_address(topic)
+        out.append((address, int(log["blockNumber"], 16), _decode_words(log.get("data") or "0x", n_words), topics))
+    return out
+
+
+def _get_delegator_call(delegator: str, block_tag: str) -> Tuple[str, list]:
     # getDelegator(address)(uint256,uint256,address,uint256,uint256,uint256,uint256)
     # selector: first 4 bytes of keccak("getDelegator(address)")
     # Precomputed here to keep stdlib-only: cast sig "getDelegator(address)" => 0xa64ad595
@@ -246,8 +498,10 @@ def _eth_call_get_delegator(client: RpcClient, delegator: str, at_block: Optiona
     arg = bytes.fromhex("0" * 24 + delegator.lower()[2:])
     data = _hex0x(selector + arg)
     call_obj = {"to": BONDING_MANAGER_PROXY, "data": data}
-    block_tag = hex(at_block) if at_block is not None else "latest"
-    out = _rpc_with_retries(client, "eth_call", [call_obj, block_tag])
+    return "eth_call", [call_obj, block_tag]
+
+
+def _decode_get_delegator(out: Any) -> dict:
     if not isinstance(out, str) or not out.startswith("0x"):
         raise RpcError(f"unexpected eth_call output: {out!r}")
     words = _decode_words(out, 7)
@@ -269,6 +523,16 @@ def _eth_call_get_delegator(client: RpcClient, delegator: str, at_block: Optiona
     }
 
 
+def _batch_get_delegators(
+    client: RpcClient, delegators: List[str], at_block: Optional[int] = None, workers: int = 1
+) -> Dict[str, dict]:
+    """getDelegator state for each unique delegator, all read at the same block via batched eth_call."""
+    unique = sorted(set(delegators))
+    block_tag = hex(at_block) if at_block is not None else "latest"
+    outs = _rpc_batch(client, [_get_delegator_call(d, block_tag) for d in unique], workers=workers)
+    return {d: _decode_get_delegator(out) for d, out in zip(unique, outs)}
+
+
 @dataclass
 class DelegatorRollup:
     address: str
@@ -279,7 +543,7 @@ class DelegatorRollup:
     bond_events: int = 0
     bond_additional_total: int = 0
     last_bonded_amount: int = 0
-    delegates: Dict[str, int] = None  # delegate -> count
+    delegates: Dict[str, int] = field(default_factory=dict)  # delegate -> count
 
     unbond_events: int = 0
     unbond_total: int = 0
@@ -298,18 +562,6 @@ class DelegatorRollup:
     current_bonded_amount: Optional[int] = None
     current_delegate: Optional[str] = None
 
-    def __post_init__(self):
-        if self.delegates is None:
-            self.delegates = {}
-
-
-def _apply_min(current: Optional[int], candidate: int) -> int:
-    return candidate if current is None else min(current, candidate)
-
-
-def _apply_max(current: Optional[int], candidate: int) -> int:
-    return candidate if current is None else max(current, candidate)
-
 
 def _to_lpt(amount_wei: int) -> float:
     return amount_wei / 1e18
@@ -320,65 +572,101 @@ def main() -> int:
     parser.add_argument("--rpc-url", default=os.environ.get("ARBITRUM_RPC_URL", ARBITRUM_PUBLIC_RPC))
     parser.add_argument("--out-dir", default="artifacts/livepeer-lisar-spe-delegation")
     parser.add_argument("--tx-limit", type=int, default=5000)
+    parser.add_argument(
+        "--tx-page-size",
+        type=int,
+        default=0,
+        help="Fetch dashboard transactions in pages of this size via ?offset= (0 = one request of --tx-limit rows)",
+    )
     parser.add_argument("--from-block", type=int, default=0, help="0 = auto (based on earliest Lisar tx)")
     parser.add_argument("--to-block", type=int, default=0, help="0 = latest")
+    parser.add_argument(
+        "--precise-window",
+        action="store_true",
+        help="Derive the auto scan window from eth_getTransactionReceipt for every Lisar bond/unbond tx "
+        "(default: estimate it from the dashboard row dates with a few block-header reads)",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent RPC requests (1 = sequential)")
+    parser.add_argument(
+        "--logs-chunk-blocks", type=int, default=2_000_000, help="Block span per eth_getLogs request (fetched in parallel)"
+    )
+    parser.add_argument("--rps", type=float, default=20, help="Max RPC HTTP requests per second (0 = unlimited)")
     args = parser.parse_args()
+    workers = max(1, args.workers)
 
     os.makedirs(args.out_dir, exist_ok=True)
 
     summary = _http_get_json(LISAR_DASHBOARD_SUMMARY_URL)
-    txs = _http_get_json(f"{LISAR_DASHBOARD_TX_URL}?limit={args.tx_limit}")
-
-    with open(os.path.join(args.out_dir, "lisar_dashboard_summary.json"), "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2, sort_keys=True)
-        f.write("\n")
+    _write_json(os.path.join(args.out_dir, "lisar_dashboard_summary.json"), summary)
 
-    with open(os.path.join(args.out_dir, "lisar_dashboard_transactions.json"), "w", encoding="utf-8") as f:
-        json.dump(txs, f, indent=2, sort_keys=True)
-        f.write("\n")
+    if args.tx_page_size > 0:
+        tx_pages: Iterable[Any] = _iter_dashboard_tx_pages(args.tx_limit, args.tx_page_size)
+    else:
+        tx_pages = [_http_get_json(f"{LISAR_DASHBOARD_TX_URL}?limit={args.tx_limit}")]
 
-    tx_rows = (txs or {}).get("data") or []
+    # Rows are tallied page by page as they arrive.
+    txs: Any = None
+    tx_rows: List[dict] = []
     tx_event_counts = Counter()
     tx_amount_sums = defaultdict(float)
     tx_addresses_by_event: Dict[str, set] = defaultdict(set)
-    for row in tx_rows:
-        ev = row.get("event")
-        if not isinstance(ev, str):
-            continue
-        tx_event_counts[ev] += 1
-        addr = row.get("address")
-        if isinstance(addr, str):
-            tx_addresses_by_event[ev].add(addr.lower())
-        amt = _parse_amount_from_description(row.get("description") or "")
-        if amt is not None:
-            tx_amount_sums[ev] += amt
-
-    bond_unbond_rows = [t for t in tx_rows if t.get("event") in ("bond", "unbond")]
-    lisar_delegators = sorted({t["address"].lower() for t in bond_unbond_rows if isinstance(t.get("address"), str)})
-
-    rpc = RpcClient(args.rpc_url)
+    rows_by_event: Dict[str, List[dict]] = defaultdict(list)
+    for page in tx_pages:
+        if txs is None:
+            txs = page
+        page_rows = (page or {}).get("data") or []
+        tx_rows.extend(page_rows)
+        for row in page_rows:
+            ev = row.get("event")
+            if not isinstance(ev, str):
+                continue
+            tx_event_counts[ev] += 1
+            rows_by_event[ev].append(row)
+            addr = row.get("address")
+            if isinstance(addr, str):
+                tx_addresses_by_event[ev].add(addr.lower())
+            amt = _parse_amount_from_description(row.get("description") or "")
+            if amt is not None:
+                tx_amount_sums[ev] += amt
+    if args.tx_page_size > 0 and isinstance(txs, dict):
+        txs = {**txs, "data": tx_rows}  # saved as one response, like the single-request path
+
+    _write_json(os.path.join(args.out_dir, "lisar_dashboard_transactions.json"), txs)
+
+    bond_unbond_rows = rows_by_event.get("bond", []) + rows_by_event.get("unbond", [])
+    lisar_delegators = sorted(
+        tx_addresses_by_event.get("bond", frozenset()) | tx_addresses_by_event.get("unbond", frozenset())
+    )
+
+    rpc = RpcClient(args.rpc_url, rps=args.rps)
     latest_hex = _rpc_with_retries(rpc, "eth_blockNumber", [])
     latest_block = int(latest_hex, 16)
     to_block = latest_block if args.to_block == 0 else args.to_block
 
-    # Determine a tight-ish scan window by looking up the on-chain block for Lisar bond/unbond txs.
+    # Determine a tight-ish scan window for Lisar bond/unbond txs. By default the earliest dashboard row date is
+    # mapped to a block with a few header reads; --precise-window (or rows without dates) looks up every receipt.
     min_seen_block: Optional[int] = None
     max_seen_block: Optional[int] = None
-    receipt_cache: Dict[str, dict] = {}
-    for row in bond_unbond_rows:
-        tx_hash = row.get("transaction_hash")
-        if not isinstance(tx_hash, str) or not tx_hash.startswith("0x"):
-            continue
-        if tx_hash in receipt_cache:
-            receipt = receipt_cache[tx_hash]
-        else:
-            receipt = _rpc_with_retries(rpc, "eth_getTransactionReceipt", [tx_hash])
-            receipt_cache[tx_hash] = receipt
-        if not receipt or "blockNumber" not in receipt:
-            continue
-        bn = int(receipt["blockNumber"], 16)
-        min_seen_block = _apply_min(min_seen_block, bn)
-        max_seen_block = _apply_max(max_seen_block, bn)
+    row_timestamps = [ts for ts in (_parse_iso_ts(t.get("date")) for t in bond_unbond_rows) if ts is not None]
+    if args.from_block == 0 and not args.precise_window and row_timestamps:
+        min_seen_block = _block_at_or_before(rpc, latest_block, min(row_timestamps))
+    if args.precise_window or (args.from_block == 0 and min_seen_block is None):
+        bond_unbond_hashes = sorted(
+            {
+                t["transaction_hash"]
+                for t in bond_unbond_rows
+                if isinstance(t.get("transaction_hash"), str) and t["transaction_hash"].startswith("0x")
+            }
+        )
+        receipts = _rpc_batch(rpc, [("eth_getTransactionReceipt", [h]) for h in bond_unbond_hashes], workers=workers)
+        for receipt in receipts:
+            if not receipt or "blockNumber" not in receipt:
+                continue
+            bn = int(receipt["blockNumber"], 16)
+            if min_seen_block is None or bn < min_seen_block:
+                min_seen_block = bn
+            if max_seen_block is None or bn > max_seen_block:
+                max_seen_block = bn
 
     auto_from = min_seen_block - 50_000 if min_seen_block is not None else 5856381
     from_block = auto_from if args.from_block == 0 else args.from_block
@@ -393,157 +681,177 @@ def main() -> int:
 
     block_ts_cache: Dict[int, int] = {}
 
-    # Pull logs for *these* delegators only (topics OR-list) within the window.
-    bond_logs = _get_logs_range(
-        rpc,
-        address=BONDING_MANAGER_PROXY,
-        topics=[TOPIC0_BOND, None, None, delegator_topics],
-        from_block=from_block,
-        to_block=to_block,
-    )
-    unbond_logs = _get_logs_range(
-        rpc,
-        address=BONDING_MANAGER_PROXY,
-        topics=[TOPIC0_UNBOND, None, delegator_topics],
-        from_block=from_block,
-        to_block=to_block,
-    )
-    withdraw_logs = _get_logs_range(
-        rpc,
-        address=BONDING_MANAGER_PROXY,
-        topics=[TOPIC0_WITHDRAW_STAKE, delegator_topics],
-        from_block=from_block,
-        to_block=to_block,
-    )
-    claim_logs = _get_logs_range(
-        rpc,
-        address=BONDING_MANAGER_PROXY,
-        topics=[TOPIC0_EARNINGS_CLAIMED, None, delegator_topics],
-        from_block=from_block,
-        to_block=to_block,
-    )
-
-    # Decode + roll up
-    rollups: Dict[str, DelegatorRollup] = {a: DelegatorRollup(address=a) for a in lisar_delegators}
-
-    def ts_for_block(bn: int) -> int:
-        return _get_block_timestamp(rpc, block_ts_cache, bn)
+    # Pull logs for *these* delegators only (topics OR-list) within the window; the four queries are independent.
+    log_topics = {
+        "bond": [TOPIC0_BOND, None, None, delegator_topics],
+        "unbond": [TOPIC0_UNBOND, None, delegator_topics],
+        "withdraw": [TOPIC0_WITHDRAW_STAKE, delegator_topics],
+        "claim": [TOPIC0_EARNINGS_CLAIMED, None, delegator_topics],
+    }
+    with ThreadPoolExecutor(max_workers=min(workers, len(log_topics))) as ex:
+        log_futures = {
+            name: ex.submit(
+                _get_logs_parallel,
+                rpc,
+                address=BONDING_MANAGER_PROXY,
+                topics=topics,
+                from_block=from_block,
+                to_block=to_block,
+                chunk_blocks=args.logs_chunk_blocks,
+                workers=max(1, workers // len(log_topics)),
+            )
+            for name, topics in log_topics.items()
+        }
+        bond_logs = log_futures["bond"].result()
+        unbond_logs = log_futures["unbond"].result()
+        withdraw_logs = log_futures["withdraw"].result()
+        claim_logs = log_futures["claim"].result()
+
+    # Resolve every block timestamp we need up-front (from the logs themselves when the node includes them).
+    _prefetch_block_timestamps(rpc, block_ts_cache, bond_logs + unbond_logs + withdraw_logs, workers=workers)
+
+    # Decode every log exactly once; both the per-delegator rollups and the daily aggregates reuse it.
+    topic_addresses = dict(zip(delegator_topics, lisar_delegators))
+    bonds = _prep_logs(bond_logs, address_topic=3, n_words=2, topic_addresses=topic_addresses)
+    unbonds = _prep_logs(unbond_logs, address_topic=2, n_words=3, topic_addresses=topic_addresses)
+    withdraws = _prep_logs(withdraw_logs, address_topic=1, n_words=3, topic_addresses=topic_addresses)
+    claims = _prep_logs(claim_logs, address_topic=2, n_words=4, topic_addresses=topic_addresses)
+
+    # Daily aggregates (only for Lisar delegators), filled in the same pass as the rollups.
+    # Amounts stay ints here and become decimal strings (wei) only when the report is assembled.
+    daily: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    daily_amount_keys = ("bond_additional", "unbond_amount", "withdraw_amount")
+
+    # Roll up into per-field dicts keyed by delegator; DelegatorRollup objects are only built once at the end.
+    bond_events: Counter = Counter()
+    bond_additional_total: Dict[str, int] = defaultdict(int)
+    last_bonded_amount: Dict[str, int] = {}
+    delegates: Dict[str, Counter] = defaultdict(Counter)
+    first_bond_ts: Dict[str, int] = {}
+    first_bond_block: Dict[str, int] = {}
+    last_bond_ts: Dict[str, int] = {}
+    last_bond_block: Dict[str, int] = {}
+    unbond_events: Counter = Counter()
+    unbond_total: Dict[str, int] = defaultdict(int)
+    first_unbond_ts: Dict[str, int] = {}
+    last_unbond_ts: Dict[str, int] = {}
+    withdraw_events: Counter = Counter()
+    withdraw_total: Dict[str, int] = defaultdict(int)
+    first_withdraw_ts: Dict[str, int] = {}
+    last_withdraw_ts: Dict[str, int] = {}
+    claim_events: Counter = Counter()
+    rewards_claimed_total: Dict[str, int] = defaultdict(int)
+    fees_claimed_total: Dict[str, int] = defaultdict(int)
 
     # Bonds
-    for log in bond_logs:
-        topics = log.get("topics") or []
-        if len(topics) < 4:
-            continue
-        delegator = _topic_to_address(topics[3])
+    for delegator, bn, (additional, bonded), topics in bonds:
         new_delegate = _topic_to_address(topics[1])
-        additional, bonded = _decode_words(log.get("data") or "0x", 2)
-        bn = int(log["blockNumber"], 16)
-        ts = ts_for_block(bn)
-
-        r = rollups.get(delegator) or DelegatorRollup(address=delegator)
-        r.bond_events += 1
-        r.bond_additional_total += additional
-        r.last_bonded_amount = bonded
-        r.delegates[new_delegate] = r.delegates.get(new_delegate, 0) + 1
-        r.first_bond_ts = _apply_min(r.first_bond_ts, ts)
-        r.first_bond_block = _apply_min(r.first_bond_block, bn) if r.first_bond_block is not None else bn
-        r.last_bond_ts = _apply_max(r.last_bond_ts, ts)
-        r.last_bond_block = _apply_max(r.last_bond_block, bn) if r.last_bond_block is not None else bn
-        rollups[delegator] = r
+        ts = block_ts_cache[bn]
+        bond_events[delegator] += 1
+        bond_additional_total[delegator] += additional
+        last_bonded_amount[delegator] = bonded
+        delegates[delegator][new_delegate] += 1
+        t = first_bond_ts.get(delegator)
+        first_bond_ts[delegator] = ts if t is None else t if t <= ts else ts
+        b = first_bond_block.get(delegator)
+        first_bond_block[delegator] = bn if b is None else b if b <= bn else bn
+        t = last_bond_ts.get(delegator)
+        last_bond_ts[delegator] = ts if t is None else t if t >= ts else ts
+        b = last_bond_block.get(delegator)
+        last_bond_block[delegator] = bn if b is None else b if b >= bn else bn
+        d = daily[_utc_day(ts)]
+        d["bond_events"] += 1
+        d["bond_additional"] += additional
 
     # Unbonds
-    for log in unbond_logs:
-        topics = log.get("topics") or []
-        if len(topics) < 3:
-            continue
-        delegator = _topic_to_address(topics[2])
-        _lock_id, amount, _withdraw_round = _decode_words(log.get("data") or "0x", 3)
-        bn = int(log["blockNumber"], 16)
-        ts = ts_for_block(bn)
-        r = rollups.get(delegator) or DelegatorRollup(address=delegator)
-        r.unbond_events += 1
-        r.unbond_total += amount
-        r.first_unbond_ts = _apply_min(r.first_unbond_ts, ts)
-        r.last_unbond_ts = _apply_max(r.last_unbond_ts, ts)
-        rollups[delegator] = r
+    for delegator, bn, (_lock_id, amount, _withdraw_round), _topics in unbonds:
+        ts = block_ts_cache[bn]
+        unbond_events[delegator] += 1
+        unbond_total[delegator] += amount
+        t = first_unbond_ts.get(delegator)
+        first_unbond_ts[delegator] = ts if t is None else t if t <= ts else ts
+        t = last_unbond_ts.get(delegator)
+        last_unbond_ts[delegator] = ts if t is None else t if t >= ts else ts
+        d = daily[_utc_day(ts)]
+        d["unbond_events"] += 1
+        d["unbond_amount"] += amount
 
     # Withdraw stake
-    for log in withdraw_logs:
-        topics = log.get("topics") or []
-        if len(topics) < 2:
-            continue
-        delegator = _topic_to_address(topics[1])
-        _lock_id, amount, _withdraw_round = _decode_words(log.get("data") or "0x", 3)
-        bn = int(log["blockNumber"], 16)
-        ts = ts_for_block(bn)
-        r = rollups.get(delegator) or DelegatorRollup(address=delegator)
-        r.withdraw_events += 1
-        r.withdraw_total += amount
-        r.first_withdraw_ts = _apply_min(r.first_withdraw_ts, ts)
-        r.last_withdraw_ts = _apply_max(r.last_withdraw_ts, ts)
-        rollups[delegator] = r
+    for delegator, bn, (_lock_id, amount, _withdraw_round), _topics in withdraws:
+        ts = block_ts_cache[bn]
+        withdraw_events[delegator] += 1
+        withdraw_total[delegator] += amount
+        t = first_withdraw_ts.get(delegator)
+        first_withdraw_ts[delegator] = ts if t is None else t if t <= ts else ts
+        t = last_withdraw_ts.get(delegator)
+        last_withdraw_ts[delegator] = ts if t is None else t if t >= ts else ts
+        d = daily[_utc_day(ts)]
+        d["withdraw_events"] += 1
+        d["withdraw_amount"] += amount
 
     # Earnings claims
-    for log in claim_logs:
-        topics = log.get("topics") or []
-        if len(topics) < 3:
-            continue
-        delegator = _topic_to_address(topics[2])
-        rewards, fees, _start_round, _end_round = _decode_words(log.get("data") or "0x", 4)
-        r = rollups.get(delegator) or DelegatorRollup(address=delegator)
-        r.claim_events += 1
-        r.rewards_claimed_total += rewards
-        r.fees_claimed_total += fees
-        rollups[delegator] = r
-
-    # Current bonded state for each delegator
-    for delegator in rollups.keys():
-        state = _eth_call_get_delegator(rpc, delegator)
+    for delegator, _bn, (rewards, fees, _start_round, _end_round), _topics in claims:
+        claim_events[delegator] += 1
+        rewards_claimed_total[delegator] += rewards
+        fees_claimed_total[delegator] += fees
+
+    rollups: Dict[str, DelegatorRollup] = {
+        a: DelegatorRollup(
+            address=a,
+            first_bond_ts=first_bond_ts.get(a),
+            first_bond_block=first_bond_block.get(a),
+            last_bond_ts=last_bond_ts.get(a),
+            last_bond_block=last_bond_block.get(a),
+            bond_events=bond_events[a],
+            bond_additional_total=bond_additional_total.get(a, 0),
+            last_bonded_amount=last_bonded_amount.get(a, 0),
+            delegates=dict(delegates.get(a, {})),  # plain dict: asdict() can't rebuild a Counter
+            unbond_events=unbond_events[a],
+            unbond_total=unbond_total.get(a, 0),
+            first_unbond_ts=first_unbond_ts.get(a),
+            last_unbond_ts=last_unbond_ts.get(a),
+            withdraw_events=withdraw_events[a],
+            withdraw_total=withdraw_total.get(a, 0),
+            first_withdraw_ts=first_withdraw_ts.get(a),
+            last_withdraw_ts=last_withdraw_ts.get(a),
+            claim_events=claim_events[a],
+            rewards_claimed_total=rewards_claimed_total.get(a, 0),
+            fees_claimed_total=fees_claimed_total.get(a, 0),
+        )
+        for a in sorted(set(lisar_delegators).union(bond_events, unbond_events, withdraw_events, claim_events))
+    }
+
+    # Current bonded state for each delegator, pinned to `to_block` so the snapshot is consistent
+    states = _batch_get_delegators(rpc, list(rollups.keys()), at_block=to_block, workers=workers)
+    for delegator, state in states.items():
         rollups[delegator].current_bonded_amount = int(state["bondedAmount"])
         rollups[delegator].current_delegate = state["delegateAddress"]
 
-    # Daily aggregates (only for Lisar delegators)
-    daily: Dict[str, Dict[str, Any]] = {}
-
-    def bump(day: str, key: str, inc: int = 1):
-        d = daily.setdefault(day, {})
-        d[key] = int(d.get(key, 0)) + inc
-
-    def bump_amount(day: str, key: str, amount: int):
-        d = daily.setdefault(day, {})
-        d[key] = str(int(d.get(key, "0")) + amount)
-
-    for log in bond_logs:
-        bn = int(log["blockNumber"], 16)
-        ts = ts_for_block(bn)
-        day = _utc_day(ts)
-        additional, _bonded = _decode_words(log.get("data") or "0x", 2)
-        bump(day, "bond_events", 1)
-        bump_amount(day, "bond_additional", additional)
-
-    for log in unbond_logs:
-        bn = int(log["blockNumber"], 16)
-        ts = ts_for_block(bn)
-        day = _utc_day(ts)
-        _lock_id, amount, _withdraw_round = _decode_words(log.get("data") or "0x", 3)
-        bump(day, "unbond_events", 1)
-        bump_amount(day, "unbond_amount", amount)
-
-    for log in withdraw_logs:
-        bn = int(log["blockNumber"], 16)
-        ts = ts_for_block(bn)
-        day = _utc_day(ts)
-        _lock_id, amount, _withdraw_round = _decode_words(log.get("data") or "0x", 3)
-        bump(day, "withdraw_events", 1)
-        bump_amount(day, "withdraw_amount", amount)
-
-    # Top-level summary
-    total_current_bonded = sum((r.current_bonded_amount or 0) for r in rollups.values())
-    active_delegators = [r for r in rollups.values() if (r.current_bonded_amount or 0) > 0]
-    ever_bonded = [r for r in rollups.values() if r.bond_events > 0]
-
-    program_start_ts = min((r.first_bond_ts for r in ever_bonded if r.first_bond_ts is not None), default=None)
-    program_end_ts = max((r.last_bond_ts for r in ever_bonded if r.last_bond_ts is not None), default=None)
+    # Top-level summary, in one pass over the rollups (already in address order, which the report reuses)
+    total_current_bonded = 0
+    total_bond_additional = 0
+    total_unbond = 0
+    total_withdraw = 0
+    total_claim_events = 0
+    delegators_active_now = 0
+    delegators_ever_bonded = 0
+    program_start_ts: Optional[int] = None
+    program_end_ts: Optional[int] = None
+    for r in rollups.values():
+        current = r.current_bonded_amount or 0
+        total_current_bonded += current
+        total_bond_additional += r.bond_additional_total
+        total_unbond += r.unbond_total
+        total_withdraw += r.withdraw_total
+        total_claim_events += r.claim_events
+        if current > 0:
+            delegators_active_now += 1
+        if r.bond_events > 0:
+            delegators_ever_bonded += 1
+            if r.first_bond_ts is not None and (program_start_ts is None or r.first_bond_ts < program_start_ts):
+                program_start_ts = r.first_bond_ts
+            if r.last_bond_ts is not None and (program_end_ts is None or r.last_bond_ts > program_end_ts):
+                program_end_ts = r.last_bond_ts
 
     dashboard_summary = (summary or {}).get("data") or summary
     dashboard_total_lpt_delegated = None
@@ -554,9 +862,8 @@ def main() -> int:
             dashboard_total_lpt_delegated = None
 
     # Decode Lisar dashboard "deposit"/"withdraw" tx hashes (best-effort) to understand funnel flows.
-    tx_cache: Dict[str, dict] = {}
-    deposit_rows = [t for t in tx_rows if t.get("event") == "deposit"]
-    withdraw_rows = [t for t in tx_rows if t.get("event") == "withdraw"]
+    deposit_rows = rows_by_event.get("deposit", [])
+    withdraw_rows = rows_by_event.get("withdraw", [])
     deposit_transfer_senders = set()
     deposit_transfer_recipients = set()
     deposit_transfer_total = 0
@@ -565,14 +872,21 @@ def main() -> int:
     withdraw_transfer_total = 0
     withdraw_tx_types = Counter()
 
+    funnel_hashes = sorted(
+        {
+            t["transaction_hash"]
+            for t in deposit_rows + withdraw_rows
+            if isinstance(t.get("transaction_hash"), str) and t["transaction_hash"].startswith("0x")
+        }
+    )
+    tx_cache: Dict[str, dict] = {
+        h: tx
+        for h, tx in zip(funnel_hashes, _rpc_batch(rpc, [("eth_getTransactionByHash", [h]) for h in funnel_hashes], workers=workers))
+        if isinstance(tx, dict)
+    }
+
     def get_tx(tx_hash: str) -> Optional[dict]:
-        if tx_hash in tx_cache:
-            return tx_cache[tx_hash]
-        tx = _rpc_with_retries(rpc, "eth_getTransactionByHash", [tx_hash])
-        if isinstance(tx, dict):
-            tx_cache[tx_hash] = tx
-            return tx
-        return None
+        return tx_cache.get(tx_hash)
 
     for row in deposit_rows:
         tx_hash = row.get("transaction_hash")
@@ -620,9 +934,8 @@ def main() -> int:
         else:
             withdraw_tx_types["other"] += 1
 
-    deposit_only_addresses = sorted(
-        a for a in tx_addresses_by_event.get("deposit", set()) if a not in tx_addresses_by_event.get("bond", set())
-    )
+    bond_addresses = tx_addresses_by_event.get("bond", frozenset())
+    deposit_only_addresses = sorted(a for a in tx_addresses_by_event.get("deposit", frozenset()) if a not in bond_addresses)
 
     computed = {
         "generated_at_utc": datetime.now(tz=timezone.utc).isoformat(),
@@ -658,13 +971,13 @@ def main() -> int:
         "computed": {
             "program_start_utc": _iso(program_start_ts) if program_start_ts is not None else None,
             "program_end_utc": _iso(program_end_ts) if program_end_ts is not None else None,
-            "delegators_ever_bonded": len(ever_bonded),
-            "delegators_active_now": len(active_delegators),
+            "delegators_ever_bonded": delegators_ever_bonded,
+            "delegators_active_now": delegators_active_now,
             "current_total_bonded_lpt": _to_lpt(total_current_bonded),
-            "bond_additional_total_lpt": _to_lpt(sum(r.bond_additional_total for r in rollups.values())),
-            "unbond_total_lpt": _to_lpt(sum(r.unbond_total for r in rollups.values())),
-            "withdraw_total_lpt": _to_lpt(sum(r.withdraw_total for r in rollups.values())),
-            "claim_events_total": sum(r.claim_events for r in rollups.values()),
+            "bond_additional_total_lpt": _to_lpt(total_bond_additional),
+            "unbond_total_lpt": _to_lpt(total_unbond),
+            "withdraw_total_lpt": _to_lpt(total_withdraw),
+            "claim_events_total": total_claim_events,
             "dashboard_total_lpt_delegated": dashboard_total_lpt_delegated,
             "dashboard_total_lpt_delegated_delta_vs_current_bonded": (
                 _to_lpt(total_current_bonded) - dashboard_total_lpt_delegated
@@ -672,12 +985,15 @@ def main() -> int:
                 else None
             ),
             "dashboard_total_lpt_delegated_delta_vs_bond_additional": (
-                _to_lpt(sum(r.bond_additional_total for r in rollups.values())) - dashboard_total_lpt_delegated
+                _to_lpt(total_bond_additional) - dashboard_total_lpt_delegated
                 if dashboard_total_lpt_delegated is not None
                 else None
             ),
         },
-        "daily": {k: daily[k] for k in sorted(daily.keys())},
+        "daily": {
+            day: {k: str(v) if k in daily_amount_keys else v for k, v in sorted(counts.items())}
+            for day, counts in sorted(daily.items())
+        },
         "delegators": {
             addr: {
                 **asdict(r),
@@ -686,14 +1002,12 @@ def main() -> int:
                 "withdraw_total_lpt": _to_lpt(r.withdraw_total),
                 "current_bonded_lpt": _to_lpt(r.current_bonded_amount or 0),
             }
-            for addr, r in sorted(rollups.items())
+            for addr, r in rollups.items()
         },
     }
 
     report_json_path = os.path.join(args.out_dir, "report.json")
-    with open(report_json_path, "w", encoding="utf-8") as f:
-        json.dump(computed, f, indent=2, sort_keys=True)
-        f.write("\n")
+    _write_json(report_json_path, computed)
 
     # A short human summary
     report_md_path = os.path.join(args.out_dir, "report.md")
@@ -7,22 +7,41 @@ Focus:
 - Decode proposal actions (e.g., ERC20 transfer recipient + amount)
 - Locate the executed treasury transfer (ERC20 Transfer logs)
 
-This script is intentionally stdlib-only.
+This script is intentionally stdlib-only (if installed, `ijson` streams large eth_getLogs responses and `orjson`
+speeds up RPC payload encoding and JSON decoding; report.json is always written with the stdlib encoder).
 """
 
 from __future__ import annotations
 
 import argparse
+import functools
+import gzip
+import hashlib
+import http.client
+import itertools
 import json
 import os
 import re
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.error import HTTPError, URLError
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
 from urllib.request import Request, urlopen
 
+try:  # optional: incremental parsing of eth_getLogs responses
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+try:  # optional: faster JSON encode/decode
+    import orjson
+except ImportError:  # stdlib-only fallback
+    orjson = None
+
 
 ARBITRUM_PUBLIC_RPC = "https://arb1.arbitrum.io/rpc"
 
@@ -37,76 +56,442 @@ TOPIC0_ERC20_TRANSFER = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55
 
 ERC20_TRANSFER_SELECTOR = b"\xa9\x05\x9c\xbb"
 
+# "0x" + the nine 32-byte head words of ProposalCreated data; anything shorter cannot decode.
+PROPOSAL_CREATED_MIN_DATA_HEX = 2 + 9 * 64
+
+# eth_getLogs windows packed into one JSON-RPC array request.
+LOGS_WINDOWS_PER_BATCH = 10
+
+# Lowercased RPC error substrings: transient failures worth retrying, and getLogs limits that call for a split.
+_RETRYABLE_SUBSTR = (
+    "timeout",
+    "timed out",
+    "too many requests",
+    "rate limit",
+    "temporarily unavailable",
+    "service unavailable",
+    "bad gateway",
+    "gateway timeout",
+    "connection reset",
+    "internal error",
+)
+# Explicit rate-limit wording only; a bare "429" also turns up inside unrelated error text (hashes, block numbers).
+_RATE_LIMITED_SUBSTR = ("too many requests", "rate limit", "rate-limit")
+_GETLOGS_TOO_MANY = (
+    "more than",
+    "too many results",
+    "response size exceeded",
+    "query returned more than",
+    "block range too wide",
+)
+
+_DEC_RE = re.compile(r"\d+")
+
+# Log windows ending at least this many blocks below the head are treated as immutable and cached on disk.
+FINALITY_CONFIRMATIONS = 64
+
+
+def _json_loads(raw: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _write_json(path: str, obj: Any, compact: bool = False) -> None:
+    """Write `obj` as key-sorted JSON with the stdlib encoder.
+
+    orjson is deliberately not used here: it writes non-ASCII raw and formats floats differently, so the committed
+    report's bytes would depend on which library the machine has.
+    """
+    if compact:
+        data = json.dumps(obj, separators=(",", ":"), sort_keys=True)
+    else:
+        data = json.dumps(obj, indent=2, sort_keys=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+        f.write("\n")
+
 
 class RpcError(RuntimeError):
     pass
 
 
+class RateLimiter:
+    """
+    Token bucket shared by all threads: at most `rps` requests/second, bursting up to `burst`.
+
+    `throttle()` halves the rate (down to `min_rps`) when the provider starts rate limiting; a burst of concurrent
+    rejections counts once per `throttle_window_s`. After `recover_after` successes without a throttle, `ok()`
+    doubles the rate again, back up to the configured `rps`.
+    """
+
+    def __init__(
+        self,
+        rps: float,
+        burst: Optional[float] = None,
+        min_rps: float = 0.5,
+        throttle_window_s: float = 1.0,
+        recover_after: int = 50,
+    ):
+        self.rps = rps
+        self.max_rps = rps
+        self.burst = burst if burst is not None else max(1.0, rps)
+        self.min_rps = min(min_rps, rps)
+        self.throttle_window_s = throttle_window_s
+        self.recover_after = recover_after
+        self.tokens = self.burst
+        self.last = time.monotonic()
+        self._last_throttle = float("-inf")
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rps)
+            self.last = now
+            wait_s = (1 - self.tokens) / self.rps if self.tokens < 1 else 0.0
+            self.tokens -= 1
+        if wait_s > 0:
+            time.sleep(wait_s)
+
+    def throttle(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._successes = 0
+            if now - self._last_throttle < self.throttle_window_s:
+                return
+            self._last_throttle = now
+            self.rps = max(self.min_rps, self.rps / 2)
+
+    def ok(self) -> None:
+        with self._lock:
+            if self.rps >= self.max_rps:
+                return
+            self._successes += 1
+            if self._successes >= self.recover_after:
+                self._successes = 0
+                self.rps = min(self.max_rps, self.rps * 2)
+
+
+class _HeadRecorder:
+    """File-like wrapper that keeps the first `limit` bytes read, so a small error body can be re-parsed."""
+
+    def __init__(self, f: Any, limit: int = 64 * 1024):
+        self._f = f
+        self._limit = limit
+        self.head = bytearray()
+
+    def read(self, n: int = -1) -> bytes:
+        chunk = self._f.read(n)
+        if len(self.head) < self._limit:
+            self.head += chunk[: self._limit - len(self.head)]
+        return chunk
+
+
 class RpcClient:
-    def __init__(self, rpc_url: str, timeout_s: int = 45):
+    """JSON-RPC over one keep-alive HTTP(S) connection per thread (gzip-encoded responses accepted)."""
+
+    def __init__(self, rpc_url: str, timeout_s: int = 45, rps: float = 5, burst: Optional[float] = 10):
         self.rpc_url = rpc_url
         self.timeout_s = timeout_s
-        self._id = 0
-
-    def call(self, method: str, params: list) -> Any:
-        self._id += 1
-        payload = {"jsonrpc": "2.0", "id": self._id, "method": method, "params": params}
-        body = json.dumps(payload).encode("utf-8")
-        req = Request(
-            self.rpc_url,
-            data=body,
-            headers={"content-type": "application/json", "user-agent": "livepeer-research/lisar_treasury_proposal_report"},
-            method="POST",
+        url = urlsplit(rpc_url)
+        self._scheme = url.scheme
+        self._host = url.hostname
+        self._port = url.port
+        self._path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+        self._local = threading.local()
+        # Shared across worker threads; next() on itertools.count is atomic.
+        self._ids = itertools.count(1)
+        self.limiter = RateLimiter(rps, burst) if rps > 0 else None
+        # Widest eth_getLogs block span expected to succeed (None = no provider limit seen yet). Learned from the
+        # widest span that worked and the narrowest that hit "too many results": it halves after a failure, then
+        # probes halfway back up until the two bounds are within 1/8 of each other.
+        self.logs_window: Optional[int] = None
+        self._logs_ok_max: Optional[int] = None
+        self._logs_fail_min: Optional[int] = None
+        self._logs_window_lock = threading.Lock()
+
+    def _update_logs_window(self) -> None:
+        ok, fail = self._logs_ok_max, self._logs_fail_min
+        if fail is None:
+            self.logs_window = None
+        elif ok is None:
+            self.logs_window = max(1, fail // 2)
+        elif fail - ok <= ok // 8:
+            self.logs_window = ok
+        else:
+            self.logs_window = (ok + fail) // 2
+
+    def logs_span_ok(self, span: int) -> None:
+        with self._logs_window_lock:
+            if self._logs_fail_min is not None and (self._logs_ok_max is None or span > self._logs_ok_max):
+                self._logs_ok_max = min(span, self._logs_fail_min - 1)
+                self._update_logs_window()
+
+    def logs_span_too_large(self, span: int) -> None:
+        with self._logs_window_lock:
+            if self._logs_fail_min is None or span < self._logs_fail_min:
+                self._logs_fail_min = span
+            if self._logs_ok_max is not None and self._logs_ok_max >= span:
+                self._logs_ok_max = None  # a denser range failed at a width that worked elsewhere
+            self._update_logs_window()
+
+    def _error(self, err: Any, *, status: Optional[int] = None) -> RpcError:
+        """RpcError for a failed request; throttles the limiter on HTTP 429, JSON-RPC code 429 or rate-limit text."""
+        msg = str(err)
+        rate_limited = (
+            status == 429
+            or (isinstance(err, dict) and err.get("code") == 429)
+            or any(s in msg.lower() for s in _RATE_LIMITED_SUBSTR)
         )
+        if self.limiter is not None and rate_limited:
+            self.limiter.throttle()
+        return RpcError(msg)
+
+    def _ok(self) -> None:
+        if self.limiter is not None:
+            self.limiter.ok()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn_cls = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = conn_cls(self._host, self._port, timeout=self.timeout_s)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self, conn: http.client.HTTPConnection) -> None:
+        conn.close()
+        if getattr(self._local, "conn", None) is conn:
+            self._local.conn = None
+
+    def _open(self, payload: Any) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """POST `payload` on this thread's keep-alive connection; the caller must `_release` the response."""
+        if self.limiter is not None:
+            self.limiter.acquire()
+        body = _json_dumps(payload)
+        headers = {
+            "content-type": "application/json",
+            "accept-encoding": "gzip",
+            "connection": "keep-alive",
+            "user-agent": "livepeer-research/lisar_treasury_proposal_report",
+        }
+        for attempt in (1, 2):
+            conn = self._connection()
+            reused = conn.sock is not None
+            try:
+                conn.request("POST", self._path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                self._drop_connection(conn)
+                if reused and attempt == 1:
+                    continue  # the server closed an idle keep-alive connection; reconnect once
+                raise RpcError(f"RPC transport error: {e}") from e
+            except Exception as e:
+                self._drop_connection(conn)
+                raise RpcError(f"RPC transport error: {e}") from e
+            break
+        if resp.status >= 400:
+            self._drop_connection(conn)
+            raise self._error(f"HTTP {resp.status}: {resp.reason}", status=resp.status)
+        return conn, resp
+
+    def _release(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        # Only a fully read response leaves the connection reusable.
+        if resp.will_close or not resp.isclosed():
+            self._drop_connection(conn)
+
+    @staticmethod
+    def _body(resp: http.client.HTTPResponse) -> Any:
+        if (resp.getheader("content-encoding") or "").lower() == "gzip":
+            return gzip.GzipFile(fileobj=resp)
+        return resp
+
+    def _post(self, payload: Any) -> Any:
+        conn, resp = self._open(payload)
         try:
-            with urlopen(req, timeout=self.timeout_s) as resp:
-                raw = resp.read()
-        except HTTPError as e:
-            raise RpcError(f"HTTP {e.code}: {e.reason}") from e
-        except URLError as e:
-            raise RpcError(f"URL error: {e.reason}") from e
+            raw = self._body(resp).read()
         except Exception as e:
             raise RpcError(f"RPC transport error: {e}") from e
+        finally:
+            self._release(conn, resp)
         try:
-            data = json.loads(raw.decode("utf-8"))
+            data = _json_loads(raw)
         except Exception as e:
             raise RpcError(f"invalid JSON-RPC response: {raw[:200]!r}") from e
+        return data
+
+    def call(self, method: str, params: list) -> Any:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        data = self._post(payload)
         if "error" in data and data["error"] is not None:
-            raise RpcError(str(data["error"]))
+            raise self._error(data["error"])
+        self._ok()
         return data.get("result")
 
+    def call_stream(self, method: str, params: list) -> Iterator[Any]:
+        """
+        Yield the items of an array `result` as they are parsed off the socket, so the raw body and the decoded
+        list are never held together. Without `ijson` the response is parsed whole.
+        """
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        conn, resp = self._open(payload)
+        try:
+            body = self._body(resp)
+            if ijson is None:
+                try:
+                    data = _json_loads(body.read())
+                except Exception as e:
+                    raise RpcError(f"invalid JSON-RPC response: {e}") from e
+                if data.get("error") is not None:
+                    raise self._error(data["error"])
+                self._ok()
+                yield from data.get("result") or []
+                return
+            recorder = _HeadRecorder(body)
+            n_items = 0
+            try:
+                for item in ijson.items(recorder, "result.item", use_float=True):
+                    n_items += 1
+                    yield item
+            except ijson.JSONError as e:
+                raise RpcError(f"invalid JSON-RPC response: {bytes(recorder.head[:200])!r}") from e
+            except (OSError, ValueError) as e:
+                raise RpcError(f"RPC transport error: {e}") from e
+            if n_items == 0:
+                # Empty result or an error object: both are small, so the recorded head is the whole body.
+                try:
+                    data = _json_loads(bytes(recorder.head))
+                except Exception as e:
+                    raise RpcError(f"invalid JSON-RPC response: {bytes(recorder.head[:200])!r}") from e
+                if data.get("error") is not None:
+                    raise self._error(data["error"])
+            self._ok()
+        finally:
+            self._release(conn, resp)
+
+    def call_batch(self, calls: List[Tuple[str, list]]) -> List[Any]:
+        """Send one JSON-RPC array request; results are returned in `calls` order."""
+        payload = []
+        ids: List[int] = []
+        for method, params in calls:
+            req_id = next(self._ids)
+            ids.append(req_id)
+            payload.append({"jsonrpc": "2.0", "id": req_id, "method": method, "params": params})
+        data = self._post(payload)
+        if not isinstance(data, list):
+            # Some providers answer a rejected batch with a single error object.
+            if isinstance(data, dict) and data.get("error") is not None:
+                raise self._error(data["error"])
+            raise RpcError(f"unexpected batch response type: {type(data)}")
+        by_id: Dict[int, Any] = {}
+        for item in data:
+            if not isinstance(item, dict) or "id" not in item:
+                continue
+            if item.get("error") is not None:
+                raise self._error(item["error"])
+            by_id[item["id"]] = item.get("result")
+        if any(i not in by_id for i in ids):
+            raise RpcError(f"incomplete batch response: got {len(by_id)}/{len(ids)} results")
+        self._ok()
+        return [by_id[i] for i in ids]
+
 
-def _rpc_with_retries(client: RpcClient, method: str, params: list, max_tries: int = 6) -> Any:
+class DiskCache:
+    """
+    sqlite-backed cache for block timestamps and finalized eth_getLogs windows.
+
+    Entries are keyed by chain id so one cache file can be reused across RPC endpoints.
+    Log windows are only stored when `to_block <= finalized_block`.
+    """
+
+    def __init__(self, path: str, *, chain_id: int, finalized_block: int):
+        self.chain_id = chain_id
+        self.finalized_block = finalized_block
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS block_ts (chain_id INTEGER, block INTEGER, ts INTEGER, PRIMARY KEY (chain_id, block))"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS logs (key TEXT PRIMARY KEY, json BLOB, cached_at INTEGER)")
+        self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def get_block_ts(self, block: int) -> Optional[int]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT ts FROM block_ts WHERE chain_id = ? AND block = ?", (self.chain_id, block)
+            ).fetchone()
+        return int(row[0]) if row else None
+
+    def put_block_ts(self, block: int, ts: int) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO block_ts (chain_id, block, ts) VALUES (?, ?, ?)", (self.chain_id, block, ts)
+            )
+            self._db.commit()
+
+    def _logs_key(self, address: str, topics: list, from_block: int, to_block: int) -> str:
+        raw = json.dumps([self.chain_id, address.lower(), topics, from_block, to_block], sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get_logs(self, address: str, topics: list, from_block: int, to_block: int) -> Optional[List[dict]]:
+        key = self._logs_key(address, topics, from_block, to_block)
+        with self._lock:
+            row = self._db.execute("SELECT json FROM logs WHERE key = ?", (key,)).fetchone()
+        return _json_loads(row[0]) if row else None
+
+    def put_logs(self, address: str, topics: list, from_block: int, to_block: int, logs: List[dict]) -> None:
+        if to_block > self.finalized_block:
+            return
+        key = self._logs_key(address, topics, from_block, to_block)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO logs (key, json, cached_at) VALUES (?, ?, ?)",
+                (key, _json_dumps(logs), int(time.time())),
+            )
+            self._db.commit()
+
+
+def _with_retries(fn: Callable[[], Any], max_tries: int = 6) -> Any:
     for attempt in range(1, max_tries + 1):
         try:
-            return client.call(method, params)
+            return fn()
         except RpcError as e:
             msg = str(e).lower()
-            retryable = any(
-                s in msg
-                for s in (
-                    "timeout",
-                    "timed out",
-                    "too many requests",
-                    "rate limit",
-                    "temporarily unavailable",
-                    "service unavailable",
-                    "bad gateway",
-                    "gateway timeout",
-                    "connection reset",
-                    "internal error",
-                )
-            )
+            retryable = any(s in msg for s in _RETRYABLE_SUBSTR)
             if not retryable or attempt == max_tries:
                 raise
             time.sleep(min(2 ** (attempt - 1), 20))
 
 
+def _rpc_with_retries(client: RpcClient, method: str, params: list, max_tries: int = 6) -> Any:
+    return _with_retries(lambda: client.call(method, params), max_tries=max_tries)
+
+
 def _http_get_json(url: str, timeout_s: int = 30) -> Any:
     req = Request(url, headers={"user-agent": "livepeer-research/lisar_treasury_proposal_report"})
     with urlopen(req, timeout=timeout_s) as resp:
         raw = resp.read()
-    return json.loads(raw.decode("utf-8"))
+    return _json_loads(raw)
+
+
+def _fetch_proposal_state(proposal_id: int) -> Any:
+    """Explorer proposal state, or None if the explorer is unreachable (it is informational only)."""
+    try:
+        return _http_get_json(f"https://explorer.livepeer.org/api/treasury/proposal/{proposal_id}/state", timeout_s=20)
+    except Exception:
+        return None
 
 
 def _pad_topic_address(addr: str) -> str:
@@ -154,36 +539,38 @@ def _decode_string(data: bytes, offset: int) -> str:
     return raw.decode("utf-8", errors="replace")
 
 
-def _decode_address_array(data: bytes, offset: int) -> List[str]:
+def _array_words(data: bytes, offset: int) -> Tuple[int, int]:
+    """Return `(length, base)` of a static-element array at `offset`, bounds-checked once for all elements."""
     length = _read_word(data, offset)
-    out = []
     base = offset + 32
-    for i in range(length):
-        out.append(_read_address(data, base + i * 32))
-    return out
+    if base + length * 32 > len(data):
+        raise ValueError("array out of bounds")
+    return length, base
+
+
+def _decode_address_array(data: bytes, offset: int) -> List[str]:
+    length, base = _array_words(data, offset)
+    # Hex the whole slab once; each address is the low 20 bytes (last 40 hex chars) of its word.
+    slab = data[base : base + length * 32].hex()
+    return ["0x" + slab[i + 24 : i + 64] for i in range(0, length * 64, 64)]
 
 
 def _decode_uint256_array(data: bytes, offset: int) -> List[int]:
-    length = _read_word(data, offset)
-    out = []
-    base = offset + 32
-    for i in range(length):
-        out.append(_read_word(data, base + i * 32))
-    return out
+    length, base = _array_words(data, offset)
+    from_bytes = int.from_bytes
+    return [from_bytes(data[o : o + 32], "big") for o in range(base, base + length * 32, 32)]
 
 
 def _decode_bytes_array(data: bytes, offset: int) -> List[bytes]:
-    length = _read_word(data, offset)
+    element_offsets = _decode_uint256_array(data, offset)
     head_base = offset + 32
-    element_offsets = [_read_word(data, head_base + i * 32) for i in range(length)]
     # Offsets are relative to the start of the offsets section (i.e. right after the length word).
     return [_decode_bytes(data, head_base + o) for o in element_offsets]
 
 
 def _decode_string_array(data: bytes, offset: int) -> List[str]:
-    length = _read_word(data, offset)
+    element_offsets = _decode_uint256_array(data, offset)
     head_base = offset + 32
-    element_offsets = [_read_word(data, head_base + i * 32) for i in range(length)]
     # Offsets are relative to the start of the offsets section (i.e. right after the length word).
     return [_decode_string(data, head_base + o) for o in element_offsets]
 
@@ -193,7 +580,7 @@ class ProposalAction:
     target: str
     value_wei: int
     signature: str
-    calldata_hex: str
+    calldata: bytes
     decoded: Optional[dict]
 
 
@@ -207,54 +594,253 @@ def _decode_erc20_transfer_calldata(calldata: bytes) -> Optional[dict]:
     return {"type": "erc20_transfer", "to": to, "amount": amount}
 
 
-def _get_block_timestamp(client: RpcClient, block_number: int) -> int:
-    block = _rpc_with_retries(client, "eth_getBlockByNumber", [hex(block_number), False])
-    if not block:
-        raise RpcError(f"missing block {block_number}")
-    return int(block["timestamp"], 16)
+def _get_block_timestamps_batch(
+    client: RpcClient, block_numbers: Iterable[int], cache: Optional[DiskCache] = None
+) -> Dict[int, int]:
+    """Return `{block_number: timestamp}`, fetching all cache misses in one JSON-RPC array request."""
+    out: Dict[int, int] = {}
+    missing: List[int] = []
+    for bn in sorted(set(block_numbers)):
+        ts = cache.get_block_ts(bn) if cache is not None else None
+        if ts is None:
+            missing.append(bn)
+        else:
+            out[bn] = ts
+    if missing:
+        calls = [("eth_getBlockByNumber", [hex(bn), False]) for bn in missing]
+        blocks = _with_retries(lambda: client.call_batch(calls))
+        for bn, block in zip(missing, blocks):
+            if not block:
+                raise RpcError(f"missing block {bn}")
+            out[bn] = int(block["timestamp"], 16)
+            if cache is not None:
+                cache.put_block_ts(bn, out[bn])
+    return out
 
 
 def _get_logs_range(
-    client: RpcClient, *, address: str, topics: list, from_block: int, to_block: int, max_splits: int = 24
+    client: RpcClient,
+    *,
+    address: str,
+    topics: list,
+    from_block: int,
+    to_block: int,
+    max_splits: int = 24,
+    cache: Optional[DiskCache] = None,
 ) -> List[dict]:
-    params = {
-        "address": address,
-        "topics": topics,
-        "fromBlock": hex(from_block),
-        "toBlock": hex(to_block),
-    }
-    try:
-        res = _rpc_with_retries(client, "eth_getLogs", [params])
-        return res or []
-    except RpcError as e:
-        msg = str(e).lower()
-        too_many = any(
-            s in msg
-            for s in (
-                "more than",
-                "too many results",
-                "response size exceeded",
-                "query returned more than",
-                "block range too wide",
+    if cache is not None:
+        cached = cache.get_logs(address, topics, from_block, to_block)
+        if cached is not None:
+            return cached
+    span = to_block - from_block + 1
+    window = client.logs_window
+    if window is None or span <= window or max_splits <= 0:
+        params = {
+            "address": address,
+            "topics": topics,
+            "fromBlock": hex(from_block),
+            "toBlock": hex(to_block),
+        }
+        try:
+            # Materialized per window so a retry never replays half-consumed items.
+            res = _with_retries(lambda: list(client.call_stream("eth_getLogs", [params])))
+        except RpcError as e:
+            msg = str(e).lower()
+            too_many = any(s in msg for s in _GETLOGS_TOO_MANY)
+            if not too_many or max_splits <= 0 or from_block >= to_block:
+                raise
+            client.logs_span_too_large(span)
+            window = client.logs_window
+        else:
+            client.logs_span_ok(span)
+            if cache is not None:
+                cache.put_logs(address, topics, from_block, to_block, res)
+            return res
+    # Split into pieces no wider than the learned window (at least halving), skipping a doomed request when the
+    # provider limit is already known.
+    step = max(1, min(window, (span + 1) // 2))
+    out: List[dict] = []
+    for a in range(from_block, to_block + 1, step):
+        out.extend(
+            _get_logs_range(
+                client,
+                address=address,
+                topics=topics,
+                from_block=a,
+                to_block=min(a + step - 1, to_block),
+                max_splits=max_splits - 1,
+                cache=cache,
             )
         )
-        if not too_many or max_splits <= 0 or from_block >= to_block:
-            raise
-        mid = (from_block + to_block) // 2
-        left = _get_logs_range(
-            client, address=address, topics=topics, from_block=from_block, to_block=mid, max_splits=max_splits - 1
+    return out
+
+
+def _block_windows(from_block: int, to_block: int, chunk_blocks: int) -> List[Tuple[int, int]]:
+    # Aligned to from_block (not the head) so finalized windows keep stable cache keys across runs.
+    step = max(1, chunk_blocks)
+    return [(b, min(b + step - 1, to_block)) for b in range(from_block, to_block + 1, step)]
+
+
+def _get_logs_windows(
+    client: RpcClient,
+    *,
+    address: str,
+    topics: list,
+    ranges: List[Tuple[int, int]],
+    max_splits: int = 24,
+    cache: Optional[DiskCache] = None,
+) -> List[dict]:
+    """Fetch several eth_getLogs windows in one JSON-RPC array request.
+
+    Cached windows are skipped and windows wider than `client.logs_window` are split up front. If the batch fails
+    (e.g. one window has too many results), each window is retried on its own through `_get_logs_range`.
+    """
+    logs: List[dict] = []
+    missing: List[Tuple[int, int]] = []
+    window = client.logs_window
+    for a, b in ranges:
+        cached = cache.get_logs(address, topics, a, b) if cache is not None else None
+        if cached is not None:
+            logs.extend(cached)
+        elif window is not None and b - a + 1 > window:
+            # Known to exceed the provider limit: split up front rather than failing the whole batch.
+            logs.extend(
+                _get_logs_range(
+                    client, address=address, topics=topics, from_block=a, to_block=b, max_splits=max_splits, cache=cache
+                )
+            )
+        else:
+            missing.append((a, b))
+    if not missing:
+        return logs
+    calls = [
+        ("eth_getLogs", [{"address": address, "topics": topics, "fromBlock": hex(a), "toBlock": hex(b)}])
+        for a, b in missing
+    ]
+    try:
+        results = client.call_batch(calls)
+    except RpcError:
+        results = None
+    for i, (a, b) in enumerate(missing):
+        if results is None:
+            logs.extend(
+                _get_logs_range(
+                    client, address=address, topics=topics, from_block=a, to_block=b, max_splits=max_splits, cache=cache
+                )
+            )
+            continue
+        res = results[i] or []
+        client.logs_span_ok(b - a + 1)
+        if cache is not None:
+            cache.put_logs(address, topics, a, b, res)
+        logs.extend(res)
+    return logs
+
+
+def _iter_logs_chunked(
+    client: RpcClient,
+    *,
+    address: str,
+    topics: list,
+    from_block: int,
+    to_block: int,
+    chunk_blocks: int = 2_000_000,
+    workers: int = 1,
+    max_splits: int = 24,
+    cache: Optional[DiskCache] = None,
+) -> Iterator[dict]:
+    """Yield logs over fixed `chunk_blocks` windows, de-duplicated and ordered by `(blockNumber, logIndex)`.
+
+    Windows are sent `LOGS_WINDOWS_PER_BATCH` per JSON-RPC array request, `workers` requests per round; rounds are
+    fetched lazily, so a consumer that stops early skips the rest of the range.
+    """
+    ranges = _block_windows(from_block, to_block, chunk_blocks)
+    groups = [ranges[i : i + LOGS_WINDOWS_PER_BATCH] for i in range(0, len(ranges), LOGS_WINDOWS_PER_BATCH)]
+    step = max(1, workers)
+
+    def fetch(group: List[Tuple[int, int]]) -> List[dict]:
+        return _get_logs_windows(
+            client, address=address, topics=topics, ranges=group, max_splits=max_splits, cache=cache
         )
-        right = _get_logs_range(
-            client, address=address, topics=topics, from_block=mid + 1, to_block=to_block, max_splits=max_splits - 1
+
+    # Drop repeats (overlapping provider answers, retried windows) by (transactionHash, logIndex).
+    seen = set()
+    with ThreadPoolExecutor(max_workers=step) as ex:
+        for i in range(0, len(groups), step):
+            # Rounds cover increasing, disjoint block ranges, so sorting each round keeps the whole stream ordered.
+            logs = [log for part in ex.map(fetch, groups[i : i + step]) for log in part]
+            logs.sort(key=lambda log: (int(log["blockNumber"], 16), int(log.get("logIndex") or "0x0", 16)))
+            for log in logs:
+                key = (log.get("transactionHash"), int(log.get("logIndex") or "0x0", 16))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield log
+
+
+def _get_logs_chunked(
+    client: RpcClient,
+    *,
+    address: str,
+    topics: list,
+    from_block: int,
+    to_block: int,
+    chunk_blocks: int = 2_000_000,
+    workers: int = 1,
+    max_splits: int = 24,
+    cache: Optional[DiskCache] = None,
+) -> List[dict]:
+    return list(
+        _iter_logs_chunked(
+            client,
+            address=address,
+            topics=topics,
+            from_block=from_block,
+            to_block=to_block,
+            chunk_blocks=chunk_blocks,
+            workers=workers,
+            max_splits=max_splits,
+            cache=cache,
         )
-        return left + right
+    )
+
+
+def _find_creation_logs(
+    client: RpcClient,
+    *,
+    governor: str,
+    proposal_id: int,
+    from_block: int,
+    to_block: int,
+    chunk_blocks: int = 2_000_000,
+    workers: int = 1,
+    cache: Optional[DiskCache] = None,
+) -> List[dict]:
+    """
+    Walk ProposalCreated windows backwards from `to_block`, `workers` batches of windows at a time, and stop at
+    the first round holding a log whose data starts with `proposal_id`. Returns that round's logs ([] if none).
+    """
+    want = proposal_id.to_bytes(32, byteorder="big").hex()
+    ranges = _block_windows(from_block, to_block, chunk_blocks)[::-1]
+    groups = [ranges[i : i + LOGS_WINDOWS_PER_BATCH] for i in range(0, len(ranges), LOGS_WINDOWS_PER_BATCH)]
+    step = max(1, workers)
+
+    def fetch(group: List[Tuple[int, int]]) -> List[dict]:
+        return _get_logs_windows(client, address=governor, topics=[TOPIC0_PROPOSAL_CREATED], ranges=group, cache=cache)
+
+    with ThreadPoolExecutor(max_workers=step) as ex:
+        for i in range(0, len(groups), step):
+            logs = [log for part in ex.map(fetch, groups[i : i + step]) for log in part]
+            if any((log.get("data") or "0x")[2:66].lower() == want for log in logs):
+                return logs
+    return []
 
 
 def _parse_proposal_id(s: str) -> int:
     v = s.strip()
     if v.startswith("0x"):
         return int(v, 16)
-    if not re.fullmatch(r"\d+", v):
+    if not _DEC_RE.fullmatch(v):
         raise ValueError(f"invalid proposal id: {s!r}")
     return int(v, 10)
 
@@ -263,10 +849,13 @@ def _to_iso(ts: int) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
 
 
+@functools.lru_cache(maxsize=256)
 def decode_proposal_created_event(data_hex: str) -> dict:
     """
     Decode OpenZeppelin Governor ProposalCreated event:
     ProposalCreated(uint256,address,address[],uint256[],string[],bytes[],uint256,uint256,string)
+
+    Memoized by `data_hex` (a log repeated across window boundaries decodes once); treat the result as read-only.
     """
     data = _hex_to_bytes(data_hex)
     if len(data) < 32 * 9:
@@ -294,7 +883,7 @@ def decode_proposal_created_event(data_hex: str) -> dict:
         "targets": targets,
         "values": values,
         "signatures": signatures,
-        "calldatas": ["0x" + c.hex() for c in calldatas],
+        "calldatas": calldatas,  # raw bytes; hex-encoded only when the report is written
         "start": start,
         "end": end,
         "description": description,
@@ -313,97 +902,172 @@ def main() -> int:
     parser.add_argument("--treasury", default=LIVEPEER_TREASURY)
     parser.add_argument("--lpt-token", default=LPT_TOKEN_ARBITRUM)
     parser.add_argument("--from-block", type=int, default=0)
+    parser.add_argument(
+        "--logs-chunk-blocks",
+        type=int,
+        default=2_000_000,
+        help="Block span per eth_getLogs request; chunks are fetched concurrently (default: 2,000,000).",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent eth_getLogs requests (default: 8).")
+    parser.add_argument(
+        "--rps",
+        type=float,
+        default=5,
+        help="Max RPC HTTP requests per second, shared by all workers; halved on rate-limit errors (0 = unlimited).",
+    )
+    parser.add_argument(
+        "--transfer-window-blocks",
+        type=int,
+        default=16_000_000,
+        help="Search for the executed treasury Transfer only this many blocks after the proposal was created "
+        "(default: 16,000,000, about 46 days of Arbitrum blocks; 0 = up to the latest block).",
+    )
+    parser.add_argument(
+        "--scan-from-head",
+        action="store_true",
+        help="Search ProposalCreated windows backwards from the latest block and stop at the first match "
+        "(faster for recent proposals).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk RPC cache (<out-dir>/rpc_cache.sqlite) for block timestamps and finalized logs.",
+    )
     parser.add_argument("--out-dir", default="artifacts/livepeer-lisar-treasury-proposal")
+    parser.add_argument("--compact", action="store_true", help="Write report.json without indentation.")
     args = parser.parse_args()
 
     proposal_id_int = _parse_proposal_id(args.proposal_id)
 
-    rpc = RpcClient(args.rpc_url)
-    latest = int(_rpc_with_retries(rpc, "eth_blockNumber", []), 16)
-
-    proposal_created_logs = _get_logs_range(
-        rpc,
-        address=args.governor,
-        topics=[TOPIC0_PROPOSAL_CREATED],
-        from_block=args.from_block,
-        to_block=latest,
-    )
+    # The explorer state only depends on the proposal id: fetch it while the on-chain scans run.
+    side_pool = ThreadPoolExecutor(max_workers=1)
+    state_future = side_pool.submit(_fetch_proposal_state, proposal_id_int)
 
-    decoded = None
-    matched_log = None
-    for log in proposal_created_logs:
-        try:
-            d = decode_proposal_created_event(log.get("data") or "0x")
-        except ValueError:
-            continue
-        if int(d["proposal_id"]) == proposal_id_int:
-            decoded = d
-            matched_log = log
-            break
+    cache: Optional[DiskCache] = None
+    try:
+        rpc = RpcClient(args.rpc_url, rps=args.rps)
+        latest = int(_rpc_with_retries(rpc, "eth_blockNumber", []), 16)
+
+        if not args.no_cache:
+            os.makedirs(args.out_dir, exist_ok=True)
+            cache = DiskCache(
+                os.path.join(args.out_dir, "rpc_cache.sqlite"),
+                chain_id=int(_rpc_with_retries(rpc, "eth_chainId", []), 16),
+                finalized_block=latest - FINALITY_CONFIRMATIONS,
+            )
 
-    if decoded is None or matched_log is None:
-        raise SystemExit(f"ProposalCreated not found for proposalId={proposal_id_int} in blocks {args.from_block}..{latest}")
+        if args.scan_from_head:
+            proposal_created_logs = _find_creation_logs(
+                rpc,
+                governor=args.governor,
+                proposal_id=proposal_id_int,
+                from_block=args.from_block,
+                to_block=latest,
+                chunk_blocks=args.logs_chunk_blocks,
+                workers=args.workers,
+                cache=cache,
+            )
+        else:
+            proposal_created_logs = _get_logs_chunked(
+                rpc,
+                address=args.governor,
+                topics=[TOPIC0_PROPOSAL_CREATED],
+                from_block=args.from_block,
+                to_block=latest,
+                chunk_blocks=args.logs_chunk_blocks,
+                workers=args.workers,
+                cache=cache,
+            )
 
-    created_block = int(matched_log["blockNumber"], 16)
-    created_ts = _get_block_timestamp(rpc, created_block)
+        # proposalId is the first (non-indexed) word of the event data: skip the full decode for other proposals.
+        want_id_hex = proposal_id_int.to_bytes(32, byteorder="big").hex()
+        decoded = None
+        matched_log = None
+        for log in proposal_created_logs:
+            data_hex = log.get("data") or "0x"
+            if len(data_hex) < PROPOSAL_CREATED_MIN_DATA_HEX or data_hex[2:66].lower() != want_id_hex:
+                continue
+            try:
+                d = decode_proposal_created_event(data_hex)
+            except ValueError:
+                continue
+            if int(d["proposal_id"]) == proposal_id_int:
+                decoded = d
+                matched_log = log
+                break
+
+        if decoded is None or matched_log is None:
+            raise SystemExit(
+                f"ProposalCreated not found for proposalId={proposal_id_int} in blocks {args.from_block}..{latest}"
+            )
 
-    actions: List[ProposalAction] = []
-    for i, target in enumerate(decoded["targets"]):
-        calldata_hex = decoded["calldatas"][i] if i < len(decoded["calldatas"]) else "0x"
-        sig = decoded["signatures"][i] if i < len(decoded["signatures"]) else ""
-        value = decoded["values"][i] if i < len(decoded["values"]) else 0
-        decoded_action = None
-        try:
-            decoded_action = _decode_erc20_transfer_calldata(_hex_to_bytes(calldata_hex))
-        except ValueError:
-            decoded_action = None
-        actions.append(
-            ProposalAction(
-                target=target,
-                value_wei=value,
-                signature=sig,
-                calldata_hex=calldata_hex,
-                decoded=decoded_action,
+        created_block = int(matched_log["blockNumber"], 16)
+
+        actions: List[ProposalAction] = []
+        for i, target in enumerate(decoded["targets"]):
+            calldata = decoded["calldatas"][i] if i < len(decoded["calldatas"]) else b""
+            sig = decoded["signatures"][i] if i < len(decoded["signatures"]) else ""
+            value = decoded["values"][i] if i < len(decoded["values"]) else 0
+            actions.append(
+                ProposalAction(
+                    target=target,
+                    value_wei=value,
+                    signature=sig,
+                    calldata=calldata,
+                    decoded=_decode_erc20_transfer_calldata(calldata),
+                )
             )
-        )
 
-    # If proposal is a treasury LPT transfer, locate the actual Transfer log (Treasury -> recipient).
-    treasury_transfer = None
-    requested_transfer = next((a for a in actions if a.decoded and a.decoded.get("type") == "erc20_transfer"), None)
-    if requested_transfer and requested_transfer.target.lower() == args.lpt_token.lower():
-        to_addr = requested_transfer.decoded["to"]
-        amount = int(requested_transfer.decoded["amount"])
-        transfer_logs = _get_logs_range(
-            rpc,
-            address=args.lpt_token,
-            topics=[TOPIC0_ERC20_TRANSFER, _pad_topic_address(args.treasury), _pad_topic_address(to_addr)],
-            from_block=created_block,
-            to_block=latest,
-            max_splits=12,
+        # If proposal is a treasury LPT transfer, locate the actual Transfer log (Treasury -> recipient).
+        treasury_transfer = None
+        requested_transfer = next((a for a in actions if a.decoded and a.decoded.get("type") == "erc20_transfer"), None)
+        if requested_transfer and requested_transfer.target.lower() == args.lpt_token.lower():
+            to_addr = requested_transfer.decoded["to"]
+            amount = int(requested_transfer.decoded["amount"])
+            transfer_to_block = latest
+            if args.transfer_window_blocks > 0:
+                transfer_to_block = min(latest, created_block + args.transfer_window_blocks)
+            transfer_logs = _iter_logs_chunked(
+                rpc,
+                address=args.lpt_token,
+                topics=[TOPIC0_ERC20_TRANSFER, _pad_topic_address(args.treasury), _pad_topic_address(to_addr)],
+                from_block=created_block,
+                to_block=transfer_to_block,
+                chunk_blocks=args.logs_chunk_blocks,
+                workers=args.workers,
+                max_splits=12,
+                cache=cache,
+            )
+            # Choose first matching amount (stops the scan: later windows are never fetched).
+            # Transfer data is the single uint256 amount word; compare it as hex text instead of parsing every log.
+            want_amount_hex = format(amount, "064x")
+            for log in transfer_logs:
+                data_hex = log.get("data") or "0x"
+                if len(data_hex) < 66 or data_hex[-64:].lower() != want_amount_hex:
+                    continue
+                treasury_transfer = {
+                    "block_number": int(log["blockNumber"], 16),
+                    "tx_hash": log["transactionHash"],
+                    "from": _topic_to_address(log["topics"][1]),
+                    "to": _topic_to_address(log["topics"][2]),
+                    "amount": amount,
+                }
+                break
+
+        # Both block timestamps in one round-trip.
+        timestamps = _get_block_timestamps_batch(
+            rpc, [created_block] + ([treasury_transfer["block_number"]] if treasury_transfer else []), cache
         )
-        # Choose first matching amount
-        for log in transfer_logs:
-            if int(log.get("data") or "0x0", 16) != amount:
-                continue
-            bn = int(log["blockNumber"], 16)
-            treasury_transfer = {
-                "block_number": bn,
-                "block_timestamp": _get_block_timestamp(rpc, bn),
-                "tx_hash": log["transactionHash"],
-                "from": _topic_to_address(log["topics"][1]),
-                "to": _topic_to_address(log["topics"][2]),
-                "amount": amount,
-            }
-            break
+        created_ts = timestamps[created_block]
+        if treasury_transfer:
+            treasury_transfer["block_timestamp"] = timestamps[treasury_transfer["block_number"]]
 
-    proposal_state = None
-    try:
-        proposal_state = _http_get_json(
-            f"https://explorer.livepeer.org/api/treasury/proposal/{proposal_id_int}/state",
-            timeout_s=20,
-        )
-    except Exception:
-        proposal_state = None
+        proposal_state = state_future.result()
+    finally:
+        # Also on early exits (proposal not found, RPC errors): close the cache and don't wait for the explorer.
+        if cache is not None:
+            cache.close()
+        side_pool.shutdown(wait=False, cancel_futures=True)
 
     os.makedirs(args.out_dir, exist_ok=True)
 
@@ -422,13 +1086,13 @@ def main() -> int:
             "block_number": created_block,
             "block_timestamp": created_ts,
         },
-        "proposal": decoded,
+        "proposal": {**decoded, "calldatas": ["0x" + c.hex() for c in decoded["calldatas"]]},
         "actions": [
             {
                 "target": a.target,
                 "value_wei": a.value_wei,
                 "signature": a.signature,
-                "calldata": a.calldata_hex,
+                "calldata": "0x" + a.calldata.hex(),
                 "decoded": a.decoded,
             }
             for a in actions
@@ -438,50 +1102,57 @@ def main() -> int:
         "generated_at_utc": datetime.now(tz=timezone.utc).isoformat(),
     }
 
-    with open(os.path.join(args.out_dir, "report.json"), "w", encoding="utf-8") as f:
-        json.dump(out, f, indent=2, sort_keys=True)
-        f.write("\n")
+    _write_json(os.path.join(args.out_dir, "report.json"), out, compact=args.compact)
 
+    description = decoded["description"]
     with open(os.path.join(args.out_dir, "proposal_description.md"), "w", encoding="utf-8") as f:
-        f.write(decoded["description"])
-        if not decoded["description"].endswith("\n"):
-            f.write("\n")
-
+        f.write(description if description.endswith("\n") else description + "\n")
+
+    created_iso = _to_iso(created_ts)
+    lines: List[str] = []
+    lines.append("# Livepeer Treasury Proposal — On-Chain Report (Arbitrum)")
+    lines.append("")
+    lines.append(f"- Proposal id: `{proposal_id_int}`")
+    lines.append(f"- Governor: `{args.governor}`")
+    lines.append(f"- Created tx: `{matched_log.get('transactionHash')}`")
+    lines.append(f"- Created block: `{created_block}` ({created_iso})")
+    lines.append(f"- Proposer: `{decoded['proposer']}`")
+    if proposal_state and isinstance(proposal_state, dict):
+        state = proposal_state.get("state")
+        if state:
+            lines.append(f"- Explorer state: `{state}`")
+    lines.append("")
+    lines.append("## Actions")
+    lines.append("")
+    for i, a in enumerate(actions):
+        lines.append(f"### Action {i+1}")
+        lines.append("")
+        lines.append(f"- Target: `{a.target}`")
+        lines.append(f"- Value: `{a.value_wei}`")
+        if a.signature:
+            lines.append(f"- Signature: `{a.signature}`")
+        if a.decoded and a.decoded.get("type") == "erc20_transfer":
+            lines.append(f"- Decoded: `transfer({a.decoded['to']}, {a.decoded['amount']})`")
+        lines.append("")
+
+    if treasury_transfer:
+        transfer_iso = _to_iso(treasury_transfer["block_timestamp"])
+        lines.append("## Treasury Transfer (ERC20 Transfer Log)")
+        lines.append("")
+        lines.append(f"- From: `{treasury_transfer['from']}`")
+        lines.append(f"- To: `{treasury_transfer['to']}`")
+        lines.append(f"- Amount (raw): `{treasury_transfer['amount']}`")
+        lines.append(f"- Tx: `{treasury_transfer['tx_hash']}`")
+        lines.append(f"- Block: `{treasury_transfer['block_number']}` ({transfer_iso})")
+        lines.append("")
+
+    lines.append("## Proposal Description")
+    lines.append("")
+    lines.append("See `proposal_description.md`.")
+
+    # One write per file instead of one per line.
     with open(os.path.join(args.out_dir, "report.md"), "w", encoding="utf-8") as f:
-        f.write("# Livepeer Treasury Proposal — On-Chain Report (Arbitrum)\n\n")
-        f.write(f"- Proposal id: `{proposal_id_int}`\n")
-        f.write(f"- Governor: `{args.governor}`\n")
-        f.write(f"- Created tx: `{matched_log.get('transactionHash')}`\n")
-        f.write(f"- Created block: `{created_block}` ({_to_iso(created_ts)})\n")
-        f.write(f"- Proposer: `{decoded['proposer']}`\n")
-        if proposal_state and isinstance(proposal_state, dict):
-            state = proposal_state.get('state')
-            if state:
-                f.write(f"- Explorer state: `{state}`\n")
-        f.write("\n## Actions\n\n")
-        for i, a in enumerate(actions):
-            f.write(f"### Action {i+1}\n\n")
-            f.write(f"- Target: `{a.target}`\n")
-            f.write(f"- Value: `{a.value_wei}`\n")
-            if a.signature:
-                f.write(f"- Signature: `{a.signature}`\n")
-            if a.decoded and a.decoded.get("type") == "erc20_transfer":
-                f.write(f"- Decoded: `transfer({a.decoded['to']}, {a.decoded['amount']})`\n")
-            f.write("\n")
-
-        if treasury_transfer:
-            f.write("## Treasury Transfer (ERC20 Transfer Log)\n\n")
-            f.write(f"- From: `{treasury_transfer['from']}`\n")
-            f.write(f"- To: `{treasury_transfer['to']}`\n")
-            f.write(f"- Amount (raw): `{treasury_transfer['amount']}`\n")
-            f.write(f"- Tx: `{treasury_transfer['tx_hash']}`\n")
-            f.write(
-                f"- Block: `{treasury_transfer['block_number']}` ({_to_iso(treasury_transfer['block_timestamp'])})\n"
-            )
-            f.write("\n")
-
-        f.write("## Proposal Description\n\n")
-        f.write("See `proposal_description.md`.\n")
+        f.write("\n".join(lines) + "\n")
 
     return 0
 
@@ -10,15 +10,22 @@ from typing import Any
 
 from utils import (
     DATA_DIR,
+    HTTP_SESSION,
+    KNOWN_ERC20_DECIMALS,
     OUTPUTS_DIR,
     abi_encode_uint,
+    backoff_sleep_s,
+    coingecko_api,
     coingecko_simple_price,
     decode_address_word,
     decode_uint256,
     eth_call,
+    eth_call_batch,
+    eth_call_parallel,
     env,
     keccak_selector,
     read_json,
+    update_json_cache,
     write_json,
 )
 
@@ -38,97 +45,117 @@ KNOWN_ADDRESS_TO_COINGECKO_ID: dict[str, str] = {
 
 
 def decode_address_array(hexdata: str) -> list[str]:
-    if hexdata.startswith("0x"):
-        hexdata = hexdata[2:]
-    words = [hexdata[i : i + 64] for i in range(0, len(hexdata), 64)]
-    if not words:
+    raw = bytes.fromhex(hexdata[2:] if hexdata.startswith("0x") else hexdata)
+    if len(raw) < 32:
         return []
-    offset = int(words[0], 16) // 32
-    if offset >= len(words):
+    offset = int.from_bytes(raw[:32], "big") // 32 * 32
+    if offset + 32 > len(raw):
         return []
-    length = int(words[offset], 16)
-    out: list[str] = []
-    for i in range(length):
-        w = words[offset + 1 + i]
-        out.append("0x" + w[-40:])
-    return out
+    length = int.from_bytes(raw[offset : offset + 32], "big")
+    base = offset + 32
+    if base + length * 32 > len(raw):
+        raise ValueError(f"Truncated address[] return data ({length} entries, {len(raw)} bytes)")
+    # Address words are left-padded: the address is the last 20 bytes of each 32-byte word.
+    return ["0x" + raw[base + i * 32 + 12 : base + (i + 1) * 32].hex() for i in range(length)]
 
 
-def read_addr(rpc_url: str, to: str, fn_sig: str) -> str:
-    sel = "0x" + keccak_selector(fn_sig)
-    res = eth_call(rpc_url, to, sel)
+def decode_addr_result(res: str) -> str:
     return decode_address_word(res[2:].rjust(64, "0"))
 
 
+def decode_total_underlying(res: str) -> tuple[int, int]:
+    data = res[2:].rjust(64 * 2, "0")
+    return int(data[0:64], 16), int(data[64:128], 16)
+
+
 def read_uint(rpc_url: str, to: str, fn_sig: str) -> int:
     sel = "0x" + keccak_selector(fn_sig)
     res = eth_call(rpc_url, to, sel)
     return decode_uint256(res)
 
 
-def read_total_underlying(rpc_url: str, vault: str) -> tuple[int, int]:
-    sel = "0x" + keccak_selector("totalUnderlying()")
-    res = eth_call(rpc_url, vault, sel)
-    data = res[2:].rjust(64 * 2, "0")
-    return int(data[0:64], 16), int(data[64:128], 16)
-
-
 def coingecko_token_price(
     *,
     platform_id: str,
-    contract_address: str,
+    contract_addresses: list[str],
     vs_currency: str = "usd",
     cache_path: Path | None = None,
     refresh: bool = False,
+    batch_size: int | None = None,
 ) -> dict[str, dict[str, float]]:
-    # CoinGecko token_price endpoint keyed by contract address.
+    # CoinGecko token_price endpoint keyed by contract address (comma-separated; chunked to keep URLs short).
     #
-    # Note: CoinGecko free API currently limits token_price requests to 1 contract address.
-    contract_address = contract_address.lower()
+    # The keyless free tier limits token_price requests to 1 contract address, so batch_size defaults to 30
+    # only when a CoinGecko key is configured.
     cache_path = cache_path or (DATA_DIR / f"coingecko-token-price-{platform_id}-{vs_currency}.json")
     cache: dict[str, Any] = {}
     if cache_path.exists():
         cache = read_json(cache_path)
         if not isinstance(cache, dict):
             cache = {}
-    if not refresh and contract_address in cache and isinstance(cache[contract_address], dict) and vs_currency in cache[contract_address]:
+
+    todo: list[str] = []
+    for addr in dict.fromkeys(a.lower() for a in contract_addresses):
+        if not refresh and addr in cache and isinstance(cache[addr], dict) and vs_currency in cache[addr]:
+            continue
+        todo.append(addr)
+    if not todo:
         return cache
 
     import requests
 
-    url = f"https://api.coingecko.com/api/v3/simple/token_price/{platform_id}"
-    max_attempts = 6
-    backoff_s = 1.0
-    last_err: Exception | None = None
-    for attempt in range(1, max_attempts + 1):
-        try:
-            resp = requests.get(
-                url,
-                params={
-                    "contract_addresses": contract_address,
-                    "vs_currencies": vs_currency,
-                },
-                timeout=30,
-                headers={"User-Agent": "proposal-review/1.0"},
-            )
-            if resp.status_code == 429 or 500 <= resp.status_code < 600:
-                raise requests.HTTPError(f"CoinGecko HTTP {resp.status_code}", response=resp)
-            resp.raise_for_status()
-            data = resp.json()
-            if isinstance(data, dict):
-                cache.update(data)
-                write_json(cache_path, cache)
-            # Conservative throttling for free-tier limits.
-            time.sleep(1.2)
-            return cache
-        except (requests.RequestException, ValueError) as e:
-            last_err = e
-            if attempt >= max_attempts:
-                raise
-            time.sleep(backoff_s)
-            backoff_s = min(30.0, backoff_s * 2)
-
-    raise RuntimeError("unreachable") from last_err
+    base_url, auth_headers = coingecko_api()
+    url = f"{base_url}/simple/token_price/{platform_id}"
+    if batch_size is None:
+        batch_size = 30 if auth_headers else 1
+    batch_size = max(1, batch_size)
+    fetched: dict[str, Any] = {}
+    try:
+        for start in range(0, len(todo), batch_size):
+            chunk = todo[start : start + batch_size]
+            max_attempts = 6
+            last_err: Exception | None = None
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    resp = HTTP_SESSION.get(
+                        url,
+                        params={
+                            "contract_addresses": ",".join(chunk),
+                            "vs_currencies": vs_currency,
+                        },
+                        timeout=30,
+                        headers={"User-Agent": "proposal-review/1.0", **auth_headers},
+                    )
+                    if resp.status_code == 429 or 500 <= resp.status_code < 600:
+                        raise requests.HTTPError(f"CoinGecko HTTP {resp.status_code}", response=resp)
+                    resp.raise_for_status()
+                    data = resp.json()
+                    if isinstance(data, dict):
+                        fetched.update(data)
+                    if not auth_headers:
+                        # Conservative throttling for keyless free-tier limits.
+                        time.sleep(1.2)
+                    break
+                except (requests.RequestException, ValueError) as e:
+                    last_err = e
+                    if attempt >= max_attempts:
+                        raise
+                    time.sleep(backoff_sleep_s(attempt, resp=getattr(e, "response", None)))
+            else:
+                raise RuntimeError("unreachable") from last_err
+    finally:
+        # One flush for the whole call (also on failure, so fetched chunks are kept).
+        if fetched:
+            cache = update_json_cache(cache_path, fetched)
+
+    return cache
+
+
+CSV_FIELDS = ["vault", "type", "token0", "token1", "amount0", "amount1", "price0_usd", "price1_usd", "tvl_usd"]
+
+
+def fmt_float(value: float | None, digits: int) -> str:
+    return "" if value is None else f"{value:.{digits}f}"
 
 
 @dataclass(frozen=True)
@@ -156,8 +183,20 @@ def main() -> int:
     parser.add_argument(
         "--fetch-token-prices",
         action="store_true",
-        help="Fetch prices for unknown ERC20s via CoinGecko token_price (slow; may 429 on free tier).",
+        help="Fetch prices for unknown ERC20s via CoinGecko token_price (slow; may 429 without COINGECKO_API_KEY).",
     )
+    parser.add_argument(
+        "--token-price-batch-size",
+        type=int,
+        default=None,
+        help="Contract addresses per CoinGecko token_price request (default: 30 with a CoinGecko API key, 1 on the keyless tier).",
+    )
+    parser.add_argument(
+        "--no-rpc-batch",
+        action="store_true",
+        help="Send eth_calls individually over a thread pool (for RPC nodes that reject JSON-RPC batches).",
+    )
+    parser.add_argument("--workers", type=int, default=16, help="Thread pool size with --no-rpc-batch.")
     parser.add_argument("--refresh", action="store_true")
     parser.add_argument("--out-json", default=str(OUTPUTS_DIR / "arrakis-vault-survey.json"))
     parser.add_argument("--out-csv", default=str(OUTPUTS_DIR / "arrakis-vault-survey.csv"))
@@ -166,6 +205,11 @@ def main() -> int:
     rpc_url = args.rpc_url
     factory = args.factory
 
+    def call_many(calls: list[tuple[str, str]]) -> list[str]:
+        if args.no_rpc_batch:
+            return eth_call_parallel(rpc_url, calls, max_workers=args.workers)
+        return eth_call_batch(rpc_url, calls)
+
     types = ["public", "private"] if args.type == "both" else [args.type]
 
     vaults: list[tuple[str, str]] = []
@@ -193,12 +237,17 @@ def main() -> int:
         vaults_unique.append((a, t))
 
     # Gather token addresses only for vaults that currently hold something, to avoid huge token-price scans.
+    # All per-vault reads go out together (batched or concurrent) instead of 3 serial round-trips per vault.
+    vault_sels = ["0x" + keccak_selector(sig) for sig in ("token0()", "token1()", "totalUnderlying()")]
+    vault_results = call_many([(vault, sel) for vault, _ in vaults_unique for sel in vault_sels])
+
     vault_meta: dict[str, dict[str, Any]] = {}
     token_addrs: set[str] = set()
-    for vault, vtype in vaults_unique:
-        t0 = read_addr(rpc_url, vault, "token0()").lower()
-        t1 = read_addr(rpc_url, vault, "token1()").lower()
-        raw0, raw1 = read_total_underlying(rpc_url, vault)
+    for i, (vault, vtype) in enumerate(vaults_unique):
+        res0, res1, res_underlying = vault_results[3 * i : 3 * i + 3]
+        t0 = decode_addr_result(res0).lower()
+        t1 = decode_addr_result(res1).lower()
+        raw0, raw1 = decode_total_underlying(res_underlying)
         if raw0 == 0 and raw1 == 0:
             continue
         vault_meta[vault] = {"type": vtype, "token0": t0, "token1": t1, "raw0": raw0, "raw1": raw1}
@@ -206,6 +255,13 @@ def main() -> int:
         token_addrs.add(t1)
 
     token_list = sorted(a for a in token_addrs if a not in {NATIVE_TOKEN_PLACEHOLDER, "0x0000000000000000000000000000000000000000"})
+
+    decimals = {NATIVE_TOKEN_PLACEHOLDER: 18}
+    decimals.update({a: KNOWN_ERC20_DECIMALS[a] for a in token_addrs if a in KNOWN_ERC20_DECIMALS})
+    erc20s = sorted(token_addrs - decimals.keys())
+    decimals_sel = "0x" + keccak_selector("decimals()")
+    for token, res in zip(erc20s, call_many([(token, decimals_sel) for token in erc20s])):
+        decimals[token] = decode_uint256(res)
     prices: dict[str, dict[str, float]] = {}
     native_price_usd: float | None = None
     if NATIVE_TOKEN_PLACEHOLDER in token_addrs:
@@ -222,28 +278,28 @@ def main() -> int:
     # 2) Slow path: attempt token_price for unknowns (often rate-limited on free tier).
     if args.fetch_token_prices:
         cache_path = DATA_DIR / f"coingecko-token-price-{args.platform_id}-usd.json"
-        for token in token_list:
-            if token in prices:
-                continue
-            try:
-                prices.update(
-                    coingecko_token_price(
-                        platform_id=args.platform_id,
-                        contract_address=token,
-                        cache_path=cache_path,
-                        refresh=args.refresh,
-                    )
-                )
-            except Exception:
-                # Leave price missing; continue.
-                continue
+        unknown = [token for token in token_list if token not in prices]
+        try:
+            token_prices = coingecko_token_price(
+                platform_id=args.platform_id,
+                contract_addresses=unknown,
+                cache_path=cache_path,
+                refresh=args.refresh,
+                batch_size=args.token_price_batch_size,
+            )
+        except Exception:
+            # Leave the rest missing; chunks fetched before the failure are already in the cache file.
+            token_prices = read_json(cache_path) if cache_path.exists() else {}
+        for token in unknown:
+            if isinstance(token_prices.get(token), dict):
+                prices[token] = token_prices[token]
 
     rows: list[VaultRow] = []
     for vault, meta in vault_meta.items():
         token0 = meta["token0"]
         token1 = meta["token1"]
-        dec0 = 18 if token0 == NATIVE_TOKEN_PLACEHOLDER else read_uint(rpc_url, token0, "decimals()")
-        dec1 = 18 if token1 == NATIVE_TOKEN_PLACEHOLDER else read_uint(rpc_url, token1, "decimals()")
+        dec0 = decimals[token0]
+        dec1 = decimals[token1]
         raw0 = int(meta["raw0"])
         raw1 = int(meta["raw1"])
         amt0 = Decimal(raw0) / Decimal(10**dec0)
@@ -274,6 +330,21 @@ def main() -> int:
     # Sort by TVL desc, with None last.
     rows_sorted = sorted(rows, key=lambda r: (-r.tvl_usd if r.tvl_usd is not None else float("inf")))
 
+    row_dicts = [
+        {
+            "vault": r.vault,
+            "type": r.vault_type,
+            "token0": r.token0,
+            "token1": r.token1,
+            "amount0": str(r.amount0),
+            "amount1": str(r.amount1),
+            "price0_usd": r.price0_usd,
+            "price1_usd": r.price1_usd,
+            "tvl_usd": r.tvl_usd,
+        }
+        for r in rows_sorted
+    ]
+
     out_json = Path(args.out_json)
     write_json(
         out_json,
@@ -282,55 +353,24 @@ def main() -> int:
             "platform_id": args.platform_id,
             "factory": factory,
             "counts": {"vaults": len(rows), "tokens": len(token_list)},
-            "rows": [
-                {
-                    "vault": r.vault,
-                    "type": r.vault_type,
-                    "token0": r.token0,
-                    "token1": r.token1,
-                    "amount0": str(r.amount0),
-                    "amount1": str(r.amount1),
-                    "price0_usd": r.price0_usd,
-                    "price1_usd": r.price1_usd,
-                    "tvl_usd": r.tvl_usd,
-                }
-                for r in rows_sorted
-            ],
+            "rows": row_dicts,
         },
     )
 
     out_csv = Path(args.out_csv)
     out_csv.parent.mkdir(parents=True, exist_ok=True)
-    with out_csv.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(
-            f,
-            fieldnames=[
-                "vault",
-                "type",
-                "token0",
-                "token1",
-                "amount0",
-                "amount1",
-                "price0_usd",
-                "price1_usd",
-                "tvl_usd",
-            ],
-        )
+    with out_csv.open("w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+        w = csv.DictWriter(f, fieldnames=CSV_FIELDS)
         w.writeheader()
-        for r in rows_sorted:
-            w.writerow(
-                {
-                    "vault": r.vault,
-                    "type": r.vault_type,
-                    "token0": r.token0,
-                    "token1": r.token1,
-                    "amount0": str(r.amount0),
-                    "amount1": str(r.amount1),
-                    "price0_usd": "" if r.price0_usd is None else f"{r.price0_usd:.8f}",
-                    "price1_usd": "" if r.price1_usd is None else f"{r.price1_usd:.8f}",
-                    "tvl_usd": "" if r.tvl_usd is None else f"{r.tvl_usd:.2f}",
-                }
-            )
+        w.writerows(
+            {
+                **row,
+                "price0_usd": fmt_float(row["price0_usd"], 8),
+                "price1_usd": fmt_float(row["price1_usd"], 8),
+                "tvl_usd": fmt_float(row["tvl_usd"], 2),
+            }
+            for row in row_dicts
+        )
 
     print(f"Wrote `{out_json}` and `{out_csv}`.")
     if rows_sorted:
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import re
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from pypdf import PdfReader
 
@@ -16,41 +18,107 @@ AUDITS: dict[str, str] = {
 }
 
 
-def extract_text(pdf_path: Path) -> str:
-    reader = PdfReader(str(pdf_path))
-    return "\n".join((page.extract_text() or "") for page in reader.pages)
+SEVERITIES = ["Critical", "High", "Medium", "Low", "Informational"]
+KEYWORDS = [
+    "beacon",
+    "upgrade",
+    "guardian",
+    "owner",
+    "timelock",
+    "nft",
+    "hook",
+    "approval",
+    "pause",
+    "whitelist",
+]
+
+_NUMBER_RE = re.compile(r"\b(\d+)\b")
 
 
-def parse_findings_overview(text: str) -> dict[str, int] | None:
-    severities = ["Critical", "High", "Medium", "Low", "Informational"]
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    try:
-        start = next(i for i, ln in enumerate(lines) if "Overview of the Findings" in ln)
-    except StopIteration:
-        return None
-    window = lines[start : start + 140]
+def extract_lines(pdf_path: Path, txt_path: Path) -> Iterator[str]:
+    # Page-at-a-time: tee the raw text to `txt_path` and yield stripped, non-empty lines.
+    # Consume the iterator fully, otherwise `txt_path` is left truncated.
+    reader = PdfReader(str(pdf_path))
+    with txt_path.open("w", encoding="utf-8") as f:
+        for i, page in enumerate(reader.pages):
+            text = page.extract_text() or ""
+            if i:
+                f.write("\n")
+            f.write(text)
+            for ln in text.splitlines():
+                ln = ln.strip()
+                if ln:
+                    yield ln
+
+
+def cached_lines(txt_path: Path) -> Iterator[str]:
+    # Same lines `extract_lines` yields, read back from a previous extraction.
+    for ln in txt_path.read_text(encoding="utf-8").splitlines():
+        ln = ln.strip()
+        if ln:
+            yield ln
+
+
+def pdf_digest(pdf_path: Path) -> str:
+    return hashlib.blake2b(pdf_path.read_bytes(), digest_size=16).hexdigest()
+
+
+def scan_audit_lines(
+    lines: Iterable[str],
+    keywords: list[str],
+    *,
+    max_lines: int = 12,
+    window: int = 140,
+    lookahead: int = 12,
+) -> tuple[dict[str, int] | None, dict[str, list[str]]]:
+    # One pass over the lines for both the findings-overview severity counts and the keyword hits.
+    #
+    # Severity counts: within `window` lines from the first "Overview of the Findings", take the first line equal
+    # to each severity label and the first number on one of the next `lookahead - 1` lines. (ChainSecurity lays
+    # this out as label / "-Severity Findings" / count, so the count is not necessarily on the very next line.)
+    # Once every label is resolved, or the window is passed, the overview state is no longer consulted.
+    overview_end: int | None = None
+    overview_done = False
+    label_at: dict[str, int] = {}
+    pending: dict[str, int] = {}
     counts: dict[str, int] = {}
-    for sev in severities:
-        idxs = [i for i, ln in enumerate(window) if ln == sev]
-        if not idxs:
+    hits: dict[str, list[str]] = {kw: [] for kw in keywords}
+    kw_lower = [(kw, kw.lower()) for kw in keywords]
+    # One C-level scan rejects the (vast majority of) lines without any keyword; only hits are attributed per keyword,
+    # since a line can match several keywords and alternation reports just one.
+    kw_pattern = re.compile("|".join(re.escape(kw) for kw in keywords), re.IGNORECASE) if keywords else None
+
+    for i, ln in enumerate(lines):
+        if not overview_done:
+            if overview_end is None and "Overview of the Findings" in ln:
+                overview_end = i + window
+            if overview_end is not None:
+                if i >= overview_end:
+                    overview_done = True
+                else:
+                    if pending:
+                        m = _NUMBER_RE.search(ln)
+                        for sev, idx in list(pending.items()):
+                            if i >= idx + lookahead:
+                                del pending[sev]
+                            elif m:
+                                counts[sev] = int(m.group(1))
+                                del pending[sev]
+                    if ln in SEVERITIES and ln not in label_at:
+                        label_at[ln] = i
+                        pending[ln] = i
+                    overview_done = len(label_at) == len(SEVERITIES) and not pending
+
+        if kw_pattern is None or kw_pattern.search(ln) is None:
             continue
-        idx = idxs[0]
-        for j in range(idx + 1, min(idx + 12, len(window))):
-            m = re.search(r"\b(\d+)\b", window[j])
-            if m:
-                counts[sev] = int(m.group(1))
-                break
-    return counts or None
+        ln_lower = ln.lower()
+        for kw, kwl in kw_lower:
+            bucket = hits[kw]
+            if len(bucket) < max_lines and kwl in ln_lower:
+                bucket.append(ln)
 
-
-def keyword_snippets(text: str, keywords: list[str], *, max_lines: int = 12) -> dict[str, list[str]]:
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    out: dict[str, list[str]] = {}
-    for kw in keywords:
-        matches = [ln for ln in lines if kw.lower() in ln.lower()]
-        if matches:
-            out[kw] = matches[:max_lines]
-    return out
+    ordered = {sev: counts[sev] for sev in SEVERITIES if sev in counts}
+    return (ordered or None), {kw: bucket for kw, bucket in hits.items() if bucket}
 
 
 def main() -> int:
@@ -65,11 +133,17 @@ def main() -> int:
 
     for filename, url in AUDITS.items():
         pdf_path = cached_download(url, audits_dir / filename, refresh=args.refresh)
-        text = extract_text(pdf_path)
         txt_path = audits_dir / (pdf_path.stem + ".txt")
-        txt_path.write_text(text, encoding="utf-8")
+        # pypdf extraction dominates the runtime; reuse the .txt while the PDF bytes are unchanged.
+        digest_path = audits_dir / (pdf_path.stem + ".txt.blake2b")
+        digest = pdf_digest(pdf_path)
+        cached = txt_path.exists() and digest_path.exists() and digest_path.read_text(encoding="utf-8").strip() == digest
+        if cached:
+            counts, snippets = scan_audit_lines(cached_lines(txt_path), KEYWORDS)
+        else:
+            counts, snippets = scan_audit_lines(extract_lines(pdf_path, txt_path), KEYWORDS)
+            digest_path.write_text(digest + "\n", encoding="utf-8")
 
-        counts = parse_findings_overview(text)
         report_lines.append(f"## {filename}")
         report_lines.append(f"- Source: {url}")
         report_lines.append(f"- Cached: `{pdf_path}`")
@@ -81,21 +155,6 @@ def main() -> int:
         else:
             report_lines.append("- Findings overview: (not parsed)")
 
-        snippets = keyword_snippets(
-            text,
-            keywords=[
-                "beacon",
-                "upgrade",
-                "guardian",
-                "owner",
-                "timelock",
-                "nft",
-                "hook",
-                "approval",
-                "pause",
-                "whitelist",
-            ],
-        )
         if snippets:
             report_lines.append("- Notable keyword hits (quick scan; review the PDF for full context):")
             for kw, lines in snippets.items():
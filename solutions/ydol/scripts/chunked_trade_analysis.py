@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from utils import (
+    KNOWN_ERC20_DECIMALS,
     OUTPUTS_DIR,
     UniswapV3PoolState,
     abi_encode_address,
     abi_encode_uint,
+    cached_eth_call,
     coingecko_simple_price,
     decode_address_word,
     decode_uint256,
@@ -42,17 +46,25 @@ def quote_exact_input_single(*, rpc_url: str, quoter: str, token_in: str, token_
 
 def read_pool_token(rpc_url: str, pool: str, fn_sig: str) -> str:
     sel = "0x" + keccak_selector(fn_sig)
-    res = eth_call(rpc_url, pool, sel)
+    res = cached_eth_call(rpc_url, pool, sel)
     word = res[2:].rjust(64, "0")
     return decode_address_word(word)
 
 
 def read_erc20_decimals(rpc_url: str, token: str) -> int:
+    known = KNOWN_ERC20_DECIMALS.get(token.lower())
+    if known is not None:
+        return known
     sel = "0x" + keccak_selector("decimals()")
-    res = eth_call(rpc_url, token, sel)
+    res = cached_eth_call(rpc_url, token, sel)
     return decode_uint256(res)
 
 
+@lru_cache(maxsize=None)
+def _decimal_scale(decimals: int) -> Decimal:
+    return Decimal(10**decimals)
+
+
 def compute_spot_token1_per_token0(state: UniswapV3PoolState) -> Decimal:
     sqrt_price = Decimal(state.sqrt_price_x96) / Decimal(2**96)
     return sqrt_price * sqrt_price
@@ -77,7 +89,7 @@ def _impact_pct(*, direction: str, exec_price: Decimal, spot: Decimal) -> Decima
     raise ValueError(f"unknown direction: {direction}")
 
 
-def simulate_trade(
+def quote_trade_amounts(
     *,
     rpc_url: str,
     quoter: str,
@@ -86,49 +98,78 @@ def simulate_trade(
     dec0: int,
     dec1: int,
     fee: int,
-    spot_t1_per_t0: Decimal,
     t0_usd: Decimal,
     t1_usd: Decimal,
     total_usd: Decimal,
     direction: str,
-) -> TradeResult:
+) -> tuple[Decimal, Decimal]:
+    # (input, output) in token units for a single swap worth `total_usd`.
+    scale0 = _decimal_scale(dec0)
+    scale1 = _decimal_scale(dec1)
+
+    # Amounts are positive, so int() truncation is the same floor the quoter input needs.
     if direction == "buy_token0":
         t1_in = total_usd / t1_usd
-        t1_in_wei = int((t1_in * Decimal(10**dec1)).to_integral_value(rounding="ROUND_FLOOR"))
+        t1_in_wei = int(t1_in * scale1)
         t0_out = Decimal(
             quote_exact_input_single(rpc_url=rpc_url, quoter=quoter, token_in=token1, token_out=token0, fee=fee, amount_in=t1_in_wei)
-        ) / Decimal(10**dec0)
-        exec_price = (t1_in / t0_out) if t0_out != 0 else Decimal("NaN")
-        impact = _impact_pct(direction=direction, exec_price=exec_price, spot=spot_t1_per_t0)
-        return TradeResult(
-            total_usd=float(total_usd),
-            direction=direction,
-            input_amount=str(t1_in),
-            output_amount=str(t0_out),
-            exec_price_token1_per_token0=str(exec_price),
-            impact_pct=str(impact),
-        )
+        ) / scale0
+        return t1_in, t0_out
 
     if direction == "sell_token0":
         t0_in = total_usd / t0_usd
-        t0_in_wei = int((t0_in * Decimal(10**dec0)).to_integral_value(rounding="ROUND_FLOOR"))
+        t0_in_wei = int(t0_in * scale0)
         t1_out = Decimal(
             quote_exact_input_single(rpc_url=rpc_url, quoter=quoter, token_in=token0, token_out=token1, fee=fee, amount_in=t0_in_wei)
-        ) / Decimal(10**dec1)
-        exec_price = (t1_out / t0_in) if t0_in != 0 else Decimal("NaN")
-        impact = _impact_pct(direction=direction, exec_price=exec_price, spot=spot_t1_per_t0)
-        return TradeResult(
-            total_usd=float(total_usd),
-            direction=direction,
-            input_amount=str(t0_in),
-            output_amount=str(t1_out),
-            exec_price_token1_per_token0=str(exec_price),
-            impact_pct=str(impact),
-        )
+        ) / scale1
+        return t0_in, t1_out
 
     raise ValueError(f"unknown direction: {direction}")
 
 
+def simulate_trade(
+    *,
+    rpc_url: str,
+    quoter: str,
+    token0: str,
+    token1: str,
+    dec0: int,
+    dec1: int,
+    fee: int,
+    spot_t1_per_t0: Decimal,
+    t0_usd: Decimal,
+    t1_usd: Decimal,
+    total_usd: Decimal,
+    direction: str,
+) -> TradeResult:
+    amount_in, amount_out = quote_trade_amounts(
+        rpc_url=rpc_url,
+        quoter=quoter,
+        token0=token0,
+        token1=token1,
+        dec0=dec0,
+        dec1=dec1,
+        fee=fee,
+        t0_usd=t0_usd,
+        t1_usd=t1_usd,
+        total_usd=total_usd,
+        direction=direction,
+    )
+    if direction == "buy_token0":
+        exec_price = (amount_in / amount_out) if amount_out != 0 else Decimal("NaN")
+    else:
+        exec_price = (amount_out / amount_in) if amount_in != 0 else Decimal("NaN")
+    impact = _impact_pct(direction=direction, exec_price=exec_price, spot=spot_t1_per_t0)
+    return TradeResult(
+        total_usd=float(total_usd),
+        direction=direction,
+        input_amount=str(amount_in),
+        output_amount=str(amount_out),
+        exec_price_token1_per_token0=str(exec_price),
+        impact_pct=str(impact),
+    )
+
+
 def simulate_chunked_reverted(
     *,
     rpc_url: str,
@@ -144,15 +185,19 @@ def simulate_chunked_reverted(
     total_usd: Decimal,
     chunk_usd: Decimal,
     direction: str,
+    max_workers: int = 16,
 ) -> TradeResult:
     # "Best case" chunking: assume each chunk executes against the same spot state (i.e., price fully reverts between chunks).
+    # Every full chunk therefore gets the same quote: only the distinct sizes (full chunk + remainder) hit the RPC.
+    chunk_sizes: list[Decimal] = []
     remaining = total_usd
-    input_total = Decimal(0)
-    output_total = Decimal(0)
-
     while remaining > 0:
         cur_usd = chunk_usd if remaining >= chunk_usd else remaining
-        res = simulate_trade(
+        chunk_sizes.append(cur_usd)
+        remaining -= cur_usd
+
+    def run_chunk(cur_usd: Decimal) -> tuple[Decimal, Decimal]:
+        return quote_trade_amounts(
             rpc_url=rpc_url,
             quoter=quoter,
             token0=token0,
@@ -160,16 +205,23 @@ def simulate_chunked_reverted(
             dec0=dec0,
             dec1=dec1,
             fee=fee,
-            spot_t1_per_t0=spot_t1_per_t0,
             t0_usd=t0_usd,
             t1_usd=t1_usd,
             total_usd=cur_usd,
             direction=direction,
         )
 
-        input_total += Decimal(res.input_amount)
-        output_total += Decimal(res.output_amount)
-        remaining -= cur_usd
+    input_total = Decimal(0)
+    output_total = Decimal(0)
+    distinct_sizes = list(dict.fromkeys(chunk_sizes))
+    if distinct_sizes:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(distinct_sizes)))) as pool:
+            quotes = dict(zip(distinct_sizes, pool.map(run_chunk, distinct_sizes)))
+        # Sum chunk by chunk (rather than n * amount) so the 80-digit rounding matches a per-chunk simulation.
+        for cur_usd in chunk_sizes:
+            amount_in, amount_out = quotes[cur_usd]
+            input_total += amount_in
+            output_total += amount_out
 
     exec_price = (input_total / output_total) if direction == "buy_token0" else (output_total / input_total)
     impact = _impact_pct(direction=direction, exec_price=exec_price, spot=spot_t1_per_t0)
@@ -195,16 +247,16 @@ def main() -> int:
     parser.add_argument("--total-usd", type=float, required=True)
     parser.add_argument("--chunk-usd", type=float, default=1000.0)
     parser.add_argument("--direction", choices=["buy_token0", "sell_token0", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent RPC requests for chunk quotes.")
     parser.add_argument("--out", default=str(OUTPUTS_DIR / "chunked-trade-analysis.json"))
     args = parser.parse_args()
 
     rpc_url = args.rpc_url
     pool = args.pool
 
-    token0 = read_pool_token(rpc_url, pool, "token0()")
-    token1 = read_pool_token(rpc_url, pool, "token1()")
-    dec0 = read_erc20_decimals(rpc_url, token0)
-    dec1 = read_erc20_decimals(rpc_url, token1)
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        token0, token1 = ex.map(lambda sig: read_pool_token(rpc_url, pool, sig), ["token0()", "token1()"])
+        dec0, dec1 = ex.map(lambda token: read_erc20_decimals(rpc_url, token), [token0, token1])
 
     state = read_univ3_pool_state(rpc_url, pool)
     spot_t1_per_t0 = compute_spot_token1_per_token0(state)
@@ -260,6 +312,7 @@ def main() -> int:
             total_usd=total_usd,
             chunk_usd=chunk_usd,
             direction=direction,
+            max_workers=args.workers,
         )
 
         results["directions"][direction] = {
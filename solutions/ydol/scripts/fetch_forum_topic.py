@@ -1,17 +1,31 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
 from bs4 import BeautifulSoup
 
-from utils import DATA_DIR, discourse_topic_json_url, ensure_dir, write_json, write_text
+try:  # Optional: Lexbor-backed parser, much faster than BeautifulSoup + html.parser for plain-text extraction.
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+from utils import DATA_DIR, discourse_topic_json_url, ensure_dir, http_get_json, read_json, write_json, write_text
+
+
+def _html_text_nodes(html: str) -> str:
+    # Text nodes joined with newlines (same shape as BeautifulSoup's get_text("\n")).
+    if LexborHTMLParser is not None:
+        body = LexborHTMLParser(html or "").body
+        return body.text(separator="\n", strip=False) if body is not None else ""
+    return BeautifulSoup(html or "", "html.parser").get_text("\n", strip=False)
 
 
 def html_to_text(html: str) -> str:
-    soup = BeautifulSoup(html or "", "html.parser")
     # Discourse cooked HTML includes a lot of whitespace; preserve paragraphs with blank lines.
-    raw_lines = [ln.rstrip() for ln in soup.get_text("\n", strip=False).splitlines()]
+    raw_lines = [ln.rstrip() for ln in _html_text_nodes(html).splitlines()]
     out: list[str] = []
     blank = 0
     for ln in raw_lines:
@@ -25,6 +39,29 @@ def html_to_text(html: str) -> str:
     return "\n".join(out).strip() + "\n"
 
 
+# Discourse serves at most ~20 posts per topic/posts request.
+POSTS_PER_REQUEST = 20
+
+
+def fetch_missing_posts(json_url: str, topic_id: str, data: dict[str, Any], *, workers: int = 4) -> list[dict[str, Any]]:
+    # The topic JSON only inlines the first chunk of posts; the rest are listed by id in `post_stream.stream`.
+    post_stream = data.get("post_stream", {})
+    have = {p.get("id") for p in post_stream.get("posts", [])}
+    missing = [pid for pid in post_stream.get("stream", []) if pid not in have]
+    if not missing:
+        return []
+
+    posts_url = json_url.rsplit("/t/", 1)[0] + f"/t/{topic_id}/posts.json"
+    chunks = [missing[i : i + POSTS_PER_REQUEST] for i in range(0, len(missing), POSTS_PER_REQUEST)]
+
+    def fetch(chunk: list[int]) -> list[dict[str, Any]]:
+        res = http_get_json(posts_url, params=[("post_ids[]", pid) for pid in chunk])
+        return res.get("post_stream", {}).get("posts", [])
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+        return [post for posts in pool.map(fetch, chunks) for post in posts]
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Fetch a Discourse topic JSON and extract posts to markdown.")
     parser.add_argument(
@@ -42,16 +79,14 @@ def main() -> int:
     ensure_dir(out_json.parent)
 
     if out_json.exists() and not args.refresh:
-        data = out_json.read_text(encoding="utf-8")
-        import json
-
-        data = json.loads(data)
+        data = read_json(out_json)
     else:
-        import requests
+        data = http_get_json(json_url)
+        write_json(out_json, data)
 
-        resp = requests.get(json_url, timeout=30, headers={"User-Agent": "proposal-review/1.0"})
-        resp.raise_for_status()
-        data = resp.json()
+    extra_posts = fetch_missing_posts(json_url, topic_id, data)
+    if extra_posts:
+        data["post_stream"].setdefault("posts", []).extend(extra_posts)
         write_json(out_json, data)
 
     posts_dir = DATA_DIR / f"forum-posts-{topic_id}"
@@ -59,6 +94,7 @@ def main() -> int:
 
     index_lines = [f"# Forum snapshot: {data.get('title','(untitled)')}", "", f"Source: {args.topic_url}", ""]
     posts = data.get("post_stream", {}).get("posts", [])
+    files: list[tuple[Path, str]] = []
     for post in sorted(posts, key=lambda p: p.get("post_number", 0)):
         num = post.get("post_number")
         username = post.get("username", "unknown")
@@ -67,10 +103,12 @@ def main() -> int:
 
         body = html_to_text(cooked)
         md = f"# Post {num} — @{username}\n\nCreated: {created_at}\n\n{body}"
-        path = posts_dir / f"post-{num:02d}-{username}.md"
-        write_text(path, md)
+        files.append((posts_dir / f"post-{num:02d}-{username}.md", md))
         index_lines.append(f"- `post-{num:02d}-{username}.md`")
 
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda item: write_text(*item), files))
+
     write_text(posts_dir / "index.md", "\n".join(index_lines) + "\n")
     print(f"Wrote {len(posts)} posts to `{posts_dir}` and cached JSON to `{out_json}`.")
     return 0
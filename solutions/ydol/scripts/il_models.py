@@ -1,23 +1,25 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import math
 import statistics
 from dataclasses import asdict, dataclass
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from pathlib import Path
+from typing import Iterator
 
 from utils import OUTPUTS_DIR, coingecko_market_chart_daily, coingecko_simple_price, write_json
 
 
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_MS_PER_DAY = 86_400_000
+
+
 def to_date_map(series: list[list[float]]) -> dict[str, float]:
-    out: dict[str, float] = {}
-    for ts_ms, price in series:
-        d = datetime.utcfromtimestamp(ts_ms / 1000).date().isoformat()
-        out[d] = float(price)
-    return out
+    # UTC day via integer division of the ms timestamp (no datetime round-trip per sample).
+    fromordinal = date.fromordinal
+    return {fromordinal(_EPOCH_ORDINAL + int(ts_ms) // _MS_PER_DAY).isoformat(): float(price) for ts_ms, price in series}
 
 
 def il_50_50(relative_price_change: float) -> float:
@@ -26,14 +28,19 @@ def il_50_50(relative_price_change: float) -> float:
     return 2 * math.sqrt(r) / (1 + r) - 1
 
 
-def percentiles(values: list[float], ps: list[float]) -> dict[str, float]:
+def il_window_series(ratios: list[float], window: int) -> list[float]:
+    # il_50_50 for every `window`-day span, as one fused pass (same float ops per sample, no per-index lookups).
+    sqrt = math.sqrt
+    return [2 * sqrt(r) / (1 + r) - 1 for r in (end / start for start, end in zip(ratios, ratios[window:]))]
+
+
+def percentiles(values: list[float], ps: list[float], *, is_sorted: bool = False) -> dict[str, float]:
+    # Lower-index percentiles plus extremes. Pass is_sorted=True for an already ascending list to skip the copy + sort.
     if not values:
         return {}
-    s = sorted(values)
-    out: dict[str, float] = {}
-    for p in ps:
-        idx = int(p * (len(s) - 1))
-        out[f"p{int(p*100):02d}"] = s[idx]
+    s = values if is_sorted else sorted(values)
+    last = len(s) - 1
+    out: dict[str, float] = {f"p{int(p*100):02d}": s[int(p * last)] for p in ps}
     out["best"] = s[-1]
     out["worst"] = s[0]
     return out
@@ -53,6 +60,46 @@ def required_volume_per_day(*, capital_usd: float, il_abs: float, eff_fee: float
     return total_volume / window_days
 
 
+BREAKEVEN_FIELDS = [
+    "window_days",
+    "stat",
+    "il_pct",
+    "capital_usd",
+    "fee_tier",
+    "dao_fee_share",
+    "effective_fee",
+    "required_volume_per_day_usd",
+]
+
+
+def breakeven_rows(
+    window_summaries: list[WindowSummary], *, capital_usd: float, fee_tiers: list[float], dao_shares: list[float]
+) -> Iterator[tuple[str, ...]]:
+    # Breakeven table (BREAKEVEN_FIELDS order): required volume/day to offset IL using fee capture only.
+    capital = f"{capital_usd:.0f}"
+    for ws in window_summaries:
+        window = str(ws.window_days)
+        for stat_name, il in ws.il_stats.items():
+            il_abs = max(0.0, -il)
+            il_pct = f"{il*100:.4f}"
+            if il_abs == 0:
+                # Ratio ended where it started: nothing to offset, so every tier/share needs zero volume.
+                for tier in fee_tiers:
+                    for share in dao_shares:
+                        yield (window, stat_name, il_pct, capital, f"{tier:.6f}", f"{share:.3f}", f"{tier * share:.6f}", "0.00")
+                continue
+            for tier in fee_tiers:
+                for share in dao_shares:
+                    eff_fee = tier * share
+                    v = required_volume_per_day(
+                        capital_usd=capital_usd,
+                        il_abs=il_abs,
+                        eff_fee=eff_fee,
+                        window_days=ws.window_days,
+                    )
+                    yield (window, stat_name, il_pct, capital, f"{tier:.6f}", f"{share:.3f}", f"{eff_fee:.6f}", f"{v:.2f}")
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Impermanent-loss and breakeven volume models for LPT/ETH exposure.")
     parser.add_argument("--days", type=int, default=365, help="How many days of daily CoinGecko data to pull.")
@@ -74,58 +121,25 @@ def main() -> int:
     ratios = [lpt[d] / eth[d] for d in dates]
 
     # Annualized vol of the ratio (log returns)
-    log_rets = [math.log(ratios[i] / ratios[i - 1]) for i in range(1, len(ratios)) if ratios[i - 1] > 0 and ratios[i] > 0]
+    log_rets = [math.log(b / a) for a, b in zip(ratios, ratios[1:]) if a > 0 and b > 0]
     sigma_daily = statistics.pstdev(log_rets) if log_rets else 0.0
     sigma_annual = sigma_daily * math.sqrt(365)
 
     window_summaries: list[WindowSummary] = []
     for w in windows:
-        ils: list[float] = []
         if w >= len(ratios):
             continue
-        if w == len(ratios) - 1:
-            r = ratios[-1] / ratios[0]
-            ils = [il_50_50(r)]
-        else:
-            for i in range(0, len(ratios) - w):
-                r = ratios[i + w] / ratios[i]
-                ils.append(il_50_50(r))
+        ils = il_window_series(ratios, w)
+        ils.sort()
         window_summaries.append(
             WindowSummary(
                 window_days=w,
                 samples=len(ils),
-                il_stats=percentiles(ils, [0.1, 0.5, 0.9]),
+                il_stats=percentiles(ils, [0.1, 0.5, 0.9], is_sorted=True),
                 annualized_vol_ratio=sigma_annual if w == windows[0] else None,
             )
         )
 
-    # Build breakeven table: required volume/day to offset IL using fee capture only
-    breakeven_rows: list[dict[str, str]] = []
-    for ws in window_summaries:
-        for stat_name, il in ws.il_stats.items():
-            il_abs = max(0.0, -il)
-            for tier in fee_tiers:
-                for share in dao_shares:
-                    eff_fee = tier * share
-                    v = required_volume_per_day(
-                        capital_usd=args.capital_usd,
-                        il_abs=il_abs,
-                        eff_fee=eff_fee,
-                        window_days=ws.window_days,
-                    )
-                    breakeven_rows.append(
-                        {
-                            "window_days": str(ws.window_days),
-                            "stat": stat_name,
-                            "il_pct": f"{il*100:.4f}",
-                            "capital_usd": f"{args.capital_usd:.0f}",
-                            "fee_tier": f"{tier:.6f}",
-                            "dao_fee_share": f"{share:.3f}",
-                            "effective_fee": f"{eff_fee:.6f}",
-                            "required_volume_per_day_usd": f"{v:.2f}",
-                        }
-                    )
-
     out_json = Path(args.out_json)
     out_csv = Path(args.out_csv)
 
@@ -141,9 +155,14 @@ def main() -> int:
 
     out_csv.parent.mkdir(parents=True, exist_ok=True)
     with out_csv.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(breakeven_rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(breakeven_rows)
+        # Stat names and formatted numbers never need CSV quoting; CRLF matches csv.writer's default dialect.
+        f.write(",".join(BREAKEVEN_FIELDS) + "\r\n")
+        f.writelines(
+            ",".join(row) + "\r\n"
+            for row in breakeven_rows(
+                window_summaries, capital_usd=args.capital_usd, fee_tiers=fee_tiers, dao_shares=dao_shares
+            )
+        )
 
     # Also dump a quick “net PnL” scenario table at a few volumes for the 180d median vs worst.
     # This is intentionally simple and is meant to highlight asymmetry, not forecast returns.
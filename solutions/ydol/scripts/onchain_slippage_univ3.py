@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import argparse
-import csv
 from decimal import Decimal
 from pathlib import Path
 
@@ -10,10 +9,13 @@ from utils import (
     OUTPUTS_DIR,
     UniswapV3PoolState,
     abi_encode_address,
+    abi_encode_int,
     abi_encode_uint,
     coingecko_simple_price,
     decode_uint256,
     eth_call,
+    eth_call_batch,
+    eth_call_parallel,
     env,
     keccak_selector,
     read_univ3_pool_state,
@@ -27,25 +29,44 @@ DEFAULT_QUOTER = "0xb27308f9F90D607463bb33eA1BeBb41C27CE5AB6"  # Uniswap V3 Quot
 LPT = "0x289ba1701C2F088cf0faf8B3705246331cB8A839"
 WETH = "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"
 
+MAX_WORD_SCAN = 50  # bitmap words scanned per direction before giving up
 
-def quote_exact_input_single(*, rpc_url: str, quoter: str, token_in: str, token_out: str, fee: int, amount_in: int) -> int:
-    fn_sel = keccak_selector("quoteExactInputSingle(address,address,uint24,uint256,uint160)")
-    data = (
-        "0x"
-        + fn_sel
+QUOTE_EXACT_INPUT_SINGLE_SEL = "0x" + keccak_selector("quoteExactInputSingle(address,address,uint24,uint256,uint160)")
+TICK_BITMAP_SEL = "0x" + keccak_selector("tickBitmap(int16)")
+
+Q96 = Decimal(2**96)
+WEI_PER_TOKEN = Decimal(10**18)
+
+CSV_FIELDS = ["amount_usd", "buy_impact_pct", "sell_impact_pct", "buy_lpt_out", "sell_weth_out"]
+
+
+def quote_exact_input_single_data(*, token_in: str, token_out: str, fee: int, amount_in: int) -> str:
+    return (
+        QUOTE_EXACT_INPUT_SINGLE_SEL
         + abi_encode_address(token_in)
         + abi_encode_address(token_out)
         + abi_encode_uint(fee)
         + abi_encode_uint(amount_in)
         + abi_encode_uint(0)
     )
+
+
+def quote_exact_input_single(*, rpc_url: str, quoter: str, token_in: str, token_out: str, fee: int, amount_in: int) -> int:
+    data = quote_exact_input_single_data(token_in=token_in, token_out=token_out, fee=fee, amount_in=amount_in)
     res = eth_call(rpc_url, quoter, data)
     return decode_uint256(res)
 
 
+def fmt_wei(amount: int, decimals: int = 18) -> str:
+    # Exact fixed-point rendering of a non-negative raw token amount (same text as `f"{amount / 10**decimals:.{decimals}f}"`
+    # in Decimal, without the Decimal division and formatting).
+    whole, frac = divmod(amount, 10**decimals)
+    return f"{whole}.{frac:0{decimals}d}"
+
+
 def compute_spot_weth_per_lpt(state: UniswapV3PoolState) -> Decimal:
     # For Uni v3 pools: price = (sqrtPriceX96 / 2^96)^2 in terms of token1/token0 (raw units).
-    sqrt_price = Decimal(state.sqrt_price_x96) / Decimal(2**96)
+    sqrt_price = Decimal(state.sqrt_price_x96) / Q96
     return sqrt_price * sqrt_price
 
 
@@ -57,22 +78,37 @@ def lsb(value: int) -> int:
     return (value & -value).bit_length() - 1
 
 
-def nearest_initialized_ticks(*, rpc_url: str, pool: str, state: UniswapV3PoolState) -> tuple[int | None, int | None]:
+def next_initialized_bit(word_value: int, bit: int, *, lte: bool) -> int | None:
+    # Nearest set bit at or below `bit` (lte) or strictly above it, within one 256-bit bitmap word.
+    # Pure int ops: one mask/shift plus bit_length, no per-bit loop.
+    if lte:
+        masked = word_value & ((2 << bit) - 1)
+        return msb(masked) if masked else None
+    above = word_value >> (bit + 1)
+    return bit + 1 + lsb(above) if above else None
+
+
+def nearest_initialized_ticks(
+    *, rpc_url: str, pool: str, state: UniswapV3PoolState, prefetch: bool = True
+) -> tuple[int | None, int | None]:
     # Mirrors UniswapV3 TickBitmap.nextInitializedTickWithinOneWord logic, with a small word scan.
     tick = state.tick
     spacing = state.tick_spacing
 
     compressed = tick // spacing  # Python floors for negative ticks, matching desired behavior.
-    tick_bitmap_sel = "0x" + keccak_selector("tickBitmap(int16)")
 
     cache: dict[int, int] = {}
+    if prefetch:
+        # Every word either scan direction can touch, in JSON-RPC batches instead of a round-trip per word.
+        home = compressed >> 8
+        positions = [p for p in range(home - MAX_WORD_SCAN + 1, home + MAX_WORD_SCAN) if -(2**15) <= p < 2**15]
+        words = eth_call_batch(rpc_url, [(pool, TICK_BITMAP_SEL + abi_encode_int(p)) for p in positions])
+        cache.update(zip(positions, (int(w, 16) for w in words)))
 
     def get_word(word_pos: int) -> int:
         if word_pos in cache:
             return cache[word_pos]
-        from utils import abi_encode_int
-
-        data = tick_bitmap_sel + abi_encode_int(word_pos)
+        data = TICK_BITMAP_SEL + abi_encode_int(word_pos)
         res = eth_call(rpc_url, pool, data)
         val = int(res, 16)
         cache[word_pos] = val
@@ -81,22 +117,14 @@ def nearest_initialized_ticks(*, rpc_url: str, pool: str, state: UniswapV3PoolSt
     def next_initialized(comp: int, *, lte: bool) -> int | None:
         word = comp >> 8
         bit = comp % 256
-        for _ in range(50):
-            w = get_word(word)
+        for _ in range(MAX_WORD_SCAN):
+            b = next_initialized_bit(get_word(word), bit, lte=lte)
+            if b is not None:
+                return (word << 8) + b
             if lte:
-                mask = (1 << (bit + 1)) - 1
-                masked = w & mask
-                if masked:
-                    b = msb(masked)
-                    return (word << 8) + b
                 word -= 1
                 bit = 255
             else:
-                mask = ~((1 << (bit + 1)) - 1) & ((1 << 256) - 1)
-                masked = w & mask
-                if masked:
-                    b = lsb(masked)
-                    return (word << 8) + b
                 word += 1
                 bit = -1
         return None
@@ -109,29 +137,30 @@ def nearest_initialized_ticks(*, rpc_url: str, pool: str, state: UniswapV3PoolSt
 def amount_to_next_tick_boundary(
     *,
     state: UniswapV3PoolState,
-    spot_sqrt_price: Decimal,
+    spot_sqrt_price: float,
     lower_tick: int | None,
     upper_tick: int | None,
-) -> tuple[Decimal | None, Decimal | None]:
+) -> tuple[float | None, float | None]:
     # Approximate “how much token in” to push the price to the nearest initialized tick boundary,
     # within the current liquidity range, ignoring cross-range liquidity changes.
-    L = Decimal(state.liquidity)
-    fee_frac = Decimal(state.fee) / Decimal(1_000_000)
+    # Display-only estimate, so plain floats: relative error ~1e-16 is far below what gets printed.
+    L = float(state.liquidity)
+    fee_keep = 1 - state.fee / 1_000_000
 
-    amount0_in: Decimal | None = None
-    amount1_in: Decimal | None = None
+    amount0_in: float | None = None
+    amount1_in: float | None = None
 
     if lower_tick is not None:
-        sqrt_lower = sqrt_price_from_tick(lower_tick)
+        sqrt_lower = float(sqrt_price_from_tick(lower_tick))
         if spot_sqrt_price > sqrt_lower:
             amount0 = L * (spot_sqrt_price - sqrt_lower) / (spot_sqrt_price * sqrt_lower)
-            amount0_in = amount0 / (Decimal(1) - fee_frac)
+            amount0_in = amount0 / fee_keep
 
     if upper_tick is not None:
-        sqrt_upper = sqrt_price_from_tick(upper_tick)
+        sqrt_upper = float(sqrt_price_from_tick(upper_tick))
         if sqrt_upper > spot_sqrt_price:
             amount1 = L * (sqrt_upper - spot_sqrt_price)
-            amount1_in = amount1 / (Decimal(1) - fee_frac)
+            amount1_in = amount1 / fee_keep
 
     return amount0_in, amount1_in
 
@@ -144,6 +173,12 @@ def main() -> int:
     parser.add_argument("--amounts-usd", default="1000,5000,10000,25000,50000")
     parser.add_argument("--out", default=str(OUTPUTS_DIR / "onchain-slippage.csv"))
     parser.add_argument("--include-tick-depth", action="store_true", help="Also estimate token amounts needed to hit the nearest initialized tick boundaries.")
+    parser.add_argument(
+        "--no-rpc-batch",
+        action="store_true",
+        help="Send quotes over a thread pool and read tick bitmap words one at a time (for RPC nodes that reject JSON-RPC batches).",
+    )
+    parser.add_argument("--workers", type=int, default=16, help="Thread pool size for quotes with --no-rpc-batch.")
     args = parser.parse_args()
 
     amounts = [int(x.strip()) for x in args.amounts_usd.split(",") if x.strip()]
@@ -155,69 +190,70 @@ def main() -> int:
 
     state = read_univ3_pool_state(args.rpc_url, args.pool)
     spot_weth_per_lpt = compute_spot_weth_per_lpt(state)
-    spot_sqrt_price = Decimal(state.sqrt_price_x96) / Decimal(2**96)
 
     print(f"Pool: {args.pool} | fee={state.fee} | tick={state.tick}")
     print(f"Spot: {spot_weth_per_lpt:.10f} WETH/LPT | CoinGecko: LPT=${lpt_usd} ETH=${eth_usd}")
     print()
 
-    rows: list[dict[str, str]] = []
-    print("AmountUSD\tBuy impact\tSell impact\tBuy LPT out\tSell WETH out")
+    # Every buy/sell quote is independent: size them all first, then fetch them in one round-trip.
+    # Wei amounts as exact integer floor division: floor(usd * 1e18 / price), price = num / den.
+    eth_num, eth_den = eth_usd.as_integer_ratio()
+    lpt_num, lpt_den = lpt_usd.as_integer_ratio()
+    sized: list[tuple[int, Decimal, Decimal]] = []
+    quote_calls: list[tuple[str, str]] = []
     for usd in amounts:
         usd_dec = Decimal(usd)
-
         weth_in = usd_dec / eth_usd
-        amount_in_weth = int((weth_in * Decimal(10**18)).to_integral_value(rounding="ROUND_FLOOR"))
-        lpt_out = quote_exact_input_single(
-            rpc_url=args.rpc_url,
-            quoter=args.quoter,
-            token_in=WETH,
-            token_out=LPT,
-            fee=state.fee,
-            amount_in=amount_in_weth,
+        amount_in_weth = usd * 10**18 * eth_den // eth_num
+        lpt_in = usd_dec / lpt_usd
+        amount_in_lpt = usd * 10**18 * lpt_den // lpt_num
+        sized.append((usd, weth_in, lpt_in))
+        quote_calls.append(
+            (args.quoter, quote_exact_input_single_data(token_in=WETH, token_out=LPT, fee=state.fee, amount_in=amount_in_weth))
+        )
+        quote_calls.append(
+            (args.quoter, quote_exact_input_single_data(token_in=LPT, token_out=WETH, fee=state.fee, amount_in=amount_in_lpt))
         )
-        lpt_out_dec = Decimal(lpt_out) / Decimal(10**18)
+    if args.no_rpc_batch:
+        quotes = eth_call_parallel(args.rpc_url, quote_calls, max_workers=args.workers)
+    else:
+        quotes = eth_call_batch(args.rpc_url, quote_calls)
+
+    # Compute every amount first, then render the console table and the CSV rows in one pass.
+    results: list[tuple[int, Decimal, Decimal, int, Decimal, int, Decimal]] = []
+    for i, (usd, weth_in, lpt_in) in enumerate(sized):
+        lpt_out = decode_uint256(quotes[2 * i])
+        lpt_out_dec = Decimal(lpt_out) / WEI_PER_TOKEN
         exec_buy = (weth_in / lpt_out_dec) if lpt_out_dec != 0 else Decimal("NaN")
         buy_impact = (exec_buy / spot_weth_per_lpt - 1) * 100
 
-        lpt_in = usd_dec / lpt_usd
-        amount_in_lpt = int((lpt_in * Decimal(10**18)).to_integral_value(rounding="ROUND_FLOOR"))
-        weth_out = quote_exact_input_single(
-            rpc_url=args.rpc_url,
-            quoter=args.quoter,
-            token_in=LPT,
-            token_out=WETH,
-            fee=state.fee,
-            amount_in=amount_in_lpt,
-        )
-        weth_out_dec = Decimal(weth_out) / Decimal(10**18)
+        weth_out = decode_uint256(quotes[2 * i + 1])
+        weth_out_dec = Decimal(weth_out) / WEI_PER_TOKEN
         exec_sell = (weth_out_dec / lpt_in) if lpt_in != 0 else Decimal("NaN")
         sell_impact = (1 - exec_sell / spot_weth_per_lpt) * 100
 
-        print(f"{usd:>8,}\t{buy_impact:>8.2f}%\t{sell_impact:>9.2f}%\t{lpt_out_dec:>10.4f}\t{weth_out_dec:>11.6f}")
+        results.append((usd, buy_impact, sell_impact, lpt_out, lpt_out_dec, weth_out, weth_out_dec))
 
-        rows.append(
-            {
-                "amount_usd": str(usd),
-                "buy_impact_pct": f"{buy_impact:.6f}",
-                "sell_impact_pct": f"{sell_impact:.6f}",
-                "buy_lpt_out": f"{lpt_out_dec:.18f}",
-                "sell_weth_out": f"{weth_out_dec:.18f}",
-            }
-        )
+    rows: list[tuple[str, ...]] = []
+    print("AmountUSD\tBuy impact\tSell impact\tBuy LPT out\tSell WETH out")
+    for usd, buy_impact, sell_impact, lpt_out, lpt_out_dec, weth_out, weth_out_dec in results:
+        print(f"{usd:>8,}\t{buy_impact:>8.2f}%\t{sell_impact:>9.2f}%\t{lpt_out_dec:>10.4f}\t{weth_out_dec:>11.6f}")
+        rows.append((str(usd), f"{buy_impact:.6f}", f"{sell_impact:.6f}", fmt_wei(lpt_out), fmt_wei(weth_out)))
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with out_path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
+        # Every field is a formatted number (never needs CSV quoting); CRLF matches csv.writer's default dialect.
+        f.write(",".join(CSV_FIELDS) + "\r\n")
+        f.writelines(",".join(row) + "\r\n" for row in rows)
     print(f"\nWrote `{out_path}`.")
 
     if args.include_tick_depth:
-        lower_tick, upper_tick = nearest_initialized_ticks(rpc_url=args.rpc_url, pool=args.pool, state=state)
+        lower_tick, upper_tick = nearest_initialized_ticks(
+            rpc_url=args.rpc_url, pool=args.pool, state=state, prefetch=not args.no_rpc_batch
+        )
         amt0_in, amt1_in = amount_to_next_tick_boundary(
             state=state,
-            spot_sqrt_price=spot_sqrt_price,
+            spot_sqrt_price=state.sqrt_price_x96 / 2**96,
             lower_tick=lower_tick,
             upper_tick=upper_tick,
         )
@@ -226,11 +262,11 @@ def main() -> int:
         print(f"- upper:       {upper_tick}")
         print("\nApprox token-in to reach boundary (within current liquidity range):")
         if amt0_in is not None:
-            print(f"- sell LPT in:  {amt0_in / Decimal(10**18):,.4f} LPT")
+            print(f"- sell LPT in:  {amt0_in / 1e18:,.4f} LPT")
         else:
             print("- sell LPT in:  n/a")
         if amt1_in is not None:
-            print(f"- buy  LPT with {amt1_in / Decimal(10**18):,.6f} WETH")
+            print(f"- buy  LPT with {amt1_in / 1e18:,.6f} WETH")
         else:
             print("- buy  LPT with n/a")
 
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import argparse
-import json
+import importlib
 import subprocess
+import sys
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 
+from utils import coingecko_simple_price, read_json
+
 
 ROOT = Path(__file__).resolve().parents[1]
 SCRIPTS = ROOT / "scripts"
@@ -17,8 +21,44 @@ def run(cmd: list[str]) -> None:
     subprocess.run(cmd, check=True)
 
 
-def read_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+def run_captured(cmd: list[str]) -> None:
+    # Buffer a child's output and replay it whole, so concurrent children don't interleave lines.
+    try:
+        proc = subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        sys.stdout.write(e.stdout or "")
+        sys.stderr.write(e.stderr or "")
+        raise
+    sys.stdout.write(proc.stdout)
+    sys.stderr.write(proc.stderr)
+    sys.stdout.flush()
+
+
+def run_in_process(cmd: list[str]) -> None:
+    # `python3 scripts/<name>.py args...` as `<name>.main(args)`: no interpreter start-up per job, and the jobs share
+    # imported modules, in-process caches and the pooled HTTP session.
+    module = importlib.import_module(Path(cmd[1]).stem)
+    status = module.main(cmd[2:])
+    if status:
+        raise RuntimeError(f"{' '.join(cmd[1:])} exited with status {status}")
+
+
+def run_all(cmds: list[list[str]], *, max_workers: int, in_process: bool = False) -> None:
+    # Jobs are independent and mostly wait on network I/O, so run them side by side.
+    # The first failure cancels anything not yet started and is re-raised (same as `check=True` serially).
+    if max_workers <= 1 or len(cmds) <= 1:
+        serial_runner = run_in_process if in_process else run
+        for cmd in cmds:
+            serial_runner(cmd)
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(cmds))) as pool:
+        futures = [pool.submit(run_in_process if in_process else run_captured, cmd) for cmd in cmds]
+        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+        for fut in futures:
+            fut.cancel()
+        for fut in futures:
+            if fut in done and fut.exception() is not None:
+                raise fut.exception()
 
 
 @dataclass(frozen=True)
@@ -38,6 +78,8 @@ def main() -> int:
     parser.add_argument("--swap-windows-days", default="1,30")
     parser.add_argument("--dao-fee-splits", default="0.5,0.8", help="DAO share of trading fees, for illustrative net-fee calculations.")
     parser.add_argument("--refresh", action="store_true", help="Re-run even if outputs already exist.")
+    parser.add_argument("--workers", type=int, default=8, help="Per-pool scripts to run concurrently (1 = one at a time).")
+    parser.add_argument("--subprocess", action="store_true", help="Run each per-pool script in its own Python process (isolation over speed).")
     args = parser.parse_args()
 
     cases_data = read_json(Path(args.cases))
@@ -58,12 +100,13 @@ def main() -> int:
 
     windows = [float(x.strip()) for x in args.swap_windows_days.split(",") if x.strip()]
 
+    jobs: list[list[str]] = []
     for case in cases:
         slug = case.id
         slippage_csv = OUTPUTS / "cases" / f"{slug}-slippage.csv"
         slippage_json = OUTPUTS / "cases" / f"{slug}-slippage.json"
         if args.refresh or not slippage_json.exists():
-            run(
+            jobs.append(
                 [
                     "python3",
                     str(SCRIPTS / "univ3_slippage_table.py"),
@@ -88,7 +131,7 @@ def main() -> int:
             suffix = f"{d:g}d".replace(".", "p")
             swap_json = OUTPUTS / "cases" / f"{slug}-swap-analytics-{suffix}.json"
             if args.refresh or not swap_json.exists():
-                run(
+                jobs.append(
                     [
                         "python3",
                         str(SCRIPTS / "univ3_swap_analytics.py"),
@@ -107,6 +150,12 @@ def main() -> int:
                     ]
                 )
 
+    if jobs:
+        # One CoinGecko request for every token up front; the children then all hit the shared price cache.
+        coingecko_ids = {cid for case in cases for cid in (case.token0_coingecko_id, case.token1_coingecko_id)}
+        coingecko_simple_price(sorted(coingecko_ids), "usd", refresh=args.refresh)
+    run_all(jobs, max_workers=args.workers, in_process=not args.subprocess)
+
     # Generate markdown summary
     fee_splits = [float(x.strip()) for x in args.dao_fee_splits.split(",") if x.strip()]
     report_lines = ["# Arrakis case studies (pool-level)", ""]
@@ -121,10 +170,17 @@ def main() -> int:
     report_lines.append("| Case | Pool | Fee tier | 24h volume (USD) | 24h fees (USD) | $25k buy impact | $25k sell impact |")
     report_lines.append("|---|---|---:|---:|---:|---:|---:|")
 
+    # Each case's outputs are parsed once and shared by both tables.
+    case_outputs = {
+        case.id: (
+            read_json(OUTPUTS / "cases" / f"{case.id}-slippage.json"),
+            read_json(OUTPUTS / "cases" / f"{case.id}-swap-analytics-1d.json"),
+        )
+        for case in cases
+    }
+
     for case in cases:
-        slug = case.id
-        slippage = read_json(OUTPUTS / "cases" / f"{slug}-slippage.json")
-        swap_1d = read_json(OUTPUTS / "cases" / f"{slug}-swap-analytics-1d.json")
+        slippage, swap_1d = case_outputs[case.id]
 
         fee = float(slippage["fee"]) / 1_000_000
         vol = float(swap_1d["aggregate"]["volume_usd"])
@@ -150,8 +206,7 @@ def main() -> int:
     report_lines.append("| Case | 24h pool fees (USD) | " + " | ".join([f"DAO {int(s*100)}%" for s in fee_splits]) + " |")
     report_lines.append("|---|---:|" + "|".join(["---:"] * len(fee_splits)) + "|")
     for case in cases:
-        slug = case.id
-        swap_1d = read_json(OUTPUTS / "cases" / f"{slug}-swap-analytics-1d.json")
+        _, swap_1d = case_outputs[case.id]
         fees = float(swap_1d["aggregate"]["fees_usd"])
         splits = " | ".join([f"${fees*s:,.0f}" for s in fee_splits])
         report_lines.append(f"| {case.name} | ${fees:,.0f} | {splits} |")
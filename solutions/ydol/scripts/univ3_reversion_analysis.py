@@ -2,26 +2,25 @@ from __future__ import annotations
 
 import argparse
 import time
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Iterable
 
 from Crypto.Hash import keccak
 
 from utils import (
     OUTPUTS_DIR,
-    coingecko_simple_price,
-    decode_address_word,
-    decode_int256,
-    decode_uint256,
-    eth_block_number,
-    eth_get_block_timestamp,
-    eth_call,
+    BlockTimestampStore,
+    add_univ3_log_scan_args,
+    cached_block_timestamps,
     env,
-    find_block_by_timestamp,
-    keccak_selector,
-    rpc_call,
+    eth_chain_id,
+    eth_get_block_timestamps,
+    fetch_logs_chunked,
+    log_row,
+    univ3_scan_start,
     write_json,
 )
 
@@ -35,75 +34,19 @@ def keccak_topic(signature: str) -> str:
 SWAP_TOPIC0 = keccak_topic("Swap(address,address,int256,int256,uint160,uint128,int24)")
 
 
-def eth_get_logs(rpc_url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
-    return rpc_call(rpc_url, "eth_getLogs", [params])
-
-
-def read_pool_token(rpc_url: str, pool: str, fn_sig: str) -> str:
-    sel = "0x" + keccak_selector(fn_sig)
-    res = eth_call(rpc_url, pool, sel)
-    word = res[2:].rjust(64, "0")
-    return decode_address_word(word)
-
-
-def read_pool_fee(rpc_url: str, pool: str) -> int:
-    sel = "0x" + keccak_selector("fee()")
-    res = eth_call(rpc_url, pool, sel)
-    return decode_uint256(res)
-
-
-def read_erc20_decimals(rpc_url: str, token: str) -> int:
-    sel = "0x" + keccak_selector("decimals()")
-    res = eth_call(rpc_url, token, sel)
-    return decode_uint256(res)
-
-
-def fetch_logs_chunked(
-    *,
-    rpc_url: str,
-    address: str,
-    topic0: str,
-    from_block: int,
-    to_block: int,
-    initial_step: int,
-    max_step: int,
-    max_logs: int | None,
-) -> list[dict[str, Any]]:
-    logs: list[dict[str, Any]] = []
-    step = initial_step
-    cur = from_block
-
-    while cur <= to_block:
-        end = min(cur + step - 1, to_block)
-        params = {"fromBlock": hex(cur), "toBlock": hex(end), "address": address, "topics": [topic0]}
-        try:
-            chunk = eth_get_logs(rpc_url, params)
-        except RuntimeError as e:
-            msg = str(e).lower()
-            if any(k in msg for k in ["too many", "response size", "limit", "timeout", "more than", "range"]):
-                step = max(100, step // 2)
-                continue
-            raise
-
-        logs.extend(chunk)
-        if max_logs is not None and len(logs) >= max_logs:
-            return logs[:max_logs]
-
-        if len(chunk) < 1000 and step < max_step:
-            step = min(max_step, step * 2)
-
-        cur = end + 1
-
-    return logs
-
-
-@dataclass(frozen=True)
-class SwapPoint:
-    ts: int
-    block_number: int
-    tick: int
-    notional_usd: float
-    direction: str  # "buy" or "sell" relative to token0 (token0 in => sell token0)
+def upper_median(values: list[int]) -> int | None:
+    # sorted(values)[len(values) // 2] in O(N + K log K) for K distinct values; revert latencies (swap counts, block-time
+    # gaps) repeat heavily, so K is small.
+    if not values:
+        return None
+    counts = Counter(values)
+    target = len(values) // 2
+    seen = 0
+    for value in sorted(counts):
+        seen += counts[value]
+        if seen > target:
+            return value
+    raise AssertionError("unreachable")
 
 
 def main() -> int:
@@ -140,30 +83,31 @@ def main() -> int:
         action="store_true",
         help="Also compute reversion latency in seconds (adds block timestamp lookups; modestly slower).",
     )
+    parser.add_argument(
+        "--no-block-ts-cache",
+        action="store_true",
+        help="Fetch block timestamps from the RPC without reading/writing the on-disk timestamp cache.",
+    )
     parser.add_argument("--max-logs", type=int, default=None)
+    add_univ3_log_scan_args(parser)
     parser.add_argument("--out", default=str(OUTPUTS_DIR / "univ3-reversion.json"))
     args = parser.parse_args()
 
     rpc_url = args.rpc_url
     pool = args.pool
 
-    token0 = read_pool_token(rpc_url, pool, "token0()")
-    token1 = read_pool_token(rpc_url, pool, "token1()")
-    fee = read_pool_fee(rpc_url, pool)
+    now_ts = int(time.time())
+    start_ts = int(now_ts - args.days * 86400)
 
-    dec0 = read_erc20_decimals(rpc_url, token0)
-    dec1 = read_erc20_decimals(rpc_url, token1)
+    pool_tokens, prices, latest, start_block = univ3_scan_start(
+        rpc_url, pool, [args.token0_coingecko_id, args.token1_coingecko_id], start_ts, batch=not args.no_rpc_batch
+    )
 
-    prices = coingecko_simple_price([args.token0_coingecko_id, args.token1_coingecko_id], "usd")
+    token0, token1, fee = pool_tokens.token0, pool_tokens.token1, pool_tokens.fee
+    dec0, dec1 = pool_tokens.decimals0, pool_tokens.decimals1
     p0 = float(prices[args.token0_coingecko_id]["usd"])
     p1 = float(prices[args.token1_coingecko_id]["usd"])
 
-    now_ts = int(time.time())
-    start_ts = int(now_ts - args.days * 86400)
-
-    latest = eth_block_number(rpc_url)
-    start_block = find_block_by_timestamp(rpc_url, start_ts, high_block=latest)
-
     initial_step = 50_000 if "arb" in rpc_url else 10_000
     max_step = 200_000 if "arb" in rpc_url else 30_000
 
@@ -176,88 +120,93 @@ def main() -> int:
         initial_step=initial_step,
         max_step=max_step,
         max_logs=args.max_logs,
+        max_workers=args.workers,
+        reset_ceiling=args.reset_getlogs_ceiling,
+        row=log_row,
     )
 
-    points: list[SwapPoint] = []
+    # Decoded swaps as parallel columns (index i is the i-th swap, in log order).
+    block_numbers: list[int] = []
+    ticks: list[int] = []
+    notional_usd: list[float] = []
+    # Raw-unit scales, hoisted out of the per-log loop. Kept as ints: int / int is correctly rounded, whereas
+    # dividing by a float scale would first round amounts above 2**53.
+    scale0 = 10**dec0
+    scale1 = 10**dec1
     for log in logs:
-        data = log["data"][2:]
-        if len(data) < 64 * 5:
+        raw = log.data
+        if len(raw) < 32 * 5:
             continue
-        words = [data[i : i + 64] for i in range(0, 64 * 5, 64)]
-        amount0 = decode_int256(words[0])
-        amount1 = decode_int256(words[1])
-        tick = decode_int256(words[4])
-        # Timestamp is optional; avoid expensive block lookups unless requested.
-        ts = 0
-        bn = int(log["blockNumber"], 16)
+        # Signed int256 words 0, 1 and 4: amount0, amount1, tick.
+        amount0 = int.from_bytes(raw[:32], "big", signed=True)
+        amount1 = int.from_bytes(raw[32:64], "big", signed=True)
+        tick = int.from_bytes(raw[128:160], "big", signed=True)
 
+        # USD notional of the token-in side (amount0 > 0: token0 sold into the pool; amount1 > 0: token0 bought).
         if amount0 > 0:
-            amt0 = amount0 / (10**dec0)
-            usd = amt0 * p0
-            direction = "sell_token0"
+            usd = amount0 / scale0 * p0
         elif amount1 > 0:
-            amt1 = amount1 / (10**dec1)
-            usd = amt1 * p1
-            direction = "buy_token0"
+            usd = amount1 / scale1 * p1
         else:
             continue
 
-        points.append(SwapPoint(ts=ts, block_number=bn, tick=tick, notional_usd=usd, direction=direction))
+        block_numbers.append(log.block_number)
+        ticks.append(tick)
+        notional_usd.append(usd)
 
     need_block_ts = args.window_seconds is not None or args.include_time
-    block_ts_cache: dict[int, int] = {}
+    block_ts_store = BlockTimestampStore() if need_block_ts and not args.no_block_ts_cache else None
+    chain_id = eth_chain_id(rpc_url) if block_ts_store is not None else 0
 
-    def get_ts(block_number: int) -> int:
-        if block_number in block_ts_cache:
-            return block_ts_cache[block_number]
-        ts2 = eth_get_block_timestamp(rpc_url, block_number)
-        block_ts_cache[block_number] = ts2
-        return ts2
+    def get_block_ts(block_numbers: Iterable[int]) -> dict[int, int]:
+        if block_ts_store is None:
+            return eth_get_block_timestamps(rpc_url, block_numbers)
+        return cached_block_timestamps(rpc_url, block_numbers, chain_id=chain_id, store=block_ts_store)
 
+    # Swap timestamps are only needed for the time-window scan (one batched lookup per distinct block); swaps are in
+    # log order, so `point_ts` is non-decreasing.
+    point_ts: list[int] = []
     if args.window_seconds is not None:
-        # Fill timestamps for points (needed for time-window scan).
-        for idx, pt in enumerate(points):
-            points[idx] = SwapPoint(
-                ts=get_ts(pt.block_number),
-                block_number=pt.block_number,
-                tick=pt.tick,
-                notional_usd=pt.notional_usd,
-                direction=pt.direction,
-            )
+        block_ts = get_block_ts(block_numbers)
+        point_ts = [block_ts[bn] for bn in block_numbers]
 
-    candidates: list[int] = []
-    for i in range(1, len(points)):
-        usd = points[i].notional_usd
-        if args.min_usd <= usd <= args.max_usd:
-            candidates.append(i)
+    min_usd, max_usd = args.min_usd, args.max_usd
+    candidates = [i for i in range(1, len(notional_usd)) if min_usd <= notional_usd[i] <= max_usd]
 
     reverted = 0
     times_to_revert: list[int] = []
     times_to_revert_seconds: list[int] = []
+    revert_pairs: list[tuple[int, int]] = []  # (candidate, reverting swap) indices, for the optional latency lookup
     for idx in candidates:
-        pre_tick = points[idx - 1].tick
+        pre_tick = ticks[idx - 1]
         if args.window_seconds is not None:
-            t0 = points[idx].ts
-            j = idx + 1
-            while j < len(points) and points[j].ts - t0 <= args.window_seconds:
-                if abs(points[j].tick - pre_tick) <= args.revert_ticks:
+            t0 = point_ts[idx]
+            # Swaps within the window are [idx + 1, end); bisect finds the end instead of testing ts per swap.
+            end = bisect_right(point_ts, t0 + args.window_seconds, idx + 1)
+            for j in range(idx + 1, end):
+                if abs(ticks[j] - pre_tick) <= args.revert_ticks:
                     reverted += 1
-                    times_to_revert.append(points[j].ts - t0)
+                    times_to_revert.append(point_ts[j] - t0)
                     break
-                j += 1
         else:
             # Fast path: check next N swaps.
-            end = min(len(points) - 1, idx + args.window_swaps)
+            end = min(len(ticks) - 1, idx + args.window_swaps)
             for j in range(idx + 1, end + 1):
-                if abs(points[j].tick - pre_tick) <= args.revert_ticks:
+                if abs(ticks[j] - pre_tick) <= args.revert_ticks:
                     reverted += 1
                     times_to_revert.append(j - idx)  # swaps-to-revert
                     if need_block_ts:
-                        t0 = get_ts(points[idx].block_number)
-                        t1 = get_ts(points[j].block_number)
-                        times_to_revert_seconds.append(t1 - t0)
+                        revert_pairs.append((idx, j))
                     break
 
+    if revert_pairs:
+        block_ts = get_block_ts(block_numbers[k] for pair in revert_pairs for k in pair)
+        times_to_revert_seconds = [
+            block_ts[block_numbers[j]] - block_ts[block_numbers[idx]] for idx, j in revert_pairs
+        ]
+    if block_ts_store is not None:
+        block_ts_store.close()
+
     out = {
         "as_of": datetime.now(timezone.utc).isoformat(),
         "rpc_url": rpc_url,
@@ -276,15 +225,13 @@ def main() -> int:
         },
         "counts": {
             "swap_logs": len(logs),
-            "decoded_swaps": len(points),
+            "decoded_swaps": len(notional_usd),
             "candidates": len(candidates),
             "reverted": reverted,
             "revert_rate": (reverted / len(candidates)) if candidates else 0.0,
-            "median_revert_value": (sorted(times_to_revert)[len(times_to_revert) // 2] if times_to_revert else None),
+            "median_revert_value": upper_median(times_to_revert),
             "median_revert_unit": ("seconds" if args.window_seconds is not None else "swaps"),
-            "median_revert_seconds": (
-                sorted(times_to_revert_seconds)[len(times_to_revert_seconds) // 2] if times_to_revert_seconds else None
-            ),
+            "median_revert_seconds": upper_median(times_to_revert_seconds),
         },
         "revert_times": times_to_revert[:5000],  # cap to keep JSON sane
         "revert_times_seconds": times_to_revert_seconds[:5000],
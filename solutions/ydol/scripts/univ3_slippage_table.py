@@ -11,12 +11,12 @@ from utils import (
     abi_encode_address,
     abi_encode_uint,
     coingecko_simple_price,
-    decode_address_word,
     decode_uint256,
     eth_call,
     env,
     keccak_selector,
     read_univ3_pool_state,
+    read_univ3_pool_tokens,
     write_json,
 )
 
@@ -39,25 +39,12 @@ def quote_exact_input_single(*, rpc_url: str, quoter: str, token_in: str, token_
     return decode_uint256(res)
 
 
-def read_pool_token(rpc_url: str, pool: str, fn_sig: str) -> str:
-    sel = "0x" + keccak_selector(fn_sig)
-    res = eth_call(rpc_url, pool, sel)
-    word = res[2:].rjust(64, "0")
-    return decode_address_word(word)
-
-
-def read_erc20_decimals(rpc_url: str, token: str) -> int:
-    sel = "0x" + keccak_selector("decimals()")
-    res = eth_call(rpc_url, token, sel)
-    return decode_uint256(res)
-
-
 def compute_spot_token1_per_token0(state: UniswapV3PoolState) -> Decimal:
     sqrt_price = Decimal(state.sqrt_price_x96) / Decimal(2**96)
     return sqrt_price * sqrt_price
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Compute onchain price impact table for a Uniswap v3 pool.")
     parser.add_argument("--rpc-url", default=env("RPC_URL", "https://arb1.arbitrum.io/rpc"))
     parser.add_argument("--pool", required=True, help="Uniswap v3 pool address.")
@@ -65,17 +52,21 @@ def main() -> int:
     parser.add_argument("--token0-coingecko-id", required=True)
     parser.add_argument("--token1-coingecko-id", required=True)
     parser.add_argument("--amounts-usd", default="1000,5000,10000,25000,50000")
+    parser.add_argument(
+        "--no-rpc-batch",
+        action="store_true",
+        help="Read pool/token metadata with single eth_calls (for RPC nodes that reject JSON-RPC batches).",
+    )
     parser.add_argument("--out-csv", default=str(OUTPUTS_DIR / "univ3-slippage.csv"))
     parser.add_argument("--out-json", default=str(OUTPUTS_DIR / "univ3-slippage.json"))
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     rpc_url = args.rpc_url
     pool = args.pool
 
-    token0 = read_pool_token(rpc_url, pool, "token0()")
-    token1 = read_pool_token(rpc_url, pool, "token1()")
-    dec0 = read_erc20_decimals(rpc_url, token0)
-    dec1 = read_erc20_decimals(rpc_url, token1)
+    pool_tokens = read_univ3_pool_tokens(rpc_url, pool, batch=not args.no_rpc_batch)
+    token0, token1 = pool_tokens.token0, pool_tokens.token1
+    dec0, dec1 = pool_tokens.decimals0, pool_tokens.decimals1
 
     state = read_univ3_pool_state(rpc_url, pool)
     spot_t1_per_t0 = compute_spot_token1_per_token0(state)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -11,14 +13,10 @@ from Crypto.Hash import keccak
 
 from utils import (
     OUTPUTS_DIR,
-    coingecko_simple_price,
-    decode_address_word,
-    decode_uint256,
-    eth_block_number,
-    eth_call,
-    find_block_by_timestamp,
-    keccak_selector,
-    rpc_call,
+    add_univ3_log_scan_args,
+    fetch_logs_chunked,
+    log_row,
+    univ3_scan_start,
     write_json,
 )
 
@@ -32,55 +30,27 @@ def keccak_topic(signature: str) -> str:
 SWAP_TOPIC0 = keccak_topic("Swap(address,address,int256,int256,uint160,uint128,int24)")
 
 
-def eth_get_logs(rpc_url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
-    return rpc_call(rpc_url, "eth_getLogs", [params])
-
-
 def decode_indexed_address(topic_hex: str) -> str:
     if topic_hex.startswith("0x"):
         topic_hex = topic_hex[2:]
     return "0x" + topic_hex[-40:]
 
 
-def fetch_logs_chunked(
-    *,
-    rpc_url: str,
-    address: str,
-    topic0: str,
-    from_block: int,
-    to_block: int,
-    initial_step: int,
-    max_step: int,
-    max_logs: int | None,
-) -> list[dict[str, Any]]:
-    logs: list[dict[str, Any]] = []
-    step = initial_step
-    cur = from_block
-
-    while cur <= to_block:
-        end = min(cur + step - 1, to_block)
-        params = {"fromBlock": hex(cur), "toBlock": hex(end), "address": address, "topics": [topic0]}
-        try:
-            chunk = eth_get_logs(rpc_url, params)
-        except RuntimeError as e:
-            # Reduce range on common provider “too many results” / response-too-large cases.
-            msg = str(e).lower()
-            if any(k in msg for k in ["too many", "response size", "limit", "timeout", "more than", "range"]):
-                step = max(100, step // 2)
-                continue
-            raise
-
-        logs.extend(chunk)
-        if max_logs is not None and len(logs) >= max_logs:
-            return logs[:max_logs]
-
-        # Adaptive step sizing: increase when chunks are small.
-        if len(chunk) < 1000 and step < max_step:
-            step = min(max_step, step * 2)
-
-        cur = end + 1
-
-    return logs
+def aggregate_by_address(topics: list[str], usd: list[float]) -> tuple[dict[str, float], dict[str, int]]:
+    # USD volume and swap count per address for parallel (indexed-address topic, usd) columns. Groups on the raw topic
+    # first so each distinct address is decoded once rather than once per swap.
+    topic_volume: dict[str, float] = defaultdict(float)
+    for topic, notional_usd in zip(topics, usd):
+        topic_volume[topic] += notional_usd
+    topic_counts = Counter(topics)
+
+    volume: dict[str, float] = defaultdict(float)
+    counts: dict[str, int] = defaultdict(int)
+    for topic, vol in topic_volume.items():
+        addr = decode_indexed_address(topic).lower()
+        volume[addr] += vol
+        counts[addr] += topic_counts[topic]
+    return volume, counts
 
 
 def main() -> int:
@@ -91,6 +61,7 @@ def main() -> int:
     parser.add_argument("--token1-coingecko-id", required=True)
     parser.add_argument("--days", type=float, default=1.0)
     parser.add_argument("--max-logs", type=int, default=None)
+    add_univ3_log_scan_args(parser)
     parser.add_argument("--top-n", type=int, default=20)
     parser.add_argument("--out", default=str(OUTPUTS_DIR / "univ3-swap-address-analytics.json"))
     args = parser.parse_args()
@@ -98,20 +69,18 @@ def main() -> int:
     rpc_url = args.rpc_url
     pool = args.pool
 
-    token0 = decode_address_word(eth_call(rpc_url, pool, "0x" + keccak_selector("token0()"))[2:].rjust(64, "0"))
-    token1 = decode_address_word(eth_call(rpc_url, pool, "0x" + keccak_selector("token1()"))[2:].rjust(64, "0"))
-    dec0 = decode_uint256(eth_call(rpc_url, token0, "0x" + keccak_selector("decimals()")))
-    dec1 = decode_uint256(eth_call(rpc_url, token1, "0x" + keccak_selector("decimals()")))
+    now_ts = int(time.time())
+    start_ts = int(now_ts - args.days * 86400)
 
-    prices = coingecko_simple_price([args.token0_coingecko_id, args.token1_coingecko_id], "usd")
+    pool_tokens, prices, latest, start_block = univ3_scan_start(
+        rpc_url, pool, [args.token0_coingecko_id, args.token1_coingecko_id], start_ts, batch=not args.no_rpc_batch
+    )
+
+    token0, token1 = pool_tokens.token0, pool_tokens.token1
+    dec0, dec1 = pool_tokens.decimals0, pool_tokens.decimals1
     p0 = float(prices[args.token0_coingecko_id]["usd"])
     p1 = float(prices[args.token1_coingecko_id]["usd"])
 
-    now_ts = int(time.time())
-    start_ts = int(now_ts - args.days * 86400)
-    latest = eth_block_number(rpc_url)
-    start_block = find_block_by_timestamp(rpc_url, start_ts, high_block=latest)
-
     initial_step = 50_000 if "arb" in rpc_url else 10_000
     max_step = 200_000 if "arb" in rpc_url else 30_000
 
@@ -124,47 +93,50 @@ def main() -> int:
         initial_step=initial_step,
         max_step=max_step,
         max_logs=args.max_logs,
+        max_workers=args.workers,
+        reset_ceiling=args.reset_getlogs_ceiling,
+        row=log_row,
     )
 
-    sender_volume_usd: dict[str, float] = defaultdict(float)
-    recipient_volume_usd: dict[str, float] = defaultdict(float)
-    sender_counts: dict[str, int] = defaultdict(int)
-    recipient_counts: dict[str, int] = defaultdict(int)
+    # Decoded swaps as columns: sender topic, recipient topic, USD notional.
+    sender_topics: list[str] = []
+    recipient_topics: list[str] = []
+    usd: list[float] = []
 
+    # Raw-unit scales, hoisted out of the per-log loop. Kept as ints: int / int is correctly rounded, whereas
+    # dividing by a float scale would first round amounts above 2**53.
+    scale0 = 10**dec0
+    scale1 = 10**dec1
     for log in logs:
-        topics = log.get("topics") or []
+        topics = log.topics
         if len(topics) < 3:
             continue
-        sender = decode_indexed_address(topics[1]).lower()
-        recipient = decode_indexed_address(topics[2]).lower()
 
-        data = (log.get("data") or "0x")[2:]
-        if len(data) < 64 * 2:
+        raw = log.data
+        if len(raw) < 32 * 2:
             continue
-        amount0 = int(data[0:64], 16)
-        amount1 = int(data[64:128], 16)
-        # Interpret amounts as signed int256.
-        if amount0 >= 2**255:
-            amount0 -= 2**256
-        if amount1 >= 2**255:
-            amount1 -= 2**256
+        # amount0/amount1 as signed int256 words.
+        amount0 = int.from_bytes(raw[:32], "big", signed=True)
+        amount1 = int.from_bytes(raw[32:64], "big", signed=True)
 
         # Notional approximation: use the token-in side for USD notional.
         if amount0 > 0:
-            notional_usd = (amount0 / 10**dec0) * p0
+            notional_usd = (amount0 / scale0) * p0
         elif amount1 > 0:
-            notional_usd = (amount1 / 10**dec1) * p1
+            notional_usd = (amount1 / scale1) * p1
         else:
             continue
 
-        sender_volume_usd[sender] += notional_usd
-        recipient_volume_usd[recipient] += notional_usd
-        sender_counts[sender] += 1
-        recipient_counts[recipient] += 1
+        sender_topics.append(topics[1])
+        recipient_topics.append(topics[2])
+        usd.append(notional_usd)
+
+    sender_volume_usd, sender_counts = aggregate_by_address(sender_topics, usd)
+    recipient_volume_usd, recipient_counts = aggregate_by_address(recipient_topics, usd)
 
-    def top_items(d: dict[str, float], counts: dict[str, int]) -> list[dict[str, Any]]:
-        items = sorted(d.items(), key=lambda kv: kv[1], reverse=True)[: args.top_n]
-        total = sum(d.values())
+    def top_items(d: dict[str, float], counts: dict[str, int], total: float) -> list[dict[str, Any]]:
+        # nlargest keeps sorted(..., reverse=True)[:n] ordering (ties stay in first-seen order) without a full sort.
+        items = heapq.nlargest(args.top_n, d.items(), key=itemgetter(1))
         out: list[dict[str, Any]] = []
         for addr, vol in items:
             out.append(
@@ -178,6 +150,7 @@ def main() -> int:
         return out
 
     total_vol = sum(sender_volume_usd.values())
+    recipient_total_vol = sum(recipient_volume_usd.values())
     out = {
         "as_of": datetime.now(timezone.utc).isoformat(),
         "rpc_url": rpc_url,
@@ -194,8 +167,8 @@ def main() -> int:
         },
         "aggregate": {"volume_usd": total_vol},
         "top": {
-            "senders": top_items(sender_volume_usd, sender_counts),
-            "recipients": top_items(recipient_volume_usd, recipient_counts),
+            "senders": top_items(sender_volume_usd, sender_counts, total_vol),
+            "recipients": top_items(recipient_volume_usd, recipient_counts, recipient_total_vol),
         },
     }
 
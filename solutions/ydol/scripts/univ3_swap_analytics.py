@@ -6,21 +6,15 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
 
 from utils import (
     OUTPUTS_DIR,
     abi_encode_int,
-    coingecko_simple_price,
-    decode_address_word,
-    decode_int256,
-    decode_uint256,
-    eth_block_number,
-    eth_call,
+    add_univ3_log_scan_args,
     env,
-    find_block_by_timestamp,
-    keccak_selector,
-    rpc_call,
+    fetch_logs_chunked,
+    log_row,
+    univ3_scan_start,
     write_json,
 )
 
@@ -36,74 +30,6 @@ def keccak_topic(signature: str) -> str:
 SWAP_TOPIC0 = keccak_topic("Swap(address,address,int256,int256,uint160,uint128,int24)")
 
 
-def eth_get_logs(rpc_url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
-    return rpc_call(rpc_url, "eth_getLogs", [params])
-
-
-def parse_int256_word(word_hex: str) -> int:
-    return decode_int256(word_hex)
-
-
-def read_pool_token(rpc_url: str, pool: str, fn_sig: str) -> str:
-    sel = "0x" + keccak_selector(fn_sig)
-    res = eth_call(rpc_url, pool, sel)
-    word = res[2:].rjust(64, "0")
-    return decode_address_word(word)
-
-
-def read_pool_fee(rpc_url: str, pool: str) -> int:
-    sel = "0x" + keccak_selector("fee()")
-    res = eth_call(rpc_url, pool, sel)
-    return decode_uint256(res)
-
-
-def read_erc20_decimals(rpc_url: str, token: str) -> int:
-    sel = "0x" + keccak_selector("decimals()")
-    res = eth_call(rpc_url, token, sel)
-    return decode_uint256(res)
-
-
-def fetch_logs_chunked(
-    *,
-    rpc_url: str,
-    address: str,
-    topic0: str,
-    from_block: int,
-    to_block: int,
-    initial_step: int,
-    max_step: int,
-    max_logs: int | None,
-) -> list[dict[str, Any]]:
-    logs: list[dict[str, Any]] = []
-    step = initial_step
-    cur = from_block
-
-    while cur <= to_block:
-        end = min(cur + step - 1, to_block)
-        params = {"fromBlock": hex(cur), "toBlock": hex(end), "address": address, "topics": [topic0]}
-        try:
-            chunk = eth_get_logs(rpc_url, params)
-        except RuntimeError as e:
-            # Reduce range on common provider “too many results” / response-too-large cases.
-            msg = str(e).lower()
-            if any(k in msg for k in ["too many", "response size", "limit", "timeout", "more than", "range"]):
-                step = max(100, step // 2)
-                continue
-            raise
-
-        logs.extend(chunk)
-        if max_logs is not None and len(logs) >= max_logs:
-            return logs[:max_logs]
-
-        # Adaptive step sizing: increase when chunks are small.
-        if len(chunk) < 1000 and step < max_step:
-            step = min(max_step, step * 2)
-
-        cur = end + 1
-
-    return logs
-
-
 @dataclass(frozen=True)
 class SwapAgg:
     swaps: int
@@ -123,7 +49,7 @@ def percentile(values: list[float], p: float) -> float:
     return s[idx]
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Compute recent Uniswap v3 pool swap volume + fees from onchain logs.")
     parser.add_argument("--rpc-url", default=env("ARBITRUM_RPC_URL", "https://arb1.arbitrum.io/rpc"))
     parser.add_argument("--pool", required=True, help="Uniswap v3 pool address.")
@@ -131,30 +57,26 @@ def main() -> int:
     parser.add_argument("--token1-coingecko-id", required=True)
     parser.add_argument("--days", type=float, default=1.0, help="Lookback window (days).")
     parser.add_argument("--max-logs", type=int, default=None, help="Optional cap to avoid giant scans.")
+    add_univ3_log_scan_args(parser)
     parser.add_argument("--out", default=str(OUTPUTS_DIR / "univ3-swap-analytics.json"))
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     rpc_url = args.rpc_url
     pool = args.pool
 
-    token0 = read_pool_token(rpc_url, pool, "token0()")
-    token1 = read_pool_token(rpc_url, pool, "token1()")
-    fee = read_pool_fee(rpc_url, pool)
-    fee_frac = fee / 1_000_000
+    now_ts = int(time.time())
+    start_ts = int(now_ts - args.days * 86400)
 
-    dec0 = read_erc20_decimals(rpc_url, token0)
-    dec1 = read_erc20_decimals(rpc_url, token1)
+    pool_tokens, prices, latest, start_block = univ3_scan_start(
+        rpc_url, pool, [args.token0_coingecko_id, args.token1_coingecko_id], start_ts, batch=not args.no_rpc_batch
+    )
 
-    prices = coingecko_simple_price([args.token0_coingecko_id, args.token1_coingecko_id], "usd")
+    token0, token1, fee = pool_tokens.token0, pool_tokens.token1, pool_tokens.fee
+    fee_frac = fee / 1_000_000
+    dec0, dec1 = pool_tokens.decimals0, pool_tokens.decimals1
     p0 = float(prices[args.token0_coingecko_id]["usd"])
     p1 = float(prices[args.token1_coingecko_id]["usd"])
 
-    now_ts = int(time.time())
-    start_ts = int(now_ts - args.days * 86400)
-
-    latest = eth_block_number(rpc_url)
-    start_block = find_block_by_timestamp(rpc_url, start_ts, high_block=latest)
-
     # Heuristic: Arbitrum-like chains have huge block counts; start with larger chunks.
     initial_step = 50_000 if "arb" in rpc_url else 10_000
     max_step = 200_000 if "arb" in rpc_url else 30_000
@@ -168,6 +90,9 @@ def main() -> int:
         initial_step=initial_step,
         max_step=max_step,
         max_logs=args.max_logs,
+        max_workers=args.workers,
+        reset_ceiling=args.reset_getlogs_ceiling,
+        row=log_row,
     )
 
     token0_in = 0.0
@@ -178,21 +103,24 @@ def main() -> int:
     fees_usd = 0.0
     notionals: list[float] = []
 
+    # Raw-unit scales, hoisted out of the per-log loop. Kept as ints: int / int is correctly rounded, whereas
+    # dividing by a float scale would first round amounts above 2**53.
+    scale0 = 10**dec0
+    scale1 = 10**dec1
     for log in logs:
-        data = log["data"][2:]
-        if len(data) < 64 * 5:
+        raw = log.data
+        if len(raw) < 32 * 5:
             continue
-        words = [data[i : i + 64] for i in range(0, 64 * 5, 64)]
-        amount0 = parse_int256_word(words[0])
-        amount1 = parse_int256_word(words[1])
+        amount0 = int.from_bytes(raw[:32], "big", signed=True)
+        amount1 = int.from_bytes(raw[32:64], "big", signed=True)
 
         if amount0 > 0:
-            amt0 = amount0 / (10**dec0)
+            amt0 = amount0 / scale0
             token0_in += amt0
             token0_fees += amt0 * fee_frac
             usd = amt0 * p0
         elif amount1 > 0:
-            amt1 = amount1 / (10**dec1)
+            amt1 = amount1 / scale1
             token1_in += amt1
             token1_fees += amt1 * fee_frac
             usd = amt1 * p1
@@ -1,24 +1,61 @@
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import re
+import heapq
 import random
+import sqlite3
 import time
-from dataclasses import dataclass
-from decimal import Decimal, getcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from decimal import Decimal, DefaultContext, getcontext
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, NamedTuple
+from urllib.parse import urlparse
 
 import requests
 from Crypto.Hash import keccak
+from requests.adapters import HTTPAdapter
+
+try:
+    import fcntl
+except ImportError:  # Windows: cache updates are unlocked.
+    fcntl = None
+
+try:  # Optional: faster JSON parsing for outputs and caches.
+    import orjson
+except ImportError:
+    orjson = None
 
 getcontext().prec = 80
+# Decimal contexts are per-thread; worker threads copy DefaultContext, so keep them at the same precision.
+DefaultContext.prec = 80
 
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT_DIR / "data"
 OUTPUTS_DIR = ROOT_DIR / "outputs"
+# Machine-local caches (gitignored): unlike the pinned snapshots in data/, these are rebuilt on demand.
+CACHE_DIR = OUTPUTS_DIR / ".cache"
+
+
+def _make_http_session() -> requests.Session:
+    # Shared keep-alive pool; retries are handled by the callers' own loops (_rpc_post, http_get_json), so the adapter
+    # doesn't retry too. Up to 64 connections per host covers run_case_studies' in-process jobs each running their
+    # own 8-16 worker fan-out; past that, pool_block makes threads wait for a pooled connection instead of opening
+    # throwaway ones.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0, pool_block=True)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+HTTP_SESSION = _make_http_session()
 
 
 def ensure_dir(path: Path) -> None:
@@ -30,24 +67,117 @@ def write_text(path: Path, text: str) -> None:
     path.write_text(text, encoding="utf-8")
 
 
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(data: Any) -> bytes:
+    # Indented, key-sorted JSON via the stdlib encoder even when orjson is installed: orjson's output (UTF-8 instead
+    # of \u escapes, no "+" in float exponents) would make committed outputs depend on the local environment.
+    return json.dumps(data, indent=2, sort_keys=True, default=_json_default).encode("utf-8")
+
+
 def write_json(path: Path, data: Any) -> None:
+    # Write-then-rename, so a concurrent reader (e.g. a sibling script sharing a cache file) never sees a partial file.
     ensure_dir(path.parent)
-    path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(dumps_json(data))
+    os.replace(tmp, path)
 
 
 def read_json(path: Path) -> Any:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def http_get(url: str, *, params: dict[str, Any] | None = None, timeout_s: int = 30) -> requests.Response:
-    return requests.get(
+def update_json_cache(path: Path, updates: dict[str, Any]) -> dict[str, Any]:
+    # Merge `updates` into a JSON-object cache file under an exclusive lock, so concurrent runs neither corrupt the
+    # file nor drop each other's entries. Returns the merged cache.
+    ensure_dir(path.parent)
+    with open(path.with_name(path.name + ".lock"), "w") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            cache = read_json(path) if path.exists() else {}
+        except ValueError:
+            cache = {}
+        if not isinstance(cache, dict):
+            cache = {}
+        cache.update(updates)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(dumps_json(cache))
+        os.replace(tmp, path)
+    return cache
+
+
+def http_get(
+    url: str,
+    *,
+    params: dict[str, Any] | list[tuple[str, Any]] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout_s: int = 30,
+) -> requests.Response:
+    return HTTP_SESSION.get(
         url,
         params=params,
         timeout=timeout_s,
-        headers={"User-Agent": "proposal-review/1.0"},
+        headers={"User-Agent": "proposal-review/1.0", **(headers or {})},
     )
 
 
+def http_get_json(
+    url: str,
+    *,
+    params: dict[str, Any] | list[tuple[str, Any]] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout_s: int = 30,
+    max_attempts: int = 5,
+) -> Any:
+    # http_get + JSON decode, retrying 429/5xx and transport errors; other 4xx fail immediately.
+    for attempt in range(1, max_attempts + 1):
+        try:
+            resp = http_get(url, params=params, headers=headers, timeout_s=timeout_s)
+            if resp.status_code == 429 or 500 <= resp.status_code < 600:
+                raise requests.HTTPError(f"HTTP {resp.status_code} from {url}", response=resp)
+            resp.raise_for_status()
+            return resp.json()
+        except (requests.RequestException, ValueError) as e:
+            if attempt >= max_attempts or (
+                isinstance(e, requests.HTTPError) and e.response is not None and 400 <= e.response.status_code < 500 and e.response.status_code != 429
+            ):
+                raise
+            time.sleep(backoff_sleep_s(attempt, resp=getattr(e, "response", None)))
+    raise RuntimeError("unreachable")
+
+
+def retry_after_s(resp: requests.Response | None) -> float | None:
+    # `Retry-After` is either delta-seconds or an HTTP-date.
+    if resp is None:
+        return None
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def backoff_sleep_s(attempt: int, *, resp: requests.Response | None = None, base_s: float = 1.0, cap_s: float = 30.0) -> float:
+    # Honor a server-signalled wait; otherwise exponential backoff with full jitter.
+    wait = retry_after_s(resp)
+    if wait is not None:
+        return wait
+    return random.uniform(0, min(cap_s, base_s * 2**attempt))
+
+
 def cached_download(url: str, dest: Path, *, refresh: bool = False, timeout_s: int = 30) -> Path:
     ensure_dir(dest.parent)
     if dest.exists() and not refresh:
@@ -74,6 +204,7 @@ def env(name: str, default: str) -> str:
     return val if val else default
 
 
+@lru_cache(maxsize=None)
 def keccak_selector(signature: str) -> str:
     h = keccak.new(digest_bits=256)
     h.update(signature.encode("utf-8"))
@@ -98,6 +229,9 @@ def abi_encode_int(value: int, *, bits: int = 256) -> str:
     return pad32(hex(value & ((1 << bits) - 1))[2:])
 
 
+_LOG_RANGE_REJECTION_HINTS = ("too many results", "returned more than", "response size", "block range")
+
+
 def _should_retry_rpc_error(err: Any) -> bool:
     # Heuristic: retry rate-limits / transient infra errors, but fail fast on programmer errors/reverts.
     if not isinstance(err, dict):
@@ -108,6 +242,10 @@ def _should_retry_rpc_error(err: Any) -> bool:
     if "execution reverted" in msg or "revert" in msg:
         return False
 
+    # eth_getLogs range/size rejections (often -32005) won't succeed on retry; callers shrink the range instead.
+    if any(k in msg for k in _LOG_RANGE_REJECTION_HINTS):
+        return False
+
     # JSON-RPC "hard" errors / likely non-transient.
     if code in {-32601, -32602, -32603}:
         return False
@@ -124,8 +262,16 @@ class TransientRpcError(RuntimeError):
     pass
 
 
-def rpc_call(rpc_url: str, method: str, params: list[Any]) -> Any:
-    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+def _rpc_result(item: Any, *, last_attempt: bool) -> Any:
+    if "error" in item:
+        err = item["error"]
+        if _should_retry_rpc_error(err) and not last_attempt:
+            raise TransientRpcError(err)
+        raise RuntimeError(err)
+    return item["result"]
+
+
+def _rpc_post(rpc_url: str, payload: Any, unpack: Callable[[Any, bool], Any]) -> Any:
     headers = {"User-Agent": "proposal-review/1.0"}
 
     max_attempts = 6
@@ -134,18 +280,12 @@ def rpc_call(rpc_url: str, method: str, params: list[Any]) -> Any:
     last_err: Exception | None = None
     for attempt in range(1, max_attempts + 1):
         try:
-            resp = requests.post(rpc_url, json=payload, timeout=30, headers=headers)
+            resp = HTTP_SESSION.post(rpc_url, json=payload, timeout=30, headers=headers)
             if resp.status_code in {429, 500, 502, 503, 504}:
                 raise requests.HTTPError(f"RPC HTTP {resp.status_code}", response=resp)
             resp.raise_for_status()
 
-            data = resp.json()
-            if "error" in data:
-                err = data["error"]
-                if _should_retry_rpc_error(err) and attempt < max_attempts:
-                    raise TransientRpcError(err)
-                raise RuntimeError(err)
-            return data["result"]
+            return unpack(resp.json(), attempt >= max_attempts)
         except (requests.RequestException, ValueError, TransientRpcError) as e:
             if isinstance(e, requests.HTTPError) and getattr(e, "response", None) is not None:
                 status = int(e.response.status_code)
@@ -161,6 +301,172 @@ def rpc_call(rpc_url: str, method: str, params: list[Any]) -> Any:
     raise RuntimeError("unreachable") from last_err
 
 
+def rpc_call(rpc_url: str, method: str, params: list[Any]) -> Any:
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    return _rpc_post(rpc_url, payload, lambda data, last: _rpc_result(data, last_attempt=last))
+
+
+def rpc_batch(rpc_url: str, calls: list[tuple[str, list[Any]]]) -> list[Any]:
+    # One JSON-RPC array request; results are returned in call order (nodes may reply out of order).
+    if not calls:
+        return []
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+    def unpack(data: Any, last: bool) -> list[Any]:
+        if isinstance(data, dict) and "error" in data:
+            # Some providers answer a rejected batch with a single error object.
+            _rpc_result(data, last_attempt=last)
+        if not isinstance(data, list) or len(data) != len(payload):
+            raise ValueError(f"Unexpected batch response ({type(data).__name__})")
+        by_id = {item.get("id"): item for item in data}
+        return [_rpc_result(by_id[i], last_attempt=last) for i in range(len(payload))]
+
+    return _rpc_post(rpc_url, payload, unpack)
+
+
+def eth_get_logs(rpc_url: str, params: dict[str, Any]) -> list[dict[str, Any]]:
+    return rpc_call(rpc_url, "eth_getLogs", [params])
+
+
+LOG_STEP_CEILING_CACHE = CACHE_DIR / "getlogs-step-ceilings.json"
+
+# Substrings of provider errors that mean "ask for a smaller block range" (too many results, response too large, ...).
+_LOG_RANGE_ERROR_HINTS = ("too many", "response size", "limit", "timeout", "more than", "range")
+
+
+class LogRow(NamedTuple):
+    # The parts of an eth_getLogs entry the log scanners read. A tuple instead of the decoded JSON dict (hashes,
+    # indices, address, ... as separate strings) keeps multi-day scans several times smaller in memory.
+    block_number: int
+    topics: list[str]
+    data: bytes  # ABI-encoded payload, already converted from hex (half the size of the hex string)
+
+
+def log_row(log: dict[str, Any]) -> LogRow:
+    return LogRow(int(log["blockNumber"], 16), log.get("topics") or [], bytes.fromhex((log.get("data") or "0x")[2:]))
+
+
+def log_window(lo: int, step: int, to_block: int) -> tuple[int, int]:
+    # The eth_getLogs window of up to `step` blocks starting at `lo`; both bounds inclusive, as in fromBlock/toBlock.
+    return lo, min(lo + step - 1, to_block)
+
+
+def fetch_logs_chunked(
+    *,
+    rpc_url: str,
+    address: str,
+    topic0: str,
+    from_block: int,
+    to_block: int,
+    initial_step: int,
+    max_step: int,
+    max_logs: int | None,
+    max_workers: int = 8,
+    ceiling_cache_path: Path | None = LOG_STEP_CEILING_CACHE,
+    reset_ceiling: bool = False,
+    row: Callable[[dict[str, Any]], Any] | None = None,
+) -> list[Any]:
+    # eth_getLogs over [from_block, to_block] in adaptively sized block windows, keeping up to `max_workers` windows
+    # in flight. Logs come back in block order; a window the provider fails as too large (or too slow) is split in
+    # half and re-queued.
+    # Growth is capped below the smallest window the provider explicitly rejected (`ceiling`), which is remembered
+    # per (RPC host, address) in `ceiling_cache_path` so later runs skip re-probing it; a run whose windows at the
+    # cap all succeed raises the remembered value, and `reset_ceiling` ignores it and overwrites it with what this run
+    # learns. `row` (e.g. log_row) is applied to each log in the worker as its chunk arrives, so only the projected
+    # rows are ever held for the whole range.
+    max_workers = max(1, max_workers)
+    ceiling_key = f"{urlparse(rpc_url).netloc}:{address.lower()}"
+    stored: int | None = None
+    if ceiling_cache_path is not None and ceiling_cache_path.exists():
+        try:
+            stored = int(read_json(ceiling_cache_path)[ceiling_key])
+        except (KeyError, ValueError, TypeError, AttributeError):
+            pass
+    ceiling = max_step if stored is None or reset_ceiling else max(100, min(max_step, stored))
+    rejected = False  # an explicit too-large rejection lowered `ceiling` during this run
+    largest_ok = 0  # largest window that succeeded
+    logs: list[Any] = []
+    step = min(initial_step, ceiling)
+    step_gen = 0  # bumped on every shrink; only windows sized at the current step may grow it
+    cur = from_block  # start of the next fresh window
+    retry: list[tuple[int, int]] = []  # heap of split windows, lowest block first
+    done: dict[int, tuple[int, list[Any]]] = {}  # finished windows by start block, until next in order
+    next_lo = from_block
+
+    def fetch(lo: int, hi: int) -> list[Any]:
+        params = {"fromBlock": hex(lo), "toBlock": hex(hi), "address": address, "topics": [topic0]}
+        chunk = eth_get_logs(rpc_url, params)
+        return chunk if row is None else [row(log) for log in chunk]
+
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    in_flight: dict[Future[list[Any]], tuple[int, int, int]] = {}
+    try:
+        while True:
+            while len(in_flight) < max_workers and (retry or cur <= to_block):
+                if retry:
+                    lo, hi = heapq.heappop(retry)
+                else:
+                    lo, hi = log_window(cur, step, to_block)
+                    cur = hi + 1
+                in_flight[pool.submit(fetch, lo, hi)] = (lo, hi, step_gen)
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                lo, hi, gen = in_flight.pop(fut)
+                try:
+                    chunk = fut.result()
+                except RuntimeError as e:
+                    msg = str(e).lower()
+                    if not any(k in msg for k in _LOG_RANGE_ERROR_HINTS):
+                        raise
+                    if any(k in msg for k in _LOG_RANGE_REJECTION_HINTS):
+                        # Keep headroom under the rejected size: log density varies, so windows just below it fail
+                        # too. Vaguer failures (timeouts, generic "limit") only shrink the step, not the cap.
+                        ceiling = max(100, min(ceiling, (hi - lo + 1) * 3 // 4))
+                        rejected = True
+                    step = max(100, min(step, ceiling) // 2)
+                    step_gen += 1
+                    first = log_window(lo, max(100, (hi - lo + 1) // 2), hi)
+                    heapq.heappush(retry, first)
+                    if first[1] < hi:
+                        heapq.heappush(retry, (first[1] + 1, hi))
+                    continue
+
+                done[lo] = (hi, chunk)
+                largest_ok = max(largest_ok, hi - lo + 1)
+                # Adaptive step sizing: increase when chunks are small. Windows issued before the last shrink are
+                # stale evidence and must not undo it.
+                if gen == step_gen and len(chunk) < 1000 and step < ceiling:
+                    step = min(ceiling, step * 2)
+
+            while next_lo in done:
+                # Windows tile [from_block, to_block] exactly: each starts right after the previous one's end.
+                hi, chunk = done.pop(next_lo)
+                logs.extend(chunk)
+                next_lo = hi + 1
+            if max_logs is not None and len(logs) >= max_logs:
+                return logs[:max_logs]
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if ceiling_cache_path is not None:
+            learned: int | None = None
+            if rejected or reset_ceiling:
+                learned = ceiling
+            elif largest_ok >= ceiling:
+                # Windows at the cap all went through: let the next run probe half as far again.
+                learned = min(max_step, ceiling * 3 // 2)
+            if learned is not None and learned != (stored if stored is not None else max_step):
+                update_json_cache(ceiling_cache_path, {ceiling_key: learned})
+
+    assert next_lo == max(from_block, to_block + 1) and not done, "eth_getLogs windows left a gap or overlap"
+    return logs
+
+
 def eth_block_number(rpc_url: str) -> int:
     return int(rpc_call(rpc_url, "eth_blockNumber", []), 16)
 
@@ -175,6 +481,81 @@ def eth_get_block_timestamp(rpc_url: str, block_number: int) -> int:
     return int(blk["timestamp"], 16)
 
 
+def eth_get_block_timestamps(rpc_url: str, block_numbers: Iterable[int], *, batch_size: int = 200) -> dict[int, int]:
+    # {block_number: timestamp} for many blocks, as JSON-RPC batches of `batch_size` eth_getBlockByNumber calls.
+    blocks = sorted(set(block_numbers))
+    out: dict[int, int] = {}
+    for start in range(0, len(blocks), batch_size):
+        chunk = blocks[start : start + batch_size]
+        results = rpc_batch(rpc_url, [("eth_getBlockByNumber", [hex(bn), False]) for bn in chunk])
+        out.update(zip(chunk, (int(blk["timestamp"], 16) for blk in results)))
+    return out
+
+
+@lru_cache(maxsize=None)
+def eth_chain_id(rpc_url: str) -> int:
+    return int(rpc_call(rpc_url, "eth_chainId", []), 16)
+
+
+class BlockTimestampStore:
+    # On-disk (chain_id, block_number) -> timestamp cache. Block timestamps are immutable, so entries never expire.
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or (CACHE_DIR / "block-timestamps.sqlite")
+        ensure_dir(self.path.parent)
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS ts (chain INT, block INT, ts INT, PRIMARY KEY (chain, block))")
+        self._db.commit()
+
+    def get_many(self, chain_id: int, block_numbers: Iterable[int]) -> tuple[dict[int, int], list[int]]:
+        # Returns (hits, misses) for the distinct `block_numbers`.
+        blocks = sorted(set(block_numbers))
+        hits: dict[int, int] = {}
+        for start in range(0, len(blocks), 500):  # stay under SQLite's bound-parameter limit
+            chunk = blocks[start : start + 500]
+            rows = self._db.execute(
+                f"SELECT block, ts FROM ts WHERE chain = ? AND block IN ({','.join('?' * len(chunk))})",
+                [chain_id, *chunk],
+            )
+            hits.update(rows)
+        return hits, [bn for bn in blocks if bn not in hits]
+
+    def put_many(self, chain_id: int, block_ts: dict[int, int]) -> None:
+        with self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO ts (chain, block, ts) VALUES (?, ?, ?)",
+                [(chain_id, bn, ts) for bn, ts in block_ts.items()],
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def cached_block_timestamps(
+    rpc_url: str,
+    block_numbers: Iterable[int],
+    *,
+    chain_id: int | None = None,
+    store: BlockTimestampStore | None = None,
+) -> dict[int, int]:
+    # eth_get_block_timestamps backed by a BlockTimestampStore: only blocks not seen on this chain hit the RPC.
+    if chain_id is None:
+        chain_id = eth_chain_id(rpc_url)
+    own_store = store is None
+    store = store or BlockTimestampStore()
+    try:
+        block_ts, misses = store.get_many(chain_id, block_numbers)
+        if misses:
+            fetched = eth_get_block_timestamps(rpc_url, misses)
+            store.put_many(chain_id, fetched)
+            block_ts.update(fetched)
+        return block_ts
+    finally:
+        if own_store:
+            store.close()
+
+
 def find_block_by_timestamp(
     rpc_url: str,
     target_ts: int,
@@ -210,6 +591,29 @@ def eth_call(rpc_url: str, to: str, data: str) -> str:
     return rpc_call(rpc_url, "eth_call", [{"to": to, "data": data}, "latest"])
 
 
+@lru_cache(maxsize=4096)
+def cached_eth_call(rpc_url: str, to: str, data: str) -> str:
+    # Only for views that cannot change during a run (decimals, token0/token1, fee); never for prices/quotes.
+    return eth_call(rpc_url, to, data)
+
+
+def eth_call_batch(rpc_url: str, calls: list[tuple[str, str]], *, batch_size: int = 50) -> list[str]:
+    # `calls` are (to, data) pairs; sent as JSON-RPC batches of `batch_size` to stay under provider caps.
+    out: list[str] = []
+    for start in range(0, len(calls), batch_size):
+        chunk = calls[start : start + batch_size]
+        out.extend(rpc_batch(rpc_url, [("eth_call", [{"to": to, "data": data}, "latest"]) for to, data in chunk]))
+    return out
+
+
+def eth_call_parallel(rpc_url: str, calls: list[tuple[str, str]], *, max_workers: int = 16) -> list[str]:
+    # Fallback for nodes that reject JSON-RPC batches: same contract as `eth_call_batch`, one request per call.
+    if not calls:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls)))) as pool:
+        return list(pool.map(lambda call: eth_call(rpc_url, call[0], call[1]), calls))
+
+
 def decode_uint256(hex_str: str) -> int:
     return int(hex_str, 16)
 
@@ -225,12 +629,45 @@ def decode_address_word(word_hex: str) -> str:
     return "0x" + word_hex[-40:]
 
 
+# decimals() of widely used tokens (fixed for the life of the token); lets callers skip the RPC round-trip.
+KNOWN_ERC20_DECIMALS: dict[str, int] = {
+    # Ethereum mainnet
+    "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2": 18,  # WETH
+    "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": 6,  # USDC
+    "0xdac17f958d2ee523a2206206994597c13d831ec7": 6,  # USDT
+    "0x6b175474e89094c44da98b954eedeac495271d0f": 18,  # DAI
+    "0x2260fac5e5542a773aa44fbcfedf7c193bc2c599": 8,  # WBTC
+    # Arbitrum One
+    "0x82af49447d8a07e3bd95bd0d56f35241523fbab1": 18,  # WETH
+    "0xaf88d065e77c8cc2239327c5edb3a432268e5831": 6,  # USDC
+    "0xff970a61a04b1ca14834a43f5de4533ebddb5cc8": 6,  # USDC.e
+}
+
+
 def erc20_decimals(rpc_url: str, token: str) -> int:
+    known = KNOWN_ERC20_DECIMALS.get(token.lower())
+    if known is not None:
+        return known
     sel = "0x" + keccak_selector("decimals()")
-    res = eth_call(rpc_url, token, sel)
+    res = cached_eth_call(rpc_url, token, sel)
     return int(res, 16)
 
 
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+COINGECKO_PRO_API_URL = "https://pro-api.coingecko.com/api/v3"
+
+
+def coingecko_api() -> tuple[str, dict[str, str]]:
+    # (base URL, auth headers). COINGECKO_PRO_API_KEY selects the Pro host; COINGECKO_API_KEY is a Demo key.
+    pro_key = env("COINGECKO_PRO_API_KEY", "")
+    if pro_key:
+        return COINGECKO_PRO_API_URL, {"x-cg-pro-api-key": pro_key}
+    demo_key = env("COINGECKO_API_KEY", "")
+    if demo_key:
+        return COINGECKO_API_URL, {"x-cg-demo-api-key": demo_key}
+    return COINGECKO_API_URL, {}
+
+
 def coingecko_simple_price(
     ids: Iterable[str],
     vs_currency: str,
@@ -238,20 +675,22 @@ def coingecko_simple_price(
     cache_path: Path | None = None,
     refresh: bool = False,
 ) -> dict[str, dict[str, float]]:
+    # The cache file accumulates ids across callers. A full hit is served from it; on any miss every requested id is
+    # refetched, so the returned prices come from one snapshot instead of mixing fresh and stale entries.
+    ids = list(ids)
     cache_path = cache_path or (DATA_DIR / f"coingecko-simple-price-{vs_currency}.json")
     if cache_path.exists() and not refresh:
         cached = read_json(cache_path)
         if isinstance(cached, dict) and all(k in cached for k in ids):
             return cached
 
-    url = "https://api.coingecko.com/api/v3/simple/price"
-    resp = http_get(url, params={"ids": ",".join(ids), "vs_currencies": vs_currency})
+    base_url, headers = coingecko_api()
+    resp = http_get(f"{base_url}/simple/price", params={"ids": ",".join(ids), "vs_currencies": vs_currency}, headers=headers)
     resp.raise_for_status()
     data = resp.json()
     # Be a good citizen: avoid spamming the endpoint in rapid loops.
     time.sleep(0.25)
-    write_json(cache_path, data)
-    return data
+    return update_json_cache(cache_path, data)
 
 
 def coingecko_market_chart_daily(
@@ -266,8 +705,12 @@ def coingecko_market_chart_daily(
     if cache_path.exists() and not refresh:
         return read_json(cache_path)["prices"]
 
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-    resp = http_get(url, params={"vs_currency": vs_currency, "days": str(days), "interval": "daily"})
+    base_url, headers = coingecko_api()
+    resp = http_get(
+        f"{base_url}/coins/{coin_id}/market_chart",
+        params={"vs_currency": vs_currency, "days": str(days), "interval": "daily"},
+        headers=headers,
+    )
     resp.raise_for_status()
     data = resp.json()
     time.sleep(0.25)
@@ -308,11 +751,110 @@ def read_univ3_pool_state(rpc_url: str, pool: str) -> UniswapV3PoolState:
     )
 
 
+@dataclass(frozen=True)
+class UniswapV3PoolTokens:
+    token0: str
+    token1: str
+    fee: int
+    decimals0: int
+    decimals1: int
+
+
+UNIV3_POOL_TOKENS_CACHE = CACHE_DIR / "univ3-pool-tokens.json"
+
+
+def read_univ3_pool_tokens(
+    rpc_url: str,
+    pool: str,
+    *,
+    batch: bool = True,
+    cache_path: Path | None = UNIV3_POOL_TOKENS_CACHE,
+) -> UniswapV3PoolTokens:
+    # A pool's tokens, fee and token decimals never change, so they are cached per (chain id, pool) in `cache_path`;
+    # after the first run this costs one (memoized) eth_chainId instead of two round trips.
+    if cache_path is None:
+        return _fetch_univ3_pool_tokens(rpc_url, pool, batch=batch)
+    key = f"{eth_chain_id(rpc_url)}:{pool.lower()}"
+    try:
+        cached = read_json(cache_path).get(key) if cache_path.exists() else None
+    except (ValueError, AttributeError):
+        cached = None
+    if isinstance(cached, dict):
+        return UniswapV3PoolTokens(**cached)
+    tokens = _fetch_univ3_pool_tokens(rpc_url, pool, batch=batch)
+    update_json_cache(cache_path, {key: asdict(tokens)})
+    return tokens
+
+
+def _fetch_univ3_pool_tokens(rpc_url: str, pool: str, *, batch: bool) -> UniswapV3PoolTokens:
+    # token0/token1/fee in one round trip, then both decimals() (which need the token addresses) in a second.
+    # batch=False sends the same calls as parallel single requests, for nodes that reject JSON-RPC batches.
+    def calls(pairs: list[tuple[str, str]]) -> list[str]:
+        return eth_call_batch(rpc_url, pairs) if batch else eth_call_parallel(rpc_url, pairs)
+
+    token0_word, token1_word, fee_word = calls(
+        [(pool, "0x" + keccak_selector(sig)) for sig in ("token0()", "token1()", "fee()")]
+    )
+    token0 = decode_address_word(token0_word[2:].rjust(64, "0"))
+    token1 = decode_address_word(token1_word[2:].rjust(64, "0"))
+
+    decimals_sel = "0x" + keccak_selector("decimals()")
+    dec0_word, dec1_word = calls([(token0, decimals_sel), (token1, decimals_sel)])
+    return UniswapV3PoolTokens(
+        token0=token0,
+        token1=token1,
+        fee=decode_uint256(fee_word),
+        decimals0=decode_uint256(dec0_word),
+        decimals1=decode_uint256(dec1_word),
+    )
+
+
+@lru_cache(maxsize=4096)
 def sqrt_price_from_tick(tick: int) -> Decimal:
-    # sqrt(1.0001^tick) = 1.0001^(tick/2)
+    # sqrt(1.0001^tick) = 1.0001^(tick/2). Memoized: the fractional Decimal power is costly and ticks recur.
     return Decimal("1.0001") ** (Decimal(tick) / Decimal(2))
 
 
+class UniswapV3ScanStart(NamedTuple):
+    tokens: UniswapV3PoolTokens
+    prices: dict[str, dict[str, float]]  # coingecko_simple_price result, USD
+    latest_block: int
+    start_block: int  # first block at or after the scan's start timestamp
+
+
+def add_univ3_log_scan_args(parser: argparse.ArgumentParser) -> None:
+    # Options shared by the Swap-log scanners (univ3_swap_analytics, univ3_swap_address_analytics, univ3_reversion_analysis).
+    parser.add_argument(
+        "--no-rpc-batch",
+        action="store_true",
+        help="Read pool/token metadata with single eth_calls (for RPC nodes that reject JSON-RPC batches).",
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Max concurrent eth_getLogs block windows.")
+    parser.add_argument(
+        "--reset-getlogs-ceiling",
+        action="store_true",
+        help="Ignore the remembered eth_getLogs window cap for this RPC host and pool, and re-probe it from scratch.",
+    )
+
+
+def univ3_scan_start(
+    rpc_url: str,
+    pool: str,
+    coingecko_ids: list[str],
+    start_ts: int,
+    *,
+    batch: bool = True,
+) -> UniswapV3ScanStart:
+    # Pool metadata, CoinGecko prices and the block window are independent; overlap their round trips. The block
+    # search depends on the latest block, so it runs in the calling thread while the other two are in flight.
+    with ThreadPoolExecutor(max_workers=2) as startup:
+        tokens_future = startup.submit(read_univ3_pool_tokens, rpc_url, pool, batch=batch)
+        prices_future = startup.submit(coingecko_simple_price, coingecko_ids, "usd")
+        latest = eth_block_number(rpc_url)
+        start_block = find_block_by_timestamp(rpc_url, start_ts, high_block=latest)
+        return UniswapV3ScanStart(tokens_future.result(), prices_future.result(), latest, start_block)
+
+
 def discourse_topic_json_url(topic_url: str) -> str:
     # Accepts:
     # - https://forum.../t/slug/3151